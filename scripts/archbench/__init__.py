@@ -0,0 +1,6 @@
+"""
+Shared analysis library for the Android Architecture Benchmarks scripts.
+
+The standalone programs in scripts/ import their common building blocks
+from here so that every entry point computes statistics the same way.
+"""
@@ -0,0 +1,17 @@
+"""
+Entry point for `python3 scripts/archbench <command>` (from the repo root)
+or `python3 -m archbench <command>` (from scripts/)
+"""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # Run as a directory: import the package from scripts/, not its own folder
+    _scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path[0] = _scripts_dir
+
+from archbench.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+Architectures and benchmark tests of the 6-architecture study
+
+comprehensive_analysis_6arch.py and the archbench subcommands that only
+need the test list and metric directions (devices, pareto, compose,
+sequential, run) read them from here, so those commands start without
+importing the analysis script and with it pandas and scikit-posthocs.
+"""
+
+from archbench.loader import DATA_DIR
+from archbench.scoring import load_scoring
+
+ARCH_MAPPING = {
+    "classicmvvm": "Classic MVVM",
+    "mvc": "MVC",
+    "mvi": "MVI",
+    "mvp": "MVP",
+    "singlestatemvvm": "Single-State MVVM",
+    "hybrid": "HYBRID"
+}
+
+ALL_TESTS = [
+    "startupCold", "startupWarm",
+    "productListScrollAndPagination", "productListRapidScrolling", "productListCategoryFiltering",
+    "cartQuantityUpdatesWithDynamicSetup", "cartCheckoutFlow",
+    "chatListRealtimeUpdates", "chatDetailMessageStreamAndSending", "chatRapidSwitching",
+    "continuousScrollJankTest", "flingJankTest", "rapidDirectionChangeJankTest",
+    "cartQuantityUpdatePerformance", "categoryFilterPerformance"
+]
+
+SCORING = load_scoring("6arch")
+HIGHER_IS_BETTER = SCORING.higher_is_better
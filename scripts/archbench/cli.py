@@ -0,0 +1,335 @@
+"""
+Unified command line for the analysis scripts
+
+    python3 scripts/archbench analyze [--set 5|6] [--archs mvi,mvp,...] [--jobs N] ...
+    python3 scripts/archbench scores
+    python3 scripts/archbench energy [--preset 5arch|6arch]
+    python3 scripts/archbench devices [--data-dir DIR] [--jobs N]    # per device, then across devices
+    python3 scripts/archbench pareto [--samples N]    # Pareto front + weight-simplex sweep
+    python3 scripts/archbench compose [--shortlist N]    # predict all product/cart/chat builds
+    python3 scripts/archbench variants [--compositions all|a/b/c,...]    # Gradle init scripts + manifest
+    python3 scripts/archbench sequential [--runs-detail FILE]    # early stopping plan per test
+    python3 scripts/archbench deps app/build.gradle.kts mvi
+    python3 scripts/archbench run analyze6 scores energy   # several stages, one process
+
+Each subcommand imports its script module (and with it scipy, pandas,
+scikit-posthocs) only when it runs, so `deps` and `--help` start without
+the scientific stack. `run` loads the benchmark dataset once and hands
+it to every stage. Paths are relative to the working directory, as with
+the standalone scripts.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ANALYSIS_MODULES = {"5": "comprehensive_analysis", "6": "comprehensive_analysis_6arch"}
+ENERGY_MODULES = {"5arch": "analyze_energy_5arch", "6arch": "analyze_energy_consumption"}
+SCORES_MODULE = "calculate_scores_with_hybrid"
+DEPS_MODULE = "update_dependencies"
+
+STAGES = ("analyze5", "analyze6", "scores", "energy5", "energy6")
+
+
+# ============ HELPERS ============
+def _script(name):
+    """Import a script module from scripts/ on first use"""
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    return importlib.import_module(name)
+
+
+def _split_list(value):
+    """"a,b, c" -> ["a", "b", "c"] (None when unset)"""
+    return [key.strip() for key in value.split(",") if key.strip()] if value else None
+
+
+def _select(mapping, keys, strict=True):
+    """Restrict an {arch_key: display_name} mapping to keys (order kept)"""
+    if not keys:
+        return mapping
+    unknown = [key for key in keys if key not in mapping]
+    if unknown and strict:
+        raise SystemExit(f"Unknown architecture(s): {', '.join(unknown)} (choose from {', '.join(mapping)})")
+    return {key: name for key, name in mapping.items() if key in keys}
+
+
+def _given(**kwargs):
+    """Keyword arguments for a script main(); unset ones fall back to its constants"""
+    return {key: value for key, value in kwargs.items() if value is not None}
+
+
+# ============ STAGES ============
+def run_analysis(arch_set, args, dataset=None, strict=True):
+    module = _script(ANALYSIS_MODULES[arch_set])
+    kwargs = _given(
+        data_dir=args.data_dir,
+        output_file=getattr(args, "output", None),
+        arch_mapping=_select(module.ARCH_MAPPING, _split_list(args.archs), strict),
+        dataset=dataset,
+    )
+    if arch_set == "6":
+        kwargs.update(
+            jobs=args.jobs,
+            n_bootstrap=args.bootstrap if args.bootstrap is not None else module.DEFAULT_RESAMPLES,
+            seed=args.seed if args.seed is not None else module.DEFAULT_SEED,
+            n_permutations=args.permutations if args.permutations is not None else module.DEFAULT_PERMUTATIONS,
+            incremental=args.incremental,
+            code_source=args.code_metrics,
+            n_weights=args.weight_sweep if args.weight_sweep is not None else module.DEFAULT_SWEEP,
+            memory_phases=args.memory_phases,
+        )
+    module.main(**kwargs)
+
+
+def run_scores(args, dataset=None, strict=True):
+    module = _script(SCORES_MODULE)
+    module.main(**_given(
+        data_dir=args.data_dir,
+        arch_mapping=_select(module.ARCH_MAPPING, _split_list(args.archs), strict),
+        dataset=dataset,
+    ))
+
+
+def run_energy(preset, args):
+    module = _script(ENERGY_MODULES[preset])
+    kwargs = _given(
+        output_file=getattr(args, "output", None),
+        data_dir=args.energy_dir,
+        jobs=args.jobs,
+    )
+    keys = _split_list(args.archs)
+    if keys:
+        # "all" analyses every architecture folder found under the data directory
+        kwargs["architectures"] = None if keys == ["all"] else keys
+    scenarios = _split_list(getattr(args, "scenarios", None))
+    if scenarios:
+        kwargs["scenarios"] = None if scenarios == ["all"] else scenarios
+    module.main(**kwargs)
+
+
+def run_devices(args):
+    from archbench import benchmarks
+    from archbench.devices import OUTPUT_FILE, run_device_analysis
+    run_device_analysis(
+        args.data_dir or benchmarks.DATA_DIR,
+        _select(benchmarks.ARCH_MAPPING, _split_list(args.archs)),
+        benchmarks.ALL_TESTS,
+        benchmarks.HIGHER_IS_BETTER,
+        args.output or OUTPUT_FILE,
+        args.jobs,
+    )
+
+
+def run_pareto(args):
+    from archbench.pareto import ANALYSIS_FILE, DEFAULT_SAMPLES, OUTPUT_FILE, run_pareto_analysis
+    from archbench.benchmarks import ARCH_MAPPING
+    from archbench.scoring import DEFAULT_SEED
+    run_pareto_analysis(
+        ARCH_MAPPING,
+        args.analysis or ANALYSIS_FILE,
+        args.energy_file,
+        args.output or OUTPUT_FILE,
+        args.samples if args.samples is not None else DEFAULT_SAMPLES,
+        args.seed if args.seed is not None else DEFAULT_SEED,
+    )
+
+
+def run_compose(args):
+    from archbench import benchmarks
+    from archbench.bootstrap import DEFAULT_SEED
+    from archbench.composition import DEFAULT_RESAMPLES, DEFAULT_SHORTLIST, OUTPUT_FILE, run_composition_search
+    from archbench.loader import load_dataset
+    run_composition_search(
+        load_dataset(args.data_dir or benchmarks.DATA_DIR, _select(benchmarks.ARCH_MAPPING, _split_list(args.archs))),
+        benchmarks.ALL_TESTS,
+        args.output or OUTPUT_FILE,
+        args.bootstrap if args.bootstrap is not None else DEFAULT_RESAMPLES,
+        args.seed if args.seed is not None else DEFAULT_SEED,
+        args.shortlist if args.shortlist is not None else DEFAULT_SHORTLIST,
+        args.jobs,
+    )
+
+
+def run_variants(args):
+    from archbench.variants import OUTPUT_DIR, SETTINGS_FILE, run_variant_generation
+    try:
+        run_variant_generation(
+            _split_list(args.compositions),
+            args.shortlist,
+            args.output_dir or OUTPUT_DIR,
+            args.settings or SETTINGS_FILE,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+def run_sequential(args):
+    from archbench import benchmarks
+    from archbench.loader import load_dataset
+    from archbench.sequential import (DEFAULT_ALPHA, DEFAULT_LOOK_EVERY, DEFAULT_MAX_ITERATIONS, DEFAULT_POWER,
+                                      OUTPUT_FILE, SequentialDesign, dataset_runs, run_sequential_analysis,
+                                      runs_detail_runs)
+    arch_mapping = _select(benchmarks.ARCH_MAPPING, _split_list(args.archs))
+    dataset = load_dataset(args.data_dir or benchmarks.DATA_DIR, arch_mapping)
+    runs, repeat = dataset_runs(dataset, benchmarks.ALL_TESTS)
+    source = dataset.data_dir
+    if args.runs_detail:
+        runs = runs_detail_runs(args.runs_detail, benchmarks.ALL_TESTS, arch_mapping)
+        source = args.runs_detail
+    design = SequentialDesign(
+        alpha=args.alpha if args.alpha is not None else DEFAULT_ALPHA,
+        power=args.power if args.power is not None else DEFAULT_POWER,
+        look_every=args.look_every or DEFAULT_LOOK_EVERY,
+        max_iterations=args.max_iterations or DEFAULT_MAX_ITERATIONS,
+    )
+    run_sequential_analysis(runs, benchmarks.ALL_TESTS, benchmarks.HIGHER_IS_BETTER, repeat, design,
+                            args.output or OUTPUT_FILE, source)
+
+
+def run_deps(args):
+    module = _script(DEPS_MODULE)
+    return 0 if module.update_dependencies(args.gradle_file, args.architecture, args.hybrid) else 1
+
+
+def run_stages(args):
+    """Several stages in one process, sharing one loaded dataset"""
+    dataset = None
+    if any(stage in ("analyze5", "analyze6", "scores") for stage in args.stages):
+        from archbench.benchmarks import ARCH_MAPPING, DATA_DIR
+        from archbench.loader import load_dataset
+        dataset = load_dataset(args.data_dir or DATA_DIR, ARCH_MAPPING)
+
+    for stage in args.stages:
+        print(f"\n>>> archbench stage: {stage}\n")
+        if stage == "analyze5":
+            run_analysis("5", args, dataset, strict=False)
+        elif stage == "analyze6":
+            run_analysis("6", args, dataset, strict=False)
+        elif stage == "scores":
+            run_scores(args, dataset, strict=False)
+        elif stage == "energy5":
+            run_energy("5arch", args)
+        elif stage == "energy6":
+            run_energy("6arch", args)
+    return 0
+
+
+# ============ PARSER ============
+def _add_dataset_args(parser):
+    parser.add_argument("--data-dir", help="Directory with *_result.json, searched recursively by devices (default rawdata/performance)")
+    parser.add_argument("--archs", help="Comma-separated architecture keys, e.g. mvi,mvp,hybrid (default: all)")
+
+
+def _add_analysis_args(parser):
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes (0 = all cores)")
+    parser.add_argument("--bootstrap", type=int, help="Bootstrap resamples (0 = skip)")
+    parser.add_argument("--permutations", type=int, help="Monte-Carlo permutations per pair (0 = skip)")
+    parser.add_argument("--seed", type=int, help="Random seed")
+    parser.add_argument("--incremental", action="store_true", help="Reuse cached per-test results")
+    parser.add_argument("--weight-sweep", type=int, help="Weight vectors for the overall score sensitivity (0 = skip)")
+    parser.add_argument("--code-metrics", choices=["static", "scan"], default="static",
+                        help="Code quality inputs: staticCodeAnalysis blocks (HYBRID composed from its modules) or the Kotlin source scanner")
+    parser.add_argument("--memory-phases", nargs="+", metavar="FILE",
+                        help="memory_phases.csv-style files with repeated CompleteFlow runs for the memory timeline (set 6)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="archbench", description="Android Architecture Benchmarks analysis")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    analyze = sub.add_parser("analyze", help="Friedman/Nemenyi/Cliff's delta analysis and scores")
+    analyze.add_argument("--set", choices=sorted(ANALYSIS_MODULES), default="6",
+                         help="5 pure architectures or 6 including HYBRID (default 6)")
+    analyze.add_argument("--output", help="Output JSON path")
+    _add_dataset_args(analyze)
+    _add_analysis_args(analyze)
+
+    scores = sub.add_parser("scores", help="Performance/memory/code/overall scores (console report)")
+    _add_dataset_args(scores)
+
+    energy = sub.add_parser("energy", help="Energy consumption analysis")
+    energy.add_argument("--preset", choices=sorted(ENERGY_MODULES), default="5arch")
+    energy.add_argument("--energy-dir", help="Energy raw data directory (default future_work/energy/rawdata)")
+    energy.add_argument("--archs", help="Comma-separated architecture folders, or 'all' (default: the preset's)")
+    energy.add_argument("--scenarios", help="Comma-separated scenario names, or 'all' (default: the preset's)")
+    energy.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for CSV parsing (0 = all cores)")
+    energy.add_argument("--output", help="Output JSON path")
+
+    devices = sub.add_parser("devices", help="Per-device statistics aggregated across devices")
+    _add_dataset_args(devices)
+    devices.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for loading and per-device analysis")
+    devices.add_argument("--output", help="Output JSON path")
+
+    pareto = sub.add_parser("pareto", help="Pareto front and weight-simplex sweep over the dimension scores")
+    pareto.add_argument("--analysis", help="comprehensive_analysis_6arch.json to read (default analysis_result/)")
+    pareto.add_argument("--energy-file", help="Energy analysis JSON (default: analysis_result/, then future_work/energy/)")
+    pareto.add_argument("--samples", type=int, help="Weight vectors drawn from the simplex (default 100000)")
+    pareto.add_argument("--seed", type=int, help="Random seed")
+    pareto.add_argument("--output", help="Output JSON path")
+
+    compose = sub.add_parser("compose", help="Predict and shortlist every product/cart/chat module composition")
+    _add_dataset_args(compose)
+    compose.add_argument("--bootstrap", type=int, help="Bootstrap resamples for the intervals (default 2000, 0 = skip)")
+    compose.add_argument("--seed", type=int, help="Random seed")
+    compose.add_argument("--shortlist", type=int, help="Compositions to shortlist for on-device runs (default 10)")
+    compose.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for bootstrap and source scan")
+    compose.add_argument("--output", help="Output JSON path")
+
+    variants = sub.add_parser("variants", help="Gradle init scripts and a build-farm manifest for module compositions")
+    variants.add_argument("--compositions", help="'all' or comma-separated product/cart/chat keys, e.g. mvi/mvp/mvc,hybrid (default all)")
+    variants.add_argument("--shortlist", help="composition_search.json whose shortlist to generate (archbench compose)")
+    variants.add_argument("--output-dir", help="Directory for the init scripts and manifest.json (default build/variants)")
+    variants.add_argument("--settings", help="settings.gradle.kts with the module includes (default ./settings.gradle.kts)")
+
+    sequential = sub.add_parser("sequential", help="Group-sequential stopping decisions and iteration plan per test")
+    _add_dataset_args(sequential)
+    sequential.add_argument("--runs-detail", help="Read the iterations from a runs_detail.json instead of the result files")
+    sequential.add_argument("--alpha", type=float, help="Two-sided type I error per comparison (default 0.05)")
+    sequential.add_argument("--power", type=float, help="Power at the design effect by the last look (default 0.8)")
+    sequential.add_argument("--look-every", type=int, help="Iterations between interim looks (default 5)")
+    sequential.add_argument("--max-iterations", type=int, help="Iterations at the final look (default 30)")
+    sequential.add_argument("--output", help="Output JSON path")
+
+    deps = sub.add_parser("deps", help="Switch feature module dependencies in app/build.gradle.kts")
+    deps.add_argument("gradle_file", help="Path to build.gradle.kts file")
+    deps.add_argument("architecture", help="Architecture name (e.g., classicmvvm, mvp, hybrid)")
+    deps.add_argument("--hybrid", action="store_true", help="Enable hybrid architecture mode")
+
+    run = sub.add_parser("run", help="Run several stages in one process with a shared dataset")
+    run.add_argument("stages", nargs="+", choices=STAGES)
+    run.add_argument("--energy-dir", help="Energy raw data directory (energy stages)")
+    _add_dataset_args(run)
+    _add_analysis_args(run)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "analyze":
+        run_analysis(args.set, args)
+    elif args.command == "scores":
+        run_scores(args)
+    elif args.command == "energy":
+        run_energy(args.preset, args)
+    elif args.command == "devices":
+        run_devices(args)
+    elif args.command == "pareto":
+        run_pareto(args)
+    elif args.command == "compose":
+        run_compose(args)
+    elif args.command == "variants":
+        return run_variants(args)
+    elif args.command == "sequential":
+        run_sequential(args)
+    elif args.command == "deps":
+        return run_deps(args)
+    elif args.command == "run":
+        return run_stages(args)
+    return 0
@@ -0,0 +1,369 @@
+"""
+Code metrics from the staticCodeAnalysis blocks and the Kotlin sources
+
+Every pure architecture's result file carries a staticCodeAnalysis block
+(size, complexity and maintainability metrics over its product, cart and
+chat implementation modules); HYBRID has none, because it is a build
+that picks one module per feature (update_dependencies.py). Its metrics
+are composed from the modules it ships:
+
+  1. scan_sources() scans feature/<feature>-impl[-<arch>]/src/main in
+     parallel (one worker per module): SLOC (non-blank lines that are not
+     only comments), and per function the cyclomatic complexity (1 + if,
+     for, while, catch, &&, ||, ?: and every non-else when branch; the
+     decision points of analyze_code_metrics.gradle.kts) and the
+     cognitive complexity (SonarSource rules: +1 per structure plus its
+     nesting, +1 per else and per run of like boolean operators);
+  2. compose() sums the module metrics of a composition, calibrated per
+     source architecture to its staticCodeAnalysis totals (block total /
+     scanned total), so a composed build is on the same scale as the
+     blocks and an all-one-architecture composition reproduces its block.
+     Technical debt is the source block's debt apportioned by the
+     module's SLOC share.
+
+load_code_quality_data(source="scan") uses uncalibrated scanner values
+for every architecture instead (debt still comes from the blocks).
+"""
+
+import os
+import re
+
+from archbench.parallel import parallel_map
+
+SOURCE_ROOT = "feature"
+FEATURES = ("product", "cart", "chat")
+
+# The plain `<feature>-impl` module is the Single-State MVVM implementation
+DEFAULT_IMPL = "singlestatemvvm"
+
+# One implementation per feature for composed builds (update_dependencies.py)
+COMPOSITIONS = {
+    "hybrid": {"product": "classicmvvm", "cart": "mvp", "chat": "singlestatemvvm"}
+}
+
+_MODULE_DIR = re.compile(r"^(?P<feature>[a-z]+)-impl(?:-(?P<arch>[a-z]+))?$")
+_TOKEN = re.compile(
+    r"\b(?:fun|if|else|when|for|while|do|try|catch|finally|class|object|interface|init)\b"
+    r"|===|!==|==|!=|<=|>=|[+\-*/%]=|&&|\|\||\?:|->|[{}()=;\n]"
+)
+
+# Brace kinds that add a cognitive nesting level
+_NESTING = ("control", "when", "lambda")
+_CONTROL = ("if", "else", "for", "while", "do", "catch")
+
+
+# ============ LEXING ============
+def strip_kotlin(text):
+    """
+    Source with comments blanked and string literals masked ("x" for every
+    non-blank character), line breaks kept; string templates are masked too.
+    """
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        if text.startswith("//", i):
+            end = text.find("\n", i)
+            end = n if end < 0 else end
+            out.append(" " * (end - i))
+            i = end
+        elif text.startswith("/*", i):
+            # Kotlin block comments nest
+            depth, j = 1, i + 2
+            while j < n and depth:
+                if text.startswith("/*", j):
+                    depth, j = depth + 1, j + 2
+                elif text.startswith("*/", j):
+                    depth, j = depth - 1, j + 2
+                else:
+                    j += 1
+            out.append(re.sub(r"[^\n]", " ", text[i:j]))
+            i = j
+        elif text.startswith('"""', i):
+            end = text.find('"""', i + 3)
+            end = n if end < 0 else end + 3
+            while end < n and text[end] == '"':
+                end += 1
+            out.append(re.sub(r"\S", "x", text[i:end]))
+            i = end
+        elif text[i] in "\"'":
+            quote, j = text[i], i + 1
+            while j < n and text[j] != quote and text[j] != "\n":
+                j += 2 if text[j] == "\\" else 1
+            j = min(j + 1, n)
+            out.append(re.sub(r"\S", "x", text[i:j]))
+            i = j
+        else:
+            out.append(text[i])
+            i += 1
+    return "".join(out)
+
+
+# ============ SCANNER ============
+class _Function:
+    def __init__(self, name, paren_depth, brace_depth):
+        self.name = name
+        self.paren_depth = paren_depth
+        self.brace_depth = brace_depth
+        self.body = None           # "block", "expression" or None while in the signature
+        self.cyclomatic = 1
+        self.cognitive = 0
+        self.last_logical = None
+
+
+def scan_kotlin(text):
+    """{"lines", "sloc", "functions": [{"name", "cyclomatic", "cognitive"}]} of one Kotlin file"""
+    code = strip_kotlin(text)
+    lines = code.split("\n")
+    result = {
+        "lines": len(lines) - (1 if text.endswith("\n") else 0),
+        "sloc": sum(1 for line in lines if line.strip()),
+        "functions": []
+    }
+
+    frames = []                    # [kind, function or None] per open brace
+    functions = []                 # functions whose body or signature is open
+    pending = None                 # (keyword, paren depth) waiting for its brace
+    parens = 0
+    prev = None
+
+    def current():
+        return functions[-1] if functions and functions[-1].body is not None else None
+
+    def nesting(function):
+        return sum(1 for kind, _ in frames[function.brace_depth + 1:] if kind in _NESTING)
+
+    def close(function):
+        functions.remove(function)
+        result["functions"].append({
+            "name": function.name, "cyclomatic": function.cyclomatic, "cognitive": function.cognitive
+        })
+
+    for match in _TOKEN.finditer(code):
+        token = match.group()
+        function = current()
+
+        if token == "fun":
+            name = re.match(r"\s*(?:<[^>]*>\s*)?(?:[\w.]+\.)?(\w+)", code[match.end():])
+            functions.append(_Function(name.group(1) if name else "<anonymous>", parens, len(frames)))
+        elif token in ("class", "object", "interface", "init", "try", "finally") or token in _CONTROL or token == "when":
+            if function is not None:
+                if token in ("if", "for", "while", "catch"):
+                    function.cyclomatic += 1
+                if token == "if" and prev == "else":
+                    pass
+                elif token in ("if", "when", "for", "while", "catch"):
+                    function.cognitive += 1 + nesting(function)
+                elif token == "else":
+                    function.cognitive += 1
+                function.last_logical = None
+            pending = (token, parens)
+        elif token in ("&&", "||"):
+            if function is not None:
+                function.cyclomatic += 1
+                if function.last_logical != token:
+                    function.cognitive += 1
+                function.last_logical = token
+        elif token == "?:":
+            if function is not None:
+                function.cyclomatic += 1
+        elif token == "->":
+            if function is not None and frames and frames[-1][0] == "when" and prev != "else":
+                function.cyclomatic += 1
+        elif token == "(":
+            parens += 1
+        elif token == ")":
+            parens = max(0, parens - 1)
+        elif token == "=":
+            signature = functions[-1] if functions and functions[-1].body is None else None
+            if signature is not None and parens == signature.paren_depth:
+                signature.body = "expression"
+        elif token == "{":
+            signature = functions[-1] if functions and functions[-1].body is None else None
+            if signature is not None and parens == signature.paren_depth:
+                signature.body = "block"
+                frames.append(["fun", signature])
+            elif pending is not None and pending[1] == parens:
+                keyword = pending[0]
+                if keyword == "when":
+                    frames.append(["when", None])
+                elif keyword in _CONTROL:
+                    frames.append(["control", None])
+                else:
+                    frames.append(["block", None])
+            elif frames and frames[-1][0] == "when" and prev == "->":
+                frames.append(["block", None])
+            else:
+                frames.append(["lambda", None])
+            pending = None
+        elif token == "}":
+            if frames:
+                kind, owner = frames.pop()
+                if kind == "fun" and owner in functions:
+                    close(owner)
+            for open_function in [f for f in functions if f.brace_depth > len(frames)]:
+                functions.remove(open_function)
+            pending = None
+        elif token in ("\n", ";"):
+            if pending is not None and pending[1] == parens and prev != pending[0] and prev != ")":
+                pending = None
+            if functions and parens <= functions[-1].paren_depth and len(frames) == functions[-1].brace_depth:
+                last = functions[-1]
+                if last.body == "expression" and prev not in ("=", "->", "&&", "||", "?:"):
+                    close(last)
+                elif last.body is None and prev != "fun":
+                    # Abstract or interface declaration without a body
+                    functions.remove(last)
+            if function is not None:
+                function.last_logical = None
+        if token != "\n":
+            prev = token
+
+    for function in [f for f in functions if f.body == "expression"]:
+        close(function)
+    return result
+
+
+def scan_module(module_dir):
+    """Aggregated scan of the Kotlin sources below module_dir/src/main"""
+    metrics = {
+        "files": 0, "lines": 0, "sloc": 0, "functions": 0,
+        "total_cyclomatic": 0, "total_cognitive": 0, "max_cyclomatic": 0, "max_cyclomatic_function": None
+    }
+    for root, dirs, files in os.walk(os.path.join(module_dir, "src", "main")):
+        dirs.sort()
+        for filename in sorted(files):
+            if not filename.endswith(".kt"):
+                continue
+            path = os.path.join(root, filename)
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                scanned = scan_kotlin(f.read())
+            metrics["files"] += 1
+            metrics["lines"] += scanned["lines"]
+            metrics["sloc"] += scanned["sloc"]
+            for function in scanned["functions"]:
+                metrics["functions"] += 1
+                metrics["total_cyclomatic"] += function["cyclomatic"]
+                metrics["total_cognitive"] += function["cognitive"]
+                if function["cyclomatic"] > metrics["max_cyclomatic"]:
+                    metrics["max_cyclomatic"] = function["cyclomatic"]
+                    metrics["max_cyclomatic_function"] = f"{filename}:{function['name']}"
+    return metrics
+
+
+def discover_modules(source_root=SOURCE_ROOT):
+    """{(feature, arch_key): module directory} for feature/<feature>-impl[-<arch>]"""
+    modules = {}
+    if not os.path.isdir(source_root):
+        return modules
+    for name in sorted(os.listdir(source_root)):
+        match = _MODULE_DIR.match(name)
+        if match and os.path.isdir(os.path.join(source_root, name, "src", "main")):
+            modules[(match.group("feature"), match.group("arch") or DEFAULT_IMPL)] = os.path.join(source_root, name)
+    return modules
+
+
+def scan_sources(source_root=SOURCE_ROOT, jobs=1):
+    """{(feature, arch_key): scan_module() result} for every implementation module"""
+    modules = discover_modules(source_root)
+    outcomes = parallel_map(scan_module, [(path,) for path in modules.values()], jobs)
+    return dict(zip(modules, outcomes))
+
+
+# ============ STATIC ANALYSIS BLOCKS ============
+def block_totals(block):
+    """Totals of a staticCodeAnalysis block, comparable to scan_module() output"""
+    size = block.get("size_metrics", {})
+    complexity = block.get("complexity_metrics", {})
+    return {
+        "sloc": size.get("source_lines"),
+        "functions": size.get("functions"),
+        "total_cyclomatic": complexity.get("total_cyclomatic_complexity"),
+        "total_cognitive": complexity.get("total_cognitive_complexity"),
+        "max_cyclomatic": complexity.get("max_cyclomatic_complexity"),
+        "debt_hours": block.get("maintainability_metrics", {}).get("technical_debt_hours")
+    }
+
+
+def static_code_data(block):
+    """Score inputs {"sloc", "debt_hours", "avg_cog", "avg_cyc", "max_cyc"} of a staticCodeAnalysis block"""
+    complexity = block["complexity_metrics"]
+    return {
+        "sloc": block["size_metrics"]["source_lines"],
+        "debt_hours": block["maintainability_metrics"]["technical_debt_hours"],
+        "avg_cog": complexity["avg_cognitive_complexity"],
+        "avg_cyc": complexity["avg_cyclomatic_complexity"],
+        "max_cyc": complexity["max_cyclomatic_complexity"],
+        "source": "staticCodeAnalysis"
+    }
+
+
+# ============ COMPOSITION ============
+def _ratio(block_value, scanned_value):
+    return block_value / scanned_value if block_value is not None and scanned_value else 1.0
+
+
+def compose(composition, modules, blocks, calibrate=True):
+    """
+    Score inputs of a build made of one module per feature.
+
+    composition: {feature: arch_key}; modules: scan_sources() output;
+    blocks: {arch_key: staticCodeAnalysis block} (technical debt, and the
+    calibration when calibrate is set). None when a module or debt is missing.
+    """
+    totals = {"sloc": 0.0, "functions": 0.0, "total_cyclomatic": 0.0, "total_cognitive": 0.0, "debt_hours": 0.0}
+    max_cyc = 0
+    for feature, arch_key in composition.items():
+        module = modules.get((feature, arch_key))
+        block = blocks.get(arch_key)
+        if module is None or block is None:
+            return None
+        reference = block_totals(block)
+        arch_scan = {
+            key: sum(m[key] for (f, a), m in modules.items() if a == arch_key and f in FEATURES)
+            for key in ("sloc", "functions", "total_cyclomatic", "total_cognitive")
+        }
+        arch_max = max(m["max_cyclomatic"] for (f, a), m in modules.items() if a == arch_key)
+        for key in ("sloc", "functions", "total_cyclomatic", "total_cognitive"):
+            totals[key] += module[key] * (_ratio(reference[key], arch_scan[key]) if calibrate else 1.0)
+        totals["debt_hours"] += reference["debt_hours"] * module["sloc"] / arch_scan["sloc"]
+        scale = _ratio(reference["max_cyclomatic"], arch_max) if calibrate else 1.0
+        max_cyc = max(max_cyc, int(round(module["max_cyclomatic"] * scale)))
+
+    if not totals["functions"] or not totals["sloc"]:
+        return None
+    return {
+        "sloc": int(round(totals["sloc"])),
+        "debt_hours": round(totals["debt_hours"], 2),
+        "avg_cog": round(totals["total_cognitive"] / totals["functions"], 2),
+        "avg_cyc": round(totals["total_cyclomatic"] / totals["functions"], 2),
+        "max_cyc": max_cyc,
+        "source": ("composed" if calibrate else "scanner") + ": "
+                  + ", ".join(f"{feature}={arch_key}" for feature, arch_key in composition.items())
+    }
+
+
+# ============ DATASET ============
+def load_code_quality_data(dataset, source="static", source_root=SOURCE_ROOT, jobs=1):
+    """
+    {arch_name: score inputs or None} for a BenchmarkDataset.
+
+    source="static": staticCodeAnalysis blocks, composed builds (HYBRID)
+    from calibrated module scans; source="scan": scanner values for all.
+    """
+    blocks = {result.key: result.static_analysis for result in dataset.results.values() if result.static_analysis}
+    modules = None
+    code_data = {}
+    for arch_name in dataset.names():
+        arch_key = dataset.results[arch_name].key
+        if source == "static" and arch_key in blocks:
+            code_data[arch_name] = static_code_data(blocks[arch_key])
+            continue
+
+        composition = COMPOSITIONS.get(arch_key, {feature: arch_key for feature in FEATURES})
+        if modules is None:
+            modules = scan_sources(source_root, jobs)
+        code_data[arch_name] = compose(composition, modules, blocks, calibrate=(source == "static"))
+        if code_data[arch_name] is None:
+            print(f"Warning: No code metrics for {arch_name} (modules {composition} "
+                  f"under {source_root}/ or their staticCodeAnalysis blocks are missing)")
+    return code_data
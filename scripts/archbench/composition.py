@@ -0,0 +1,355 @@
+"""
+Hybrid composition search over every product/cart/chat module combination
+
+HYBRID is one hand-picked build (product from Classic MVVM, cart from
+MVP, chat from Single-State MVVM); with five implementations per feature
+there are 5³ = 125 builds. Benchmarking each on a device takes hours, so
+this search predicts all of them from the pure-architecture results and
+shortlists the ones worth building:
+
+  - performance: every test belongs to the feature it exercises
+    (TEST_FEATURES; the jank tests scroll the product grid); a build's
+    per-test median is the median of the architecture that supplies that
+    feature, and the app-level startup tests take the mean over the three
+    suppliers. Each build is then ranked per test against the five pure
+    architectures, i.e. where it would land as the sixth architecture of
+    comprehensive_analysis_6arch.py, and scored with its performance line;
+  - memory: the CompleteFlow PSS series is chained from the suppliers'
+    phase deltas (launch and the final peak phase are shared and
+    averaged), then summarized as initial / peak / growth;
+  - code quality: archbench.code_metrics.compose() of the three modules,
+    calibrated to their staticCodeAnalysis blocks.
+
+All 125 builds are scored at once through the 6arch scoring profile with
+a (builds, 5 + 1) architecture axis. Performance uncertainty comes from
+the bootstrap of archbench.bootstrap: the pure architectures' iterations
+are resampled and every build's prediction is re-derived from the same
+resample, giving percentile intervals for its average rank and scores,
+P(rank 1) and P(shortlist). Memory and code quality have one value per
+architecture and are not resampled. A measured composed build (HYBRID)
+is compared with its own prediction as a check of the additive model.
+"""
+
+import json
+import os
+from datetime import datetime
+from itertools import product
+
+import numpy as np
+
+from archbench.bootstrap import DEFAULT_SEED, bootstrap_medians, confidence_interval, rank1_probability
+from archbench.code_metrics import (COMPOSITIONS, FEATURES, SOURCE_ROOT, compose, discover_modules, scan_sources,
+                                    static_code_data)
+from archbench.memory import load_memory_profiles
+from archbench.scoring import load_scoring
+
+OUTPUT_FILE = "analysis_result/composition_search.json"
+DEFAULT_RESAMPLES = 2_000
+DEFAULT_SHORTLIST = 10
+CHUNK_SIZE = 500
+
+# Feature module each benchmark exercises; unlisted tests (startup) are app-level
+TEST_FEATURES = {
+    "productListScrollAndPagination": "product",
+    "productListRapidScrolling": "product",
+    "productListCategoryFiltering": "product",
+    "categoryFilterPerformance": "product",
+    "continuousScrollJankTest": "product",
+    "flingJankTest": "product",
+    "rapidDirectionChangeJankTest": "product",
+    "cartQuantityUpdatesWithDynamicSetup": "cart",
+    "cartCheckoutFlow": "cart",
+    "cartQuantityUpdatePerformance": "cart",
+    "chatListRealtimeUpdates": "chat",
+    "chatDetailMessageStreamAndSending": "chat",
+    "chatRapidSwitching": "chat"
+}
+
+
+# ============ COMPOSITIONS ============
+def enumerate_compositions(arch_keys, features=FEATURES):
+    """Every {feature: arch_key} build, product-major order"""
+    return [dict(zip(features, choice)) for choice in product(arch_keys, repeat=len(features))]
+
+
+def composition_key(composition):
+    """"classicmvvm/mvp/singlestatemvvm" (feature order)"""
+    return "/".join(composition[feature] for feature in FEATURES)
+
+
+def phase_feature(phase):
+    """Feature of a memory phase (`05_Cart_Initial` -> cart), None for app-level phases"""
+    name = phase.lower()
+    return next((feature for feature in FEATURES if feature in name), None)
+
+
+def prediction_weights(compositions, tests, arch_keys):
+    """
+    (tests, builds, architectures) matrix mapping pure-architecture
+    medians to predicted build medians: one-hot on the supplier of the
+    test's feature, 1/3 per supplier for app-level tests.
+    """
+    index = {key: i for i, key in enumerate(arch_keys)}
+    weights = np.zeros((len(tests), len(compositions), len(arch_keys)))
+    for t, test in enumerate(tests):
+        feature = TEST_FEATURES.get(test)
+        for c, composition in enumerate(compositions):
+            suppliers = [composition[feature]] if feature else [composition[f] for f in FEATURES]
+            for arch_key in suppliers:
+                weights[t, c, index[arch_key]] += 1 / len(suppliers)
+    return weights
+
+
+# ============ PERFORMANCE ============
+def composition_ranks(reference, predicted, higher_is_better):
+    """
+    Rank (1 = best, ties averaged) of each predicted value among the
+    reference architectures plus itself.
+
+    reference: (..., K); predicted: (..., C). Returns (..., C), NaN where
+    the prediction is missing; missing references are ignored.
+    """
+    sign = -1.0 if higher_is_better else 1.0
+    a = sign * predicted[..., :, None]
+    b = sign * reference[..., None, :]
+    rank = 1 + (b < a).sum(axis=-1) + 0.5 * (b == a).sum(axis=-1)
+    return np.where(np.isnan(predicted), np.nan, rank)
+
+
+def predicted_average_ranks(medians, weights, directions):
+    """
+    Average rank over tests of every build.
+
+    medians: (T, ..., K) pure-architecture medians; weights: (T, C, K)
+    from prediction_weights(). Returns (..., C).
+    """
+    ranks = []
+    for t, higher_is_better in enumerate(directions):
+        predicted = np.einsum("...k,ck->...c", medians[t], weights[t])
+        ranks.append(composition_ranks(medians[t], predicted, higher_is_better))
+    with np.errstate(invalid="ignore"):
+        return np.nanmean(np.stack(ranks), axis=0)
+
+
+# ============ MEMORY ============
+def compose_memory(composition, profiles):
+    """
+    {"initial", "peak", "growth"} of a build's chained PSS series;
+    profiles: {arch_key: MemoryProfile}. None if a supplier is missing
+    or the suppliers' phases differ.
+    """
+    suppliers = {feature: profiles.get(arch_key) for feature, arch_key in composition.items()}
+    if any(profile is None for profile in suppliers.values()):
+        return None
+    phases = [snapshot.phase for snapshot in next(iter(suppliers.values())).snapshots]
+    if any([s.phase for s in profile.snapshots] != phases for profile in suppliers.values()):
+        return None
+
+    series = {feature: np.array(profile.series("total_pss_mb")) for feature, profile in suppliers.items()}
+    shared = np.mean(list(series.values()), axis=0)
+    pss = [float(shared[0])]
+    for i, phase in enumerate(phases[1:], start=1):
+        source = series[phase_feature(phase)] if phase_feature(phase) else shared
+        pss.append(pss[-1] + float(source[i] - source[i - 1]))
+    return {"initial": round(pss[0], 2), "peak": round(max(pss), 2), "growth": round(pss[-1] - pss[0], 2)}
+
+
+# ============ SEARCH ============
+def _dimension_scores(model, dimension, reference, predicted, inputs):
+    """
+    Score of each build against the reference architectures: inputs are
+    laid out (builds, K + 1) with the build last, so min-max ranges are
+    those of a six-architecture analysis containing that build.
+    """
+    columns = {}
+    for name in inputs:
+        ref = np.array([reference[arch][name] for arch in reference], dtype=np.float64)
+        pred = np.array([np.nan if p is None else p[name] for p in predicted], dtype=np.float64)
+        columns[name] = np.column_stack([np.tile(ref, (len(predicted), 1)), pred])
+    return model.score(dimension, columns)[:, -1]
+
+
+def search_compositions(dataset, tests, model, n_resamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED,
+                        shortlist=DEFAULT_SHORTLIST, source_root=SOURCE_ROOT, jobs=1):
+    """Predict, score and shortlist every composition of the pure architectures in dataset"""
+    modules = discover_modules(source_root)
+    pure = [name for name, result in dataset.results.items()
+            if result.key not in COMPOSITIONS and all((f, result.key) in modules for f in FEATURES)]
+    arch_keys = [dataset.results[name].key for name in pure]
+    compositions = enumerate_compositions(arch_keys)
+    keys = [composition_key(c) for c in compositions]
+    directions = [model.higher_is_better[test] for test in tests]
+
+    # Performance: point medians and bootstrap replicates of the pure architectures
+    runs = dataset.benchmark_runs(tests)
+    test_runs = {test: {name: runs[name][test] for name in pure if test in runs[name]} for test in tests}
+    point_medians = np.array([[np.median(test_runs[t][n]) if n in test_runs[t] else np.nan for n in pure]
+                              for t in tests])
+    weights = prediction_weights(compositions, tests, arch_keys)
+    point_ranks = predicted_average_ranks(point_medians, weights, directions)
+
+    boot_ranks = np.empty((0, len(compositions)))
+    if n_resamples:
+        boot_medians = bootstrap_medians(test_runs, pure, tests, n_resamples, seed, jobs)
+        boot_ranks = np.concatenate([
+            predicted_average_ranks(boot_medians[:, start:start + CHUNK_SIZE], weights, directions)
+            for start in range(0, n_resamples, CHUNK_SIZE)
+        ])
+    point_perf = model.score("performance", {"avg_rank": point_ranks})
+    boot_perf = model.score("performance", {"avg_rank": boot_ranks})
+
+    # Memory and code quality: one value per build
+    profiles = load_memory_profiles(dataset)
+    profiles_by_key = {dataset.results[name].key: profiles[name] for name in pure if name in profiles}
+    reference_memory = {key: profile.summary() for key, profile in profiles_by_key.items()}
+    memory = [compose_memory(c, profiles_by_key) for c in compositions]
+    memory_scores = (_dimension_scores(model, "memory", reference_memory, memory, ("initial", "peak", "growth"))
+                     if len(reference_memory) == len(pure) else np.full(len(compositions), np.nan))
+
+    blocks = {result.key: result.static_analysis for result in dataset.results.values() if result.static_analysis}
+    scanned = scan_sources(source_root, jobs)
+    code = [static_code_data(blocks[c["product"]]) if len(set(c.values())) == 1 and c["product"] in blocks
+            else compose(c, scanned, blocks) for c in compositions]
+    reference_code = {key: static_code_data(blocks[key]) for key in arch_keys if key in blocks}
+    code_inputs = ("debt_hours", "sloc", "avg_cog", "avg_cyc", "max_cyc")
+    code_scores = (_dimension_scores(model, "code_quality", reference_code, code, code_inputs)
+                   if len(reference_code) == len(pure) else np.full(len(compositions), np.nan))
+
+    def overall(perf):
+        return model.overall({"performance": perf, "code_quality": code_scores, "memory": memory_scores})
+
+    point_overall = overall(point_perf)
+    boot_overall = overall(boot_perf) if n_resamples else np.empty((0, len(compositions)))
+    order = np.argsort(-point_overall, kind="stable")
+    shortlisted = order[:shortlist]
+    # Intervals for the shortlist and for measured composed builds (validation)
+    detailed = set(shortlisted.tolist()) | {keys.index(composition_key(c)) for c in COMPOSITIONS.values()
+                                            if composition_key(c) in keys}
+
+    p_rank1 = rank1_probability(boot_overall) if n_resamples else np.full(len(compositions), np.nan)
+    if n_resamples:
+        boot_positions = np.argsort(np.argsort(-boot_overall, axis=1), axis=1)
+        p_shortlist = (boot_positions < shortlist).mean(axis=0)
+    else:
+        p_shortlist = np.full(len(compositions), np.nan)
+
+    measured = {result.key: name for name, result in dataset.results.items()}
+    builds = {}
+    for position, c in enumerate(order):
+        composition = compositions[c]
+        arch_key = composition["product"] if len(set(composition.values())) == 1 else next(
+            (key for key, known in COMPOSITIONS.items() if known == composition), None)
+        entry = {
+            "position": position + 1,
+            "composition": composition,
+            "measured_as": measured.get(arch_key) if arch_key else None,
+            "avg_rank": round(float(point_ranks[c]), 4),
+            "performance_score": round(float(point_perf[c]), 2),
+            "memory": memory[c],
+            "memory_score": None if np.isnan(memory_scores[c]) else round(float(memory_scores[c]), 2),
+            "code": code[c],
+            "code_score": None if np.isnan(code_scores[c]) else round(float(code_scores[c]), 2),
+            "overall_score": round(float(point_overall[c]), 2),
+            "p_rank1": None if np.isnan(p_rank1[c]) else round(float(p_rank1[c]), 4),
+            "p_shortlist": None if np.isnan(p_shortlist[c]) else round(float(p_shortlist[c]), 4)
+        }
+        if n_resamples and c in detailed:
+            entry["confidence_intervals"] = {
+                "avg_rank": confidence_interval(point_ranks[c], boot_ranks[:, c]),
+                "performance_score": confidence_interval(point_perf[c], boot_perf[:, c]),
+                "overall_score": confidence_interval(point_overall[c], boot_overall[:, c])
+            }
+        builds[keys[c]] = entry
+
+    return {
+        "reference_architectures": dict(zip(arch_keys, pure)),
+        "test_features": {test: TEST_FEATURES.get(test, "app") for test in tests},
+        "n_compositions": len(compositions),
+        "n_resamples": n_resamples,
+        "seed": seed,
+        "shortlist": [keys[c] for c in shortlisted],
+        "validation": validate_measured(dataset, builds, runs, tests, pure, point_medians, directions, model),
+        "compositions": builds
+    }
+
+
+def validate_measured(dataset, builds, runs, tests, pure, point_medians, directions, model):
+    """Predicted vs measured average rank, S_perf and per-test medians of measured composed builds"""
+    validation = {}
+    for arch_key, composition in COMPOSITIONS.items():
+        result = dataset.by_key(arch_key)
+        entry = builds.get(composition_key(composition))
+        if result is None or entry is None:
+            continue
+        measured = np.array([np.median(runs[result.name][t]) if t in runs.get(result.name, {}) else np.nan
+                             for t in tests])
+        ranks = [composition_ranks(point_medians[t], measured[t:t + 1], hib)[0] for t, hib in enumerate(directions)]
+        measured_rank = float(np.nanmean(ranks))
+        weights = prediction_weights([composition], tests, [dataset.results[n].key for n in pure])
+        predicted = np.einsum("tk,tk->t", point_medians, weights[:, 0])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            errors = (predicted - measured) / measured * 100
+        interval = entry.get("confidence_intervals", {}).get("performance_score")
+        measured_perf = float(model.score("performance", {"avg_rank": measured_rank}))
+        validation[result.name] = {
+            "composition": composition,
+            "measured_avg_rank": round(measured_rank, 4),
+            "predicted_avg_rank": entry["avg_rank"],
+            "measured_performance_score": round(measured_perf, 2),
+            "predicted_performance_score": entry["performance_score"],
+            "measured_within_ci": (interval["ci_lower"] <= measured_perf <= interval["ci_upper"]) if interval else None,
+            "median_abs_error_pct": round(float(np.nanmedian(np.abs(errors))), 2),
+            "per_test_error_pct": {t: round(float(e), 2) for t, e in zip(tests, errors) if not np.isnan(e)}
+        }
+    return validation
+
+
+# ============ STAGE ============
+def print_report(results, n_shown=None):
+    """Console summary of search_compositions() output"""
+    shortlist = results["shortlist"][:n_shown]
+    print(f"\nCOMPOSITIONS: {results['n_compositions']} (product/cart/chat) from "
+          f"{', '.join(results['reference_architectures'].values())}")
+    print(f"\nSHORTLIST FOR ON-DEVICE VERIFICATION ({results['n_resamples']} bootstrap resamples):")
+    print(f"  {'#':>3} {'Product/Cart/Chat':38} {'Overall':>8} {'95% CI':>17} {'Perf':>7} {'Mem':>7} {'Code':>7} "
+          f"{'P(1st)':>7} {'P(list)':>8}")
+    for key in shortlist:
+        entry = results["compositions"][key]
+        ci = entry.get("confidence_intervals", {}).get("overall_score")
+        ci_str = f"[{ci['ci_lower']:.2f}, {ci['ci_upper']:.2f}]" if ci else "-"
+        label = key + (f" ({entry['measured_as']})" if entry["measured_as"] else "")
+
+        def fmt(value, spec):
+            return "-" if value is None else format(value, spec)
+        print(f"  {entry['position']:>3} {label:38} {entry['overall_score']:>8.2f} {ci_str:>17} "
+              f"{entry['performance_score']:>7.2f} {fmt(entry['memory_score'], '.2f'):>7} "
+              f"{fmt(entry['code_score'], '.2f'):>7} {fmt(entry['p_rank1'], '.1%'):>7} "
+              f"{fmt(entry['p_shortlist'], '.1%'):>8}")
+    for name, check in results["validation"].items():
+        print(f"\n  {name} measured vs predicted: avg rank {check['measured_avg_rank']:.2f} vs "
+              f"{check['predicted_avg_rank']:.2f}, S_perf {check['measured_performance_score']:.2f} vs "
+              f"{check['predicted_performance_score']:.2f}, median |error| {check['median_abs_error_pct']:.1f}% per test")
+
+
+def run_composition_search(dataset, tests, output_file=OUTPUT_FILE, n_resamples=DEFAULT_RESAMPLES,
+                           seed=DEFAULT_SEED, shortlist=DEFAULT_SHORTLIST, jobs=1):
+    """Search all compositions, write JSON and print the shortlist"""
+    model = load_scoring("6arch")
+    results = {
+        "metadata": {
+            "analysis_date": datetime.now().isoformat(),
+            "data_source": dataset.data_dir,
+            "prediction": "Per-test medians of the module supplier (mean of the three for app-level tests), "
+                          "ranked against the pure architectures; memory chained from phase deltas; "
+                          "code composed from calibrated module scans",
+            "formulas": {name: model.formula(name) for name in ("performance", "memory", "code_quality")},
+            "overall_formula": model.overall_formula
+        },
+        **search_compositions(dataset, tests, model, n_resamples, seed, shortlist, jobs=jobs)
+    }
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print_report(results)
+    print(f"\n✓ Results saved to: {output_file}")
+    return results
@@ -0,0 +1,312 @@
+"""
+Covariate adjustment for architecture comparisons
+
+Runs on unlocked clocks (context.cpuLocked = false,
+sustainedPerformanceModeEnabled = false) drift with temperature, battery
+level and iteration order. This module separates that drift from the
+architecture effect:
+
+  - rank_ancova(): Conover-Iman rank ANCOVA. Response and covariates are
+    replaced by their ranks and the architecture effect is tested with an
+    F-test of OLS(rank y ~ architecture + rank covariates) against
+    OLS(rank y ~ rank covariates), i.e. adjusted for the covariates.
+  - adjust_for_covariates(): covariate-corrected values on the original
+    scale, y - b·(x - x̄) with the pooled within-architecture slope b (so
+    between-architecture differences are not absorbed into the slope).
+    Architectures are compared on the means of these values, the
+    quantity the correction actually shifts.
+  - thermal_flags(): iterations outside a stable thermal window.
+
+When architectures were measured one after another, a covariate can be
+almost constant within each architecture and differ between them; it is
+then reported as confounded, because no model can tell its effect from
+the architecture's, and left out of the adjustment. A comparison with no
+separable covariate left is reported as not identifiable rather than with
+numbers. A balanced covariate (same mean in every architecture, such as
+iteration order when all architectures ran n iterations) leaves every
+architecture mean unchanged and is not corrected for.
+
+energy_adjustment() applies this to the energy runs (iteration, Temp_C,
+Battery_%) and performance_adjustment() to the benchmark runs
+(iteration order; the result JSON has no per-iteration temperature).
+"""
+
+import numpy as np
+from scipy.stats import f as f_dist, rankdata
+
+ALPHA = 0.05
+
+# Iterations further than this from the run's median temperature, or
+# heating/cooling faster than THERMAL_STEP_C since the previous iteration
+THERMAL_WINDOW_C = 1.0
+THERMAL_STEP_C = 0.5
+
+# Share of a covariate's variance explained by the architecture above which
+# its effect cannot be separated from the architecture effect
+CONFOUNDING_R2 = 0.9
+
+
+# ============ MODEL ============
+def _indicators(groups):
+    """Group indicator matrix, one column per group"""
+    labels = sorted(set(groups))
+    return np.array([[1.0 if g == label else 0.0 for label in labels] for g in groups])
+
+
+def _rss(X, y):
+    coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+    residual = y - X @ coef
+    return float(residual @ residual), np.linalg.matrix_rank(X)
+
+
+def _usable(covariates, names, groups):
+    """Covariate columns that vary within at least one architecture"""
+    keep = []
+    groups = np.asarray(groups)
+    for j in range(covariates.shape[1]):
+        column = covariates[:, j]
+        if any(np.ptp(column[groups == g]) > 0 for g in set(groups.tolist())):
+            keep.append(j)
+    return covariates[:, keep], [names[j] for j in keep]
+
+
+def confounding(groups, covariates, names):
+    """{covariate: share of its variance explained by the architecture}"""
+    groups = np.asarray(groups)
+    shares = {}
+    for j, name in enumerate(names):
+        column = covariates[:, j]
+        total = np.sum((column - column.mean()) ** 2)
+        if total == 0:
+            continue
+        within = sum(np.sum((column[groups == g] - column[groups == g].mean()) ** 2) for g in set(groups.tolist()))
+        shares[name] = round(float(1 - within / total), 4)
+    return shares
+
+
+def rank_ancova(y, groups, covariates, names):
+    """
+    Architecture effect on rank(y) adjusted for rank covariates.
+
+    y: (n,) response; groups: (n,) architecture labels; covariates: (n, p).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    covariates, names = _usable(np.asarray(covariates, dtype=np.float64).reshape(len(y), -1), names, groups)
+    indicators = _indicators(groups)
+    ranked_y = rankdata(y)
+    ranked_x = np.column_stack([rankdata(covariates[:, j]) for j in range(covariates.shape[1])]) \
+        if covariates.shape[1] else np.empty((len(y), 0))
+
+    intercept = np.ones((len(y), 1))
+    rss_full, rank_full = _rss(np.hstack([indicators, ranked_x]), ranked_y)
+    rss_reduced, rank_reduced = _rss(np.hstack([intercept, ranked_x]), ranked_y)
+    rss_groups, rank_groups = _rss(indicators, ranked_y)
+    rss_null, _ = _rss(intercept, ranked_y)
+
+    def f_test(rss_r, rss_f, df_num, df_den):
+        if df_num <= 0 or df_den <= 0 or rss_f <= 0:
+            return None, None
+        stat = ((rss_r - rss_f) / df_num) / (rss_f / df_den)
+        return float(stat), float(f_dist.sf(stat, df_num, df_den))
+
+    df_num, df_den = rank_full - rank_reduced, len(y) - rank_full
+    stat, p_value = f_test(rss_reduced, rss_full, df_num, df_den)
+    _, p_unadjusted = f_test(rss_null, rss_groups, rank_groups - 1, len(y) - rank_groups)
+    return {
+        "f_statistic": round(stat, 4) if stat is not None else None,
+        "p_value": round(p_value, 4) if p_value is not None else None,
+        "df": [int(df_num), int(df_den)],
+        "significant": bool(p_value is not None and p_value < ALPHA),
+        "unadjusted_p_value": round(p_unadjusted, 4) if p_unadjusted is not None else None,
+        "covariates": names
+    }
+
+
+def adjust_for_covariates(y, groups, covariates, names):
+    """
+    y corrected to the grand mean of each covariate with the pooled
+    within-architecture slopes. Returns (adjusted y, {covariate: slope}).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    covariates, names = _usable(np.asarray(covariates, dtype=np.float64).reshape(len(y), -1), names, groups)
+    if not names:
+        return y.copy(), {}
+    groups = np.asarray(groups)
+    y_within = y.copy()
+    x_within = covariates.copy()
+    for g in set(groups.tolist()):
+        mask = groups == g
+        y_within[mask] -= y[mask].mean()
+        x_within[mask] -= covariates[mask].mean(axis=0)
+    slopes, *_ = np.linalg.lstsq(x_within, y_within, rcond=None)
+    adjusted = y - (covariates - covariates.mean(axis=0)) @ slopes
+    return adjusted, {name: round(float(b), 6) for name, b in zip(names, slopes)}
+
+
+def thermal_flags(temperatures, window_c=THERMAL_WINDOW_C, step_c=THERMAL_STEP_C):
+    """Boolean mask of iterations (in run order) outside the stable thermal window"""
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    outside = np.abs(temperatures - np.median(temperatures)) > window_c
+    drifting = np.zeros_like(outside)
+    drifting[1:] = np.abs(np.diff(temperatures)) > step_c
+    return outside | drifting
+
+
+# ============ COMPARISON ============
+def _balanced(covariates, names, groups):
+    """Covariates with the same mean in every architecture (e.g. iteration 1..n everywhere)"""
+    groups = np.asarray(groups)
+    labels = set(groups.tolist())
+    balanced = []
+    for j, name in enumerate(names):
+        means = np.array([covariates[groups == g, j].mean() for g in labels])
+        if np.ptp(means) <= 1e-9 * max(1.0, float(np.abs(means).max())):
+            balanced.append(name)
+    return balanced
+
+
+def _adjusted_comparison(y, groups, covariates, names, higher_is_better=False):
+    """
+    Rank ANCOVA plus raw vs adjusted means and rankings for one test/scenario.
+
+    Covariates confounded with the architecture are left out of both the
+    ANCOVA and the correction. Balanced covariates stay in the ANCOVA but
+    cannot move an architecture's mean, so they are not corrected for. When
+    no covariate is left, or the corrected means would leave the observed
+    range of y (the slopes then extrapolate across architectures), the
+    adjustment is reported as not identifiable. The ranking only counts as
+    changed when the adjusted means reorder and the rank ANCOVA is
+    significant.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    groups = np.asarray(groups)
+    covariates = np.asarray(covariates, dtype=np.float64).reshape(len(y), -1)
+    labels = list(dict.fromkeys(groups.tolist()))
+    raw = {g: float(y[groups == g].mean()) for g in labels}
+    order = (lambda values: sorted(values, key=values.get, reverse=higher_is_better))
+    by_raw = order(raw)
+
+    confounded = {
+        name: share for name, share in confounding(groups, covariates, names).items()
+        if share >= CONFOUNDING_R2
+    }
+    keep = [j for j, name in enumerate(names) if name not in confounded]
+    covariates, names = _usable(covariates[:, keep], [names[j] for j in keep], groups)
+    balanced = _balanced(covariates, names, groups)
+    comparison = {
+        "identifiable": False,
+        "reason": None,
+        "rank_ancova": None,
+        "slopes": {},
+        "confounded_with_architecture": confounded,
+        "balanced_covariates": balanced,
+        "median": {g: round(float(np.median(y[groups == g])), 4) for g in labels},
+        "mean": {g: round(v, 4) for g, v in raw.items()},
+        "adjusted_mean": None,
+        "ranking": by_raw,
+        "adjusted_ranking": None,
+        "ranking_changed": False
+    }
+    if not names:
+        comparison["reason"] = "no covariate left that is separable from the architecture"
+        return comparison
+
+    ancova = rank_ancova(y, groups, covariates, names)
+    comparison["rank_ancova"] = ancova
+    corrected_names = [name for name in names if name not in balanced]
+    if corrected_names:
+        columns = [names.index(name) for name in corrected_names]
+        adjusted, slopes = adjust_for_covariates(y, groups, covariates[:, columns], corrected_names)
+        corrected = {g: float(adjusted[groups == g].mean()) for g in labels}
+        comparison["slopes"] = slopes
+    else:
+        corrected = dict(raw)
+    if any(not y.min() <= v <= y.max() for v in corrected.values()):
+        comparison["reason"] = "adjusted means outside the observed range"
+        return comparison
+
+    by_adjusted = order(corrected)
+    comparison.update({
+        "identifiable": True,
+        "adjusted_mean": {g: round(v, 4) for g, v in corrected.items()},
+        "adjusted_ranking": by_adjusted,
+        "ranking_changed": by_raw != by_adjusted and ancova["significant"]
+    })
+    return comparison
+
+
+def energy_adjustment(data):
+    """
+    Per-scenario covariate adjustment of normalized energy for an
+    archbench.energy.EnergyData, with thermal-window flags per run.
+    """
+    names = ["iteration", "temp_c", "battery_pct"]
+    normalized = data.normalized()
+    result = {
+        "covariates": names,
+        "thermal_window_c": THERMAL_WINDOW_C,
+        "thermal_step_c": THERMAL_STEP_C,
+        "by_scenario": {},
+        "unstable_iterations": {}
+    }
+    for s, scenario in enumerate(data.scenarios):
+        y, groups, rows = [], [], []
+        for a, arch in enumerate(data.architectures):
+            valid = np.isfinite(normalized[a, s])
+            if not valid.any():
+                continue
+            y.extend(normalized[a, s][valid])
+            groups.extend([arch] * int(valid.sum()))
+            rows.append(np.column_stack([data[name][a, s][valid] for name in names]))
+
+            order = np.argsort(data["iteration"][a, s][valid])
+            flags = thermal_flags(data["temp_c"][a, s][valid][order])
+            if flags.any():
+                iterations = data["iteration"][a, s][valid][order][flags]
+                result["unstable_iterations"].setdefault(arch, {})[scenario] = [int(i) for i in iterations]
+        if len(set(groups)) < 2:
+            continue
+        comparison = _adjusted_comparison(np.array(y), groups, np.vstack(rows), names)
+        comparison["mean_temp_c"] = {
+            arch: round(float(np.nanmean(data["temp_c"][a, s])), 2)
+            for a, arch in enumerate(data.architectures) if arch in comparison["median"]
+        }
+        result["by_scenario"][scenario] = comparison
+    return result
+
+
+def performance_adjustment(test_runs, contexts, higher_is_better):
+    """
+    Iteration-order adjustment of benchmark runs.
+
+    test_runs: {test: {arch: runs}}; contexts: {arch: result context};
+    higher_is_better: {test: bool}.
+    """
+    result = {
+        "covariates": ["iteration"],
+        "context": {
+            arch: {
+                "cpuLocked": context.get("cpuLocked"),
+                "sustainedPerformanceModeEnabled": context.get("sustainedPerformanceModeEnabled")
+            }
+            for arch, context in contexts.items()
+        },
+        "per_test": {}
+    }
+    result["unlocked_clocks"] = [
+        arch for arch, flags in result["context"].items()
+        if flags["cpuLocked"] is False and flags["sustainedPerformanceModeEnabled"] is not True
+    ]
+    for test_name, runs_by_arch in test_runs.items():
+        if len(runs_by_arch) < 2:
+            continue
+        y, groups, order = [], [], []
+        for arch, runs in runs_by_arch.items():
+            y.extend(runs)
+            groups.extend([arch] * len(runs))
+            order.extend(range(1, len(runs) + 1))
+        result["per_test"][test_name] = _adjusted_comparison(
+            np.array(y, dtype=np.float64), groups, np.array(order, dtype=np.float64)[:, None], ["iteration"],
+            higher_is_better.get(test_name, False)
+        )
+    return result
@@ -0,0 +1,310 @@
+"""
+Multi-device aggregation: per-device statistics, then across devices
+
+A ranking measured on one device class says little about the others, so
+results are grouped by DeviceIdentity (archbench.loader) and analysed in
+two levels:
+
+  1. per device, per test: Friedman over iterations, Nemenyi post-hoc when
+     significant, Cliff's delta for every pair, median ranking, and the
+     average rank over tests (as in comprehensive_analysis_6arch.py);
+  2. across devices, a blocked design with devices as blocks: Friedman on
+     the (device × architecture) matrix of per-device medians (per test)
+     and of per-device average ranks (overall), with Kendall's W as the
+     cross-device agreement, plus a random-effects meta-analysis
+     (DerSimonian-Laird) of each pair's Cliff's delta, weighted by the
+     Cliff (1993) variance estimate of every device's delta.
+
+Descriptive statistics per test and architecture are pooled over all
+devices through archbench.quantiles: every device's runs become a
+StreamingSummary (per-iteration sketches for frame traces), and the
+summaries are merged across devices, so pooled medians keep bounded
+memory and a stated rank error however many devices report.
+
+Devices are analysed in parallel (one worker per device). The
+cross-device level needs at least two devices; architectures missing on
+some device are left out of the blocked tests.
+"""
+
+import json
+import os
+from datetime import datetime
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import scikit_posthocs as sp
+from scipy.stats import friedmanchisquare, norm, rankdata
+
+from archbench.effect_size import cliffs_delta, cliffs_delta_batch, interpret_delta
+from archbench.loader import load_device_datasets
+from archbench.parallel import parallel_map
+from archbench.quantiles import DEFAULT_SEED, calculate_descriptive_stats, summarize
+
+ALPHA = 0.05
+OUTPUT_FILE = "analysis_result/device_aggregation.json"
+
+
+# ============ PER DEVICE ============
+def _friedman(matrix, columns):
+    """Friedman (rows = blocks) and Nemenyi when significant; None for < 3 groups"""
+    if matrix.shape[1] < 3 or matrix.shape[0] < 2:
+        return None
+    try:
+        stat, p_value = friedmanchisquare(*[matrix[:, i] for i in range(matrix.shape[1])])
+    except ValueError:
+        return None
+    result = {
+        "chi_squared": float(stat),
+        "df": matrix.shape[1] - 1,
+        "p_value": float(p_value),
+        "significant": bool(p_value < ALPHA),
+        # Kendall's coefficient of concordance between blocks
+        "kendalls_w": float(stat / (matrix.shape[0] * (matrix.shape[1] - 1))),
+        "nemenyi": {}
+    }
+    if result["significant"]:
+        nemenyi = sp.posthoc_nemenyi_friedman(pd.DataFrame(matrix, columns=columns))
+        for arch1, arch2 in combinations(columns, 2):
+            p_val = float(nemenyi.loc[arch1, arch2])
+            result["nemenyi"][f"{arch1} vs {arch2}"] = {"p_value": p_val, "significant": p_val < ALPHA}
+    return result
+
+
+def _ranks(medians, higher_is_better):
+    names = list(medians)
+    values = np.array([medians[name] for name in names])
+    ranks = rankdata(-values if higher_is_better else values, method='average')
+    return {name: float(rank) for name, rank in zip(names, ranks)}
+
+
+def analyze_device(test_runs, higher_is_better):
+    """
+    Per-test Friedman/Nemenyi/Cliff's delta/ranking of one device.
+
+    test_runs: {test: {arch: runs}} (runs in a worker process).
+    """
+    deltas = cliffs_delta_batch(test_runs)
+    per_test = {}
+    for test_name, runs_by_arch in test_runs.items():
+        if len(runs_by_arch) < 2:
+            continue
+        archs = list(runs_by_arch)
+        min_len = min(len(runs) for runs in runs_by_arch.values())
+        matrix = np.array([runs_by_arch[arch][:min_len] for arch in archs], dtype=np.float64).T
+        medians = {arch: float(np.median(runs)) for arch, runs in runs_by_arch.items()}
+        per_test[test_name] = {
+            "friedman": _friedman(matrix, archs),
+            "cliffs_delta": {
+                f"{arch1} vs {arch2}": {"delta": delta, "effect": interpret_delta(delta)}
+                for (arch1, arch2), delta in deltas[test_name].items()
+            },
+            "median": medians,
+            "rank": _ranks(medians, higher_is_better[test_name])
+        }
+
+    ranks = {}
+    for result in per_test.values():
+        for arch, rank in result["rank"].items():
+            ranks.setdefault(arch, []).append(rank)
+    average_ranks = {arch: float(np.mean(values)) for arch, values in ranks.items()}
+    return {
+        "per_test": per_test,
+        "average_ranks": dict(sorted(average_ranks.items(), key=lambda x: x[1]))
+    }
+
+
+# ============ META-ANALYSIS ============
+def cliffs_delta_variance(x, y):
+    """Consistent variance estimate of Cliff's delta (Cliff 1993)"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n1, n2 = len(x), len(y)
+    if n1 < 2 or n2 < 2:
+        return None
+    dominance = np.sign(x[:, None] - y[None, :])
+    delta = dominance.mean()
+    row = dominance.mean(axis=1)
+    col = dominance.mean(axis=0)
+    variance = (n2 * n2 * np.sum((row - delta) ** 2) + n1 * n1 * np.sum((col - delta) ** 2)
+                - np.sum((dominance - delta) ** 2)) / (n1 * n2 * (n1 - 1) * (n2 - 1))
+    # Floor so complete separation (variance 0) keeps a finite weight
+    return float(max(variance, 1 / (n1 * n2)))
+
+
+def random_effects(estimates, variances):
+    """DerSimonian-Laird pooled estimate, 95% CI, tau² and I²"""
+    estimates = np.asarray(estimates, dtype=np.float64)
+    weights = 1 / np.asarray(variances, dtype=np.float64)
+    fixed = np.sum(weights * estimates) / np.sum(weights)
+    q = float(np.sum(weights * (estimates - fixed) ** 2))
+    df = len(estimates) - 1
+    c = np.sum(weights) - np.sum(weights ** 2) / np.sum(weights)
+    tau2 = max(0.0, (q - df) / c) if c > 0 else 0.0
+    weights = 1 / (np.asarray(variances) + tau2)
+    pooled = float(np.sum(weights * estimates) / np.sum(weights))
+    se = float(np.sqrt(1 / np.sum(weights)))
+    z = norm.ppf(1 - ALPHA / 2)
+    return {
+        "pooled": round(pooled, 4),
+        "ci_lower": round(max(-1.0, pooled - z * se), 4),
+        "ci_upper": round(min(1.0, pooled + z * se), 4),
+        "p_value": round(float(2 * norm.sf(abs(pooled) / se)), 6),
+        "tau_squared": round(float(tau2), 6),
+        "i_squared": round(max(0.0, (q - df) / q) if q > 0 else 0.0, 4),
+        "effect": interpret_delta(pooled)
+    }
+
+
+# ============ ACROSS DEVICES ============
+def _common(per_device, key):
+    """Architectures present in every device's `key` mapping"""
+    sets = [set(mapping[key]) for mapping in per_device]
+    return sorted(set.intersection(*sets)) if sets else []
+
+
+def cross_device(device_runs, device_results, architectures):
+    """
+    Blocked Friedman over devices and meta-analysed Cliff's deltas.
+
+    device_runs: {device_label: {test: {arch: runs}}};
+    device_results: {device_label: analyze_device() result}.
+    """
+    devices = list(device_results)
+    tests = [t for t in device_results[devices[0]]["per_test"] if all(t in r["per_test"] for r in device_results.values())]
+    per_test = {}
+    for test_name in tests:
+        cells = [device_results[d]["per_test"][test_name] for d in devices]
+        archs = [a for a in architectures if a in _common(cells, "median")]
+        matrix = np.array([[cell["median"][a] for a in archs] for cell in cells])
+        ranks = np.array([[cell["rank"][a] for a in archs] for cell in cells])
+        meta = {}
+        for arch1, arch2 in combinations(archs, 2):
+            estimates, variances = [], []
+            for d in devices:
+                x, y = device_runs[d][test_name][arch1], device_runs[d][test_name][arch2]
+                variance = cliffs_delta_variance(x, y)
+                if variance is None:
+                    continue
+                estimates.append(cliffs_delta(x, y))
+                variances.append(variance)
+            if len(estimates) >= 2:
+                meta[f"{arch1} vs {arch2}"] = random_effects(estimates, variances)
+        per_test[test_name] = {
+            "blocked_friedman": _friedman(matrix, archs),
+            "mean_rank": {a: round(float(ranks[:, i].mean()), 4) for i, a in enumerate(archs)},
+            "cliffs_delta_meta": meta
+        }
+
+    archs = [a for a in architectures if a in _common(list(device_results.values()), "average_ranks")]
+    average = np.array([[device_results[d]["average_ranks"][a] for a in archs] for d in devices])
+    best = average.argmin(axis=1) if len(archs) else np.array([], dtype=int)
+    mean_rank = {a: round(float(average[:, i].mean()), 4) for i, a in enumerate(archs)}
+    return {
+        "devices": devices,
+        "per_test": per_test,
+        "overall": {
+            "blocked_friedman": _friedman(average, archs),
+            "mean_average_rank": dict(sorted(mean_rank.items(), key=lambda x: x[1])),
+            "rank1_share": {a: round(float(np.mean(best == i)), 4) for i, a in enumerate(archs)}
+        }
+    }
+
+
+def pooled_descriptive(device_runs):
+    """
+    {test: {arch: descriptive stats}} over the runs of every device, from
+    one StreamingSummary per device merged across devices.
+    """
+    summaries = {}
+    for d, runs_by_test in enumerate(device_runs.values()):
+        for test_name, runs_by_arch in runs_by_test.items():
+            for arch, runs in runs_by_arch.items():
+                summary = summarize(runs, seed=DEFAULT_SEED + d)
+                cell = summaries.setdefault(test_name, {})
+                if arch in cell:
+                    cell[arch][0].merge(summary)
+                    cell[arch][1] += 1
+                else:
+                    cell[arch] = [summary, 1]
+    return {
+        test_name: {
+            arch: {**calculate_descriptive_stats(summary), "devices": devices,
+                   "rank_error": round(summary.sketch.rank_error(), 5)}
+            for arch, (summary, devices) in cell.items()
+        }
+        for test_name, cell in summaries.items()
+    }
+
+
+# ============ STAGE ============
+def aggregate_devices(datasets, tests, higher_is_better, jobs=1):
+    """Per-device and cross-device results for {DeviceIdentity: BenchmarkDataset}"""
+    labels = [device.label for device in datasets]
+    device_runs = {}
+    for label, dataset in zip(labels, datasets.values()):
+        data = dataset.benchmark_runs(tests)
+        device_runs[label] = {
+            test: {arch: data[arch][test] for arch in dataset.names() if test in data[arch]}
+            for test in tests
+        }
+    outcomes = parallel_map(analyze_device, [(device_runs[label], higher_is_better) for label in labels], jobs)
+
+    architectures = list(dict.fromkeys(name for dataset in datasets.values() for name in dataset.names()))
+    result = {
+        "devices": {
+            label: {
+                "identity": device.as_dict(),
+                "architectures": dataset.names(),
+                "result_files": [r.source for r in dataset.results.values()]
+            }
+            for label, (device, dataset) in zip(labels, datasets.items())
+        },
+        "per_device": dict(zip(labels, outcomes)),
+        "pooled_descriptive": pooled_descriptive(device_runs),
+        "cross_device": None
+    }
+    if len(labels) >= 2:
+        result["cross_device"] = cross_device(device_runs, result["per_device"], architectures)
+    else:
+        print("Warning: results from a single device; cross-device aggregation needs at least two")
+    return result
+
+
+def print_report(results):
+    """Console summary of aggregate_devices() output"""
+    print("\nPER-DEVICE AVERAGE RANKS:")
+    for label, outcome in results["per_device"].items():
+        ranking = ", ".join(f"{arch} {rank:.2f}" for arch, rank in outcome["average_ranks"].items())
+        print(f"  {label}: {ranking}")
+
+    cross = results["cross_device"]
+    if cross is None:
+        return
+    overall = cross["overall"]
+    print(f"\nACROSS {len(cross['devices'])} DEVICES (devices as blocks):")
+    friedman = overall["blocked_friedman"]
+    if friedman:
+        sig_str = "SIGNIFICANT" if friedman["significant"] else "NOT SIGNIFICANT"
+        print(f"  Friedman χ² = {friedman['chi_squared']:.4f}, p = {friedman['p_value']:.4f} [{sig_str}], "
+              f"Kendall's W = {friedman['kendalls_w']:.3f}")
+    print(f"  {'Architecture':25} {'Mean rank':>10} {'Rank-1 share':>13}")
+    for arch, rank in overall["mean_average_rank"].items():
+        print(f"  {arch:25} {rank:>10.2f} {overall['rank1_share'][arch]:>13.0%}")
+
+
+def run_device_analysis(data_dir, arch_mapping, tests, higher_is_better, output_file, jobs=1):
+    """Load every result file below data_dir, aggregate, write JSON and print the report"""
+    datasets = load_device_datasets(data_dir, arch_mapping, jobs)
+    print(f"Loaded {sum(len(d.results) for d in datasets.values())} result files from {len(datasets)} device(s)")
+    for device, dataset in datasets.items():
+        print(f"  {device.label:40} {len(dataset.results)} architectures")
+    results = aggregate_devices(datasets, tests, higher_is_better, jobs)
+    results = {"metadata": {"data_dir": data_dir, "analysis_date": datetime.now().isoformat()}, **results}
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print_report(results)
+    print(f"\n✓ Results saved to: {output_file}")
+    return results
@@ -0,0 +1,149 @@
+"""
+Energy efficiency per user action and per rendered frame
+
+Normalizing to a 60-second baseline charges an architecture for doing
+more work in that minute. This stage divides energy by the work instead:
+
+  - mWh per operation: Energy_mWh / Operations of the same iteration
+    (flings + filter taps, quantity taps, or streaming ticks, as counted
+    by EnergyBenchmark)
+  - µWh per frame: Energy_mWh / (frame rate × Duration_Sec), where the
+    frame rate of an architecture in a scenario comes from the rendering
+    benchmarks of the same workload (SCENARIO_FRAME_TESTS) in
+    rawdata/performance. The energy runs do not export frame counts and
+    the result files carry no frame timestamps, so the rate is frameCount
+    per iteration over the wall time per iteration (totalRunTimeNs /
+    iterations). That time includes the per-iteration setup, whose cost
+    differs between architectures and dominates the cart benchmark (a
+    few frames per second), so µWh per frame is a setup-inclusive estimate
+    (FRAME_RATE_BASIS) and is labelled as such in the JSON and report.
+
+The join is done on (architecture, scenario) arrays: energy and operations
+are (A, S, N), frame rates (A, S), and the ratios are broadcast.
+"""
+
+import numpy as np
+
+from archbench.loader import load_dataset
+
+# Rendering benchmarks that exercise the same workload as each energy scenario
+SCENARIO_FRAME_TESTS = {
+    "Product_Browsing": ["productListScrollAndPagination", "productListCategoryFiltering"],
+    "Shopping_Cart": ["cartQuantityUpdatesWithDynamicSetup"],
+    "Chat_Streaming": ["chatDetailMessageStreamAndSending", "chatListRealtimeUpdates"],
+}
+
+
+FRAME_RATE_BASIS = ("setup-inclusive estimate: frameCount / (totalRunTimeNs / iterations) of the rendering "
+                    "benchmarks; per-iteration setup time differs by architecture")
+
+
+def frames_per_second(benchmark):
+    """Per-iteration frame rates of one rendering benchmark over its setup-inclusive wall time, or None"""
+    runs = benchmark.get("metrics", {}).get("frameCount", {}).get("runs")
+    iterations = benchmark.get("repeatIterations", 0) + benchmark.get("warmupIterations", 0)
+    total_ns = benchmark.get("totalRunTimeNs")
+    if not runs or not iterations or not total_ns:
+        return None
+    seconds_per_iteration = total_ns / 1e9 / iterations
+    return np.asarray(runs, dtype=np.float64) / seconds_per_iteration
+
+
+def frame_rate_matrix(dataset, architectures, scenarios, scenario_tests=SCENARIO_FRAME_TESTS):
+    """(A, S) median frame rate over the mapped tests' iterations; NaN where unavailable"""
+    rates = np.full((len(architectures), len(scenarios)), np.nan)
+    for a, arch in enumerate(architectures):
+        result = dataset.by_key(arch)
+        if result is None:
+            continue
+        for s, scenario in enumerate(scenarios):
+            samples = [
+                frames_per_second(result.benchmarks[test])
+                for test in scenario_tests.get(scenario, []) if test in result.benchmarks
+            ]
+            samples = [rate for rate in samples if rate is not None]
+            if samples:
+                rates[a, s] = np.median(np.concatenate(samples))
+    return rates
+
+
+def _summary(values):
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return None
+    return {
+        "median": round(float(np.median(values)), 6),
+        "mean": round(float(np.mean(values)), 6),
+        "min": round(float(values.min()), 6),
+        "max": round(float(values.max()), 6)
+    }
+
+
+def _rank(values):
+    """{arch: rank} (1 = least energy) for the archs with a value"""
+    ordered = sorted((value, arch) for arch, value in values.items() if value is not None)
+    return {arch: rank for rank, (_, arch) in enumerate(ordered, 1)}
+
+
+def efficiency_analysis(data, performance_dir, scenario_tests=SCENARIO_FRAME_TESTS):
+    """
+    mWh per operation and µWh per frame for an archbench.energy.EnergyData,
+    joined with the rendering benchmarks in performance_dir.
+    """
+    energy = data["energy_mwh"]
+    duration = data["duration_sec"]
+    operations = data["operations"]
+
+    dataset = load_dataset(performance_dir, {arch: arch for arch in data.architectures})
+    rates = frame_rate_matrix(dataset, data.architectures, data.scenarios, scenario_tests)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        per_operation = np.where(operations > 0, energy / operations, np.nan)
+        operations_per_minute = np.where(duration > 0, operations / duration * 60, np.nan)
+        # mWh -> µWh over the frames rendered during the iteration
+        per_frame = energy * 1000 / (rates[..., None] * duration)
+
+    result = {
+        "performance_dir": performance_dir,
+        "frame_tests": {scenario: scenario_tests.get(scenario, []) for scenario in data.scenarios},
+        "frame_rate_basis": FRAME_RATE_BASIS,
+        "by_scenario": {}
+    }
+    for s, scenario in enumerate(data.scenarios):
+        cells = {}
+        for a, arch in enumerate(data.architectures):
+            op_stats = _summary(per_operation[a, s])
+            if op_stats is None:
+                continue
+            frame_stats = _summary(per_frame[a, s])
+            cells[arch] = {
+                "mwh_per_operation": op_stats,
+                "operations_per_minute": round(float(np.nanmedian(operations_per_minute[a, s])), 4),
+                "frames_per_second": round(float(rates[a, s]), 4) if np.isfinite(rates[a, s]) else None,
+                "uwh_per_frame": frame_stats
+            }
+        if not cells:
+            continue
+        op_ranks = _rank({arch: c["mwh_per_operation"]["median"] for arch, c in cells.items()})
+        frame_ranks = _rank({arch: c["uwh_per_frame"]["median"] if c["uwh_per_frame"] else None
+                             for arch, c in cells.items()})
+        for arch, cell in cells.items():
+            cell["rank_per_operation"] = op_ranks.get(arch)
+            cell["rank_per_frame"] = frame_ranks.get(arch)
+        result["by_scenario"][scenario] = cells
+
+    result["mean_rank"] = {
+        key: _mean_ranks(result["by_scenario"], key) for key in ("rank_per_operation", "rank_per_frame")
+    }
+    return result
+
+
+def _mean_ranks(by_scenario, key):
+    """Mean per-scenario rank of every architecture, ascending"""
+    ranks = {}
+    for cells in by_scenario.values():
+        for arch, cell in cells.items():
+            if cell[key] is not None:
+                ranks.setdefault(arch, []).append(cell[key])
+    means = {arch: round(float(np.mean(values)), 4) for arch, values in ranks.items()}
+    return dict(sorted(means.items(), key=lambda x: x[1]))
@@ -0,0 +1,499 @@
+"""
+Energy analysis engine behind analyze_energy_5arch.py and analyze_energy_consumption.py
+
+The scripts are presets (EnergyPreset): which architectures and
+scenarios, where the raw data lives and where the JSON goes. The engine
+discovers `<data_dir>/<arch>/detailed_<Scenario>[_<timestamp>].csv`,
+parses the files on a process pool, and stacks every column of the valid
+iterations into (architectures × scenarios × iterations) NumPy arrays
+(EnergyData, NaN-padded). Energy is normalized to the 60-second
+baseline and summarised in one vectorized pass:
+
+    Normalized_Energy = (Measured_Energy / Duration_Sec) × 60
+
+On top of that run, per scenario and for all scenarios combined, the
+Friedman test, Nemenyi post-hoc (when Friedman is significant), Cliff's
+delta for every pair, spike counts above a fixed threshold and the
+counter-quantization model (archbench.quantization), energy per
+operation / per frame (archbench.efficiency) and the thermal / battery
+covariate adjustment (archbench.covariates). Device summaries
+(energy_consumption.json) are attached when present.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import scikit_posthocs as sp
+from scipy.stats import friedmanchisquare
+
+from archbench.covariates import energy_adjustment
+from archbench.effect_size import cliffs_delta, interpret_delta
+from archbench.energy_csv import iter_detailed_files, read_detailed_csv
+from archbench.efficiency import efficiency_analysis
+from archbench.energy_json import load_device_summaries
+from archbench.parallel import parallel_map
+from archbench.quantization import quantization_analysis
+
+BASELINE_DURATION_SEC = 60
+SPIKE_THRESHOLD_MWH = 35
+ALPHA = 0.05
+NORMALIZATION_FORMULA = "Normalized_Energy = (Measured_Energy / Test_Duration) × 60"
+
+# EnergyIteration columns kept per iteration
+FIELDS = ("iteration", "energy_mwh", "charge_mah", "power_mw", "duration_sec",
+          "battery_pct", "temp_c", "operations")
+
+
+@dataclass
+class EnergyPreset:
+    """What one energy entry point analyses"""
+    title: str
+    data_dir: str
+    output_file: str
+    architectures: list = None  # None: every architecture folder under data_dir
+    scenarios: list = None      # None: every scenario found
+    scope: str = None
+    spike_threshold_mwh: float = SPIKE_THRESHOLD_MWH
+    performance_dir: str = None  # rendering benchmarks for the per-frame join; None skips it
+
+
+# ============ DISCOVERY & LOADING ============
+def discover_scenario_files(data_dir, architectures=None):
+    """
+    {arch: {scenario: path}} for the detailed CSVs under data_dir.
+
+    Files are visited in name order, so when a scenario was exported more
+    than once the newest `_<timestamp>` file wins.
+    """
+    files = {}
+    if not os.path.isdir(data_dir):
+        print(f"Warning: Energy data directory not found: {data_dir}")
+        return files
+    for arch, scenario, path in iter_detailed_files(data_dir):
+        if architectures is None or arch in architectures:
+            files.setdefault(arch, {})[scenario] = path
+    return files
+
+
+def _read_valid_iterations(path):
+    """(n, len(FIELDS)) array of the valid iterations of one CSV"""
+    rows = [tuple(getattr(r, name) for name in FIELDS) for r in read_detailed_csv(path) if r.valid]
+    return np.array(rows, dtype=np.float64).reshape(-1, len(FIELDS))
+
+
+@dataclass
+class EnergyData:
+    """Valid iterations as (architectures × scenarios × iterations) arrays, NaN-padded"""
+    architectures: list
+    scenarios: list
+    fields: dict  # FIELDS name -> (A, S, N) array
+
+    def __getitem__(self, name):
+        return self.fields[name]
+
+    def normalized(self):
+        """Energy normalized to the 60 s baseline; NaN where duration is not positive"""
+        energy, duration = self.fields["energy_mwh"], self.fields["duration_sec"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(duration > 0, energy / duration * BASELINE_DURATION_SEC, np.nan)
+
+
+def load_energy_data(data_dir, architectures=None, scenarios=None, jobs=1):
+    """Parse all scenario files (on a process pool) into an EnergyData"""
+    files = discover_scenario_files(data_dir, architectures)
+    if architectures is None:
+        architectures = sorted(files)
+    if scenarios is None:
+        scenarios = sorted({scenario for by_scenario in files.values() for scenario in by_scenario})
+
+    for arch in architectures:
+        if arch not in files:
+            print(f"Warning: Architecture folder not found: {arch}")
+
+    cells = [(a, s) for a, arch in enumerate(architectures) for s, scenario in enumerate(scenarios)
+             if scenario in files.get(arch, {})]
+    parsed = parallel_map(
+        _read_valid_iterations,
+        [(files[architectures[a]][scenarios[s]],) for a, s in cells],
+        jobs
+    )
+
+    width = max((len(rows) for rows in parsed), default=0)
+    stacked = np.full((len(architectures), len(scenarios), width, len(FIELDS)), np.nan)
+    for (a, s), rows in zip(cells, parsed):
+        stacked[a, s, :len(rows)] = rows
+    fields = {name: stacked[..., i] for i, name in enumerate(FIELDS)}
+    return EnergyData(list(architectures), list(scenarios), fields)
+
+
+# ============ DESCRIPTIVE STATISTICS ============
+def descriptive_stats(normalized):
+    """
+    Mean/median/std/CV/min/max over the last axis of an (A, S, N) array,
+    ignoring NaN. Returns ({name: (A, S) array}, (A, S) counts); empty
+    cells are 0.
+    """
+    counts = np.sum(~np.isnan(normalized), axis=-1)
+    # Empty cells become a row of zeros so the nan-reductions never see an all-NaN slice
+    filled = np.where((counts > 0)[..., None], normalized, 0.0)
+    n = np.maximum(counts, 1)
+    mean = np.nansum(filled, axis=-1) / n
+    squares = np.nansum((filled - mean[..., None]) ** 2, axis=-1)
+    std = np.sqrt(np.divide(squares, counts - 1, out=np.zeros_like(squares), where=counts > 1))
+    cv = np.divide(std, mean, out=np.zeros_like(std), where=mean != 0) * 100
+    stats = {
+        "mean": mean,
+        "median": np.nanmedian(filled, axis=-1),
+        "std": std,
+        "cv_percent": cv,
+        "min": np.nanmin(filled, axis=-1),
+        "max": np.nanmax(filled, axis=-1)
+    }
+    return stats, counts
+
+
+def build_normalized_data(architectures, scenarios, normalized):
+    """{arch: {scenario: {"iterations": [...], mean, median, ...}}} for cells with data"""
+    stats, counts = descriptive_stats(normalized)
+    normalized_data = {}
+    for a, arch in enumerate(architectures):
+        if not counts[a].any():
+            continue
+        normalized_data[arch] = {}
+        for s, scenario in enumerate(scenarios):
+            if counts[a, s] == 0:
+                print(f"Warning: No valid data for {arch}/{scenario}")
+                continue
+            row = normalized[a, s]
+            normalized_data[arch][scenario] = {
+                "iterations": [round(float(v), 4) for v in row[~np.isnan(row)]],
+                **{key: round(float(values[a, s]), 4) for key, values in stats.items()}
+            }
+    return normalized_data
+
+
+# ============ RANKINGS & TESTS ============
+def get_direction_interpretation(delta, arch1, arch2):
+    """For energy: negative delta = arch1 more efficient (lower consumption)"""
+    if abs(delta) < 0.147:
+        return "equivalent"
+    if delta < 0:
+        return f"{arch1} more efficient"
+    return f"{arch2} more efficient"
+
+
+def _ranking(values, value_key):
+    """Ascending rankings (lower energy is better) and max/min spread in percent"""
+    ranked = sorted(values.items(), key=lambda x: x[1])
+    rankings = [
+        {"rank": rank, "architecture": arch, value_key: round(value, 4)}
+        for rank, (arch, value) in enumerate(ranked, 1)
+    ]
+    range_percent = 0.0
+    if len(ranked) > 1 and ranked[0][1] > 0:
+        range_percent = (ranked[-1][1] - ranked[0][1]) / ranked[0][1] * 100
+    return {"rankings": rankings, "range_percent": round(range_percent, 4)}
+
+
+def rank_summary(normalized_data, scenarios):
+    """Per-scenario median rankings and overall rankings by the sum of scenario medians"""
+    summary = {"by_scenario": {}, "overall": {}}
+    for scenario in scenarios:
+        medians = {
+            arch: by_scenario[scenario]["median"]
+            for arch, by_scenario in normalized_data.items() if scenario in by_scenario
+        }
+        if medians:
+            summary["by_scenario"][scenario] = _ranking(medians, "median")
+
+    totals = {
+        arch: sum(by_scenario[scenario]["median"] for scenario in scenarios if scenario in by_scenario)
+        for arch, by_scenario in normalized_data.items()
+    }
+    summary["overall"] = _ranking(totals, "total_median")
+    return summary
+
+
+def compare_architectures(runs_by_arch, label):
+    """Friedman (+ Nemenyi when significant) and Cliff's delta for {arch: runs}"""
+    arch_list = list(runs_by_arch.keys())
+    # Friedman needs a balanced block design: truncate to the shortest series
+    min_len = min(len(runs) for runs in runs_by_arch.values())
+    matrix = np.array([runs_by_arch[arch][:min_len] for arch in arch_list]).T
+
+    friedman_result = {"statistic": None, "p_value": None, "significant": False, "df": len(arch_list) - 1}
+    nemenyi_result = {"performed": False, "pairwise_p_values": {}, "significant_pairs": []}
+    try:
+        stat, p_value = friedmanchisquare(*[matrix[:, i] for i in range(matrix.shape[1])])
+        friedman_result.update(
+            statistic=round(float(stat), 4),
+            p_value=round(float(p_value), 4),
+            significant=bool(p_value < ALPHA)
+        )
+        if friedman_result["significant"]:
+            try:
+                nemenyi_matrix = sp.posthoc_nemenyi_friedman(pd.DataFrame(matrix, columns=arch_list))
+                nemenyi_result["performed"] = True
+                for arch1, arch2 in combinations(arch_list, 2):
+                    pair_key = f"{arch1}_vs_{arch2}"
+                    p_val = float(nemenyi_matrix.loc[arch1, arch2])
+                    nemenyi_result["pairwise_p_values"][pair_key] = round(p_val, 4)
+                    if p_val < ALPHA:
+                        nemenyi_result["significant_pairs"].append(pair_key)
+            except Exception as e:
+                print(f"    Warning: Nemenyi test failed for {label}: {e}")
+    except Exception as e:
+        print(f"    Warning: Friedman test failed for {label}: {e}")
+
+    cliffs = {}
+    for arch1, arch2 in combinations(arch_list, 2):
+        delta = cliffs_delta(runs_by_arch[arch1], runs_by_arch[arch2])
+        cliffs[f"{arch1}_vs_{arch2}"] = {
+            "delta": round(float(delta), 4),
+            "interpretation": interpret_delta(delta),
+            "direction": get_direction_interpretation(delta, arch1, arch2)
+        }
+    return {"friedman": friedman_result, "nemenyi": nemenyi_result, "cliffs_delta": cliffs}
+
+
+def statistical_tests(normalized_data, architectures, scenarios):
+    """compare_architectures() per scenario and over all scenarios combined (≥ 3 architectures)"""
+    tests = {}
+    for scenario in scenarios:
+        print(f"  Analyzing {scenario}...")
+        runs = {
+            arch: normalized_data[arch][scenario]["iterations"]
+            for arch in architectures if scenario in normalized_data.get(arch, {})
+        }
+        if len(runs) < 3:
+            print(f"    Warning: Not enough data for {scenario}")
+            continue
+        tests[scenario] = compare_architectures(runs, scenario)
+
+    print("  Analyzing overall (combined scenarios)...")
+    combined = {}
+    for arch in architectures:
+        values = [v for scenario in scenarios for v in normalized_data.get(arch, {}).get(scenario, {}).get("iterations", [])]
+        if values:
+            combined[arch] = values
+    if len(combined) >= 3:
+        tests["overall"] = compare_architectures(combined, "overall")
+    return tests
+
+
+def spike_analysis(normalized_data, scenarios, threshold_mwh):
+    """Iterations above threshold_mwh (normalized) per architecture and scenario"""
+    spikes = {"threshold_mWh": threshold_mwh, "by_architecture_scenario": {}}
+    for arch, by_scenario in normalized_data.items():
+        spikes["by_architecture_scenario"][arch] = {}
+        for scenario in scenarios:
+            if scenario not in by_scenario:
+                continue
+            iterations = np.asarray(by_scenario[scenario]["iterations"])
+            spike_count = int(np.count_nonzero(iterations > threshold_mwh))
+            spikes["by_architecture_scenario"][arch][scenario] = {
+                "spike_count": spike_count,
+                "total_valid": len(iterations),
+                "spike_frequency_percent": round(spike_count / len(iterations) * 100, 4)
+            }
+    return spikes
+
+
+# ============ PIPELINE ============
+def convert_to_native(obj):
+    """Convert numpy types to native Python for JSON"""
+    if isinstance(obj, (np.integer, np.int_)):
+        return int(obj)
+    if isinstance(obj, (np.floating, np.float64, np.float32)):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (np.bool_, bool)):
+        return bool(obj)
+    if isinstance(obj, dict):
+        return {k: convert_to_native(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [convert_to_native(i) for i in obj]
+    return obj
+
+
+def analyze_energy(preset, jobs=1):
+    """Load, normalize and test one preset; returns the results document"""
+    print("Loading energy consumption data...")
+    data = load_energy_data(preset.data_dir, preset.architectures, preset.scenarios, jobs)
+    architectures, scenarios = data.architectures, data.scenarios
+    device_summaries = load_device_summaries(preset.data_dir, architectures)
+    print(f"  Device summaries (energy_consumption.json): {len(device_summaries)}/{len(architectures)}")
+
+    print("Normalizing data to 60-second baseline...")
+    normalized_data = build_normalized_data(architectures, scenarios, data.normalized())
+
+    print("Calculating rankings...")
+    summary = rank_summary(normalized_data, scenarios)
+
+    print("Performing statistical tests...")
+    tests = statistical_tests(normalized_data, architectures, scenarios)
+
+    print("Analyzing energy spikes...")
+    spikes = spike_analysis(normalized_data, scenarios, preset.spike_threshold_mwh)
+
+    print("Estimating energy-counter quantization...")
+    quantization = quantization_analysis(data)
+
+    print("Adjusting for iteration order, temperature and battery level...")
+    covariate_adjustment = energy_adjustment(data)
+
+    efficiency = None
+    if preset.performance_dir and os.path.isdir(preset.performance_dir):
+        print("Computing energy per operation and per frame...")
+        efficiency = efficiency_analysis(data, preset.performance_dir)
+
+    metadata = {"analysis_date": datetime.now().isoformat()}
+    if preset.scope:
+        metadata["scope"] = preset.scope
+    metadata.update({
+        "normalization_formula": NORMALIZATION_FORMULA,
+        "baseline_duration_sec": BASELINE_DURATION_SEC,
+        "data_dir": preset.data_dir,
+        "architectures": architectures,
+        "scenarios": scenarios
+    })
+    return convert_to_native({
+        "metadata": metadata,
+        "normalized_data": normalized_data,
+        "summary": summary,
+        "statistical_tests": tests,
+        "spike_analysis": spikes,
+        "quantization": quantization,
+        "efficiency": efficiency,
+        "covariate_adjustment": covariate_adjustment,
+        "device_summaries": device_summaries
+    })
+
+
+def print_report(results):
+    """Console summary of a results document"""
+    normalized_data = results["normalized_data"]
+    summary = results["summary"]
+    tests = results["statistical_tests"]
+
+    print("\n" + "="*80)
+    print("=== ENERGY ANALYSIS RESULTS ===")
+    print("="*80)
+
+    overall_rankings = summary["overall"]["rankings"]
+    print("\nOVERALL RANKINGS (Total Normalized Energy - Lower is Better):")
+    print(f"{'Rank':<6}{'Architecture':<20}{'Total (mWh)':<15}{'vs Best':<15}")
+    print("-"*56)
+    if overall_rankings:
+        best_total = overall_rankings[0]["total_median"]
+        for rank_info in overall_rankings:
+            total = rank_info["total_median"]
+            vs_best = f"+{(total - best_total) / best_total * 100:.1f}%" if total > best_total else "-"
+            print(f"{rank_info['rank']:<6}{rank_info['architecture']:<20}{total:<15.4f}{vs_best:<15}")
+
+    quantization = results.get("quantization")
+    if quantization:
+        overall = quantization["rankings"]["overall"]
+        steps = [arch["energy_quantum_mwh"] for arch in quantization["by_architecture"].values()]
+        print(f"\nCOUNTER QUANTIZATION: step {quantization['charge_quantum_mah']} mAh "
+              f"≈ {min(steps):.2f}-{max(steps):.2f} mWh")
+        print(f"  By quantization-aware mean: {', '.join(overall['by_estimate'])}")
+        print(f"  By median:                  {', '.join(overall['by_median'])}")
+        if overall["rankings_flip"]:
+            print(f"  Warning: {len(overall['swapped_pairs'])} architecture pair(s) swap order between the two")
+
+    efficiency = results.get("efficiency")
+    if efficiency:
+        print("\nENERGY PER OPERATION / PER FRAME (median, lower is better):")
+        print(f"{'Scenario':<18}{'Architecture':<20}{'mWh/op':<12}{'µWh/frame*':<12}")
+        print("-"*62)
+        for scenario, cells in efficiency["by_scenario"].items():
+            for arch, cell in sorted(cells.items(), key=lambda x: x[1]["rank_per_operation"]):
+                per_frame = cell["uwh_per_frame"]["median"] if cell["uwh_per_frame"] else float("nan")
+                print(f"{scenario:<18}{arch:<20}{cell['mwh_per_operation']['median']:<12.4f}{per_frame:<12.2f}")
+        print(f"* {efficiency['frame_rate_basis']}")
+
+    adjustment = results.get("covariate_adjustment")
+    if adjustment:
+        print("\nCOVARIATE ADJUSTMENT (rank ANCOVA on iteration, temperature, battery):")
+        for scenario, comparison in adjustment["by_scenario"].items():
+            confounded = list(comparison["confounded_with_architecture"])
+            if confounded:
+                print(f"  {scenario}: Warning: {', '.join(confounded)} "
+                      f"{'is' if len(confounded) == 1 else 'are'} confounded with architecture; "
+                      f"{'its effect' if len(confounded) == 1 else 'their effects'} cannot be separated and "
+                      f"{'was' if len(confounded) == 1 else 'were'} left out")
+            if not comparison["identifiable"]:
+                print(f"  {scenario}: adjustment not identifiable ({comparison['reason']})")
+                continue
+            ancova = comparison["rank_ancova"]
+            p_value = f"{ancova['p_value']:.4f}" if ancova["p_value"] is not None else "n/a"
+            print(f"  {scenario}: adjusted for {', '.join(ancova['covariates'])}: p = {p_value} "
+                  f"(unadjusted {ancova['unadjusted_p_value']}), "
+                  f"ranking by adjusted mean {'CHANGED' if comparison['ranking_changed'] else 'unchanged'}"
+                  + (f"; balanced across architectures: {', '.join(comparison['balanced_covariates'])}"
+                     if comparison["balanced_covariates"] else ""))
+        for arch, scenarios in adjustment["unstable_iterations"].items():
+            for scenario, iterations in scenarios.items():
+                print(f"  Outside thermal window: {arch}/{scenario} iterations {iterations}")
+
+    for scenario in results["metadata"]["scenarios"]:
+        print(f"\nSCENARIO: {scenario}")
+        print(f"{'Rank':<6}{'Architecture':<20}{'Median (mWh)':<15}{'CV%':<10}")
+        print("-"*51)
+        if scenario not in summary["by_scenario"]:
+            continue
+        for rank_info in summary["by_scenario"][scenario]["rankings"]:
+            arch = rank_info["architecture"]
+            cv = normalized_data[arch][scenario]["cv_percent"]
+            print(f"{rank_info['rank']:<6}{arch:<20}{rank_info['median']:<15.4f}{cv:<10.2f}")
+
+        if scenario not in tests:
+            continue
+        friedman = tests[scenario]["friedman"]
+        if friedman["statistic"] is not None:
+            sig_str = "SIGNIFICANT" if friedman["significant"] else "NOT SIGNIFICANT"
+            print(f"\nFriedman Test: χ² = {friedman['statistic']:.4f}, p = {friedman['p_value']:.4f} [{sig_str}]")
+
+        nemenyi = tests[scenario]["nemenyi"]
+        if nemenyi["performed"] and nemenyi["significant_pairs"]:
+            print("Significant Nemenyi pairs:")
+            for pair in nemenyi["significant_pairs"][:5]:
+                print(f"  {pair.replace('_', ' ')} (p={nemenyi['pairwise_p_values'][pair]:.4f})")
+
+        cliffs = tests[scenario]["cliffs_delta"]
+        large_effects = [pair for pair, data in cliffs.items() if data["interpretation"] == "large"]
+        if large_effects:
+            print("Large effect sizes:")
+            for pair in large_effects[:5]:
+                delta_data = cliffs[pair]
+                print(f"  {pair.replace('_', ' ')} (δ={delta_data['delta']:.4f}, {delta_data['direction']})")
+
+
+def run_energy_analysis(preset, jobs=1):
+    """Analyse a preset, write its JSON and print the report"""
+    print("="*80)
+    print(preset.title)
+    print("="*80)
+    print()
+
+    results = analyze_energy(preset, jobs)
+
+    os.makedirs(os.path.dirname(preset.output_file) or ".", exist_ok=True)
+    print(f"\nSaving results to: {preset.output_file}")
+    with open(preset.output_file, 'w') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print_report(results)
+
+    print("\n" + "="*80)
+    print("✓ Analysis complete!")
+    print(f"✓ Results saved to: {preset.output_file}")
+    print("="*80)
+    return results
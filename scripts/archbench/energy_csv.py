@@ -0,0 +1,149 @@
+"""
+Streaming parser for the per-iteration energy CSVs
+
+EnergyHelper.saveDetailedResults writes one `detailed_<Scenario>[_<timestamp>].csv`
+per scenario:
+
+    Iteration,Energy_mWh,Charge_mAh,Power_mW,Duration_Sec,Valid,Battery_%,Temp_C,Operations
+    1,20,6650,5,0000,1210,4852,61,46,true,77,31,3,99
+
+The decimals come from String.format("%.4f") in the device locale, so on
+comma-decimal locales (tr, de, ...) every float also contains the field
+separator. The format string fixes the number of fraction digits per
+column (%.4f, %.2f, %.1f), which makes the row unambiguous: the header
+is mapped to a column schema and compiled into one anchored regex that
+accepts either decimal mark. Every column is decoded; nothing is guessed
+from positions around `Valid`.
+
+Files are read line by line and records are yielded lazily, so a device
+farm's worth of CSVs can be streamed without holding any file in memory.
+"""
+
+import os
+import re
+from typing import NamedTuple
+
+DETAILED_PREFIX = "detailed_"
+
+# Header column -> (record field, kind, fraction digits written by the device)
+COLUMNS = {
+    "Iteration": ("iteration", "int", 0),
+    "Energy_mWh": ("energy_mwh", "float", 4),
+    "Charge_mAh": ("charge_mah", "float", 4),
+    "Power_mW": ("power_mw", "float", 4),
+    "Duration_Sec": ("duration_sec", "float", 2),
+    "Valid": ("valid", "bool", 0),
+    "Battery_%": ("battery_pct", "int", 0),
+    "Temp_C": ("temp_c", "float", 1),
+    "Operations": ("operations", "int", 0),
+}
+
+_INT = r"(-?\d+)"
+_BOOL = r"(true|false)"
+
+
+class EnergyIteration(NamedTuple):
+    """One measured iteration of a scenario"""
+    iteration: int
+    energy_mwh: float
+    charge_mah: float
+    power_mw: float
+    duration_sec: float
+    valid: bool
+    battery_pct: int
+    temp_c: float
+    operations: int
+
+
+class CsvSchema:
+    """Row decoder compiled from a detailed CSV header"""
+
+    def __init__(self, header):
+        names = [name.strip() for name in header.strip().split(",")]
+        unknown = [name for name in names if name not in COLUMNS]
+        missing = [name for name in COLUMNS if name not in names]
+        if unknown or missing:
+            raise ValueError(f"Unexpected energy CSV header (unknown: {unknown}, missing: {missing})")
+
+        parts = []
+        self._decoders = []
+        group = 1
+        for name in names:
+            field, kind, decimals = COLUMNS[name]
+            if kind == "float":
+                # Integer part, either decimal mark, fixed-width fraction
+                parts.append(rf"(-?\d+)[.,](\d{{{decimals}}})")
+                self._decoders.append((field, kind, group, group + 1))
+                group += 2
+            else:
+                parts.append(_BOOL if kind == "bool" else _INT)
+                self._decoders.append((field, kind, group, None))
+                group += 1
+        self.pattern = re.compile("^" + ",".join(parts) + "$", re.IGNORECASE)
+
+    def decode(self, line):
+        """EnergyIteration for a data line, or None if it does not match the schema"""
+        match = self.pattern.match(line)
+        if match is None:
+            return None
+        values = {}
+        for field, kind, group, fraction in self._decoders:
+            token = match.group(group)
+            if kind == "float":
+                values[field] = float(f"{token}.{match.group(fraction)}")
+            elif kind == "bool":
+                values[field] = token.lower() == "true"
+            else:
+                values[field] = int(token)
+        return EnergyIteration(**values)
+
+
+def iter_detailed_csv(path):
+    """Yield EnergyIteration records of one detailed CSV, one line at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        schema = None
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if schema is None:
+                schema = CsvSchema(line)
+                continue
+            record = schema.decode(line)
+            if record is None:
+                print(f"Warning: skipping malformed row {path}:{line_number}")
+                continue
+            yield record
+
+
+def read_detailed_csv(path):
+    """All records of one detailed CSV"""
+    return list(iter_detailed_csv(path))
+
+
+def scenario_from_filename(filename):
+    """'detailed_Chat_Streaming_20251115_153955.csv' -> 'Chat_Streaming' (None if not a detailed CSV)"""
+    stem, ext = os.path.splitext(os.path.basename(filename))
+    if ext.lower() != ".csv" or not stem.startswith(DETAILED_PREFIX):
+        return None
+    scenario = stem[len(DETAILED_PREFIX):]
+    # Strip the _yyyyMMdd_HHmmss suffix of files pulled straight from the device
+    return re.sub(r"(_\d{8}_\d{6})$", "", scenario)
+
+
+def iter_detailed_files(data_dir):
+    """Yield (architecture, scenario, path) for every detailed CSV under data_dir/<arch>/"""
+    for arch_entry in sorted(os.scandir(data_dir), key=lambda e: e.name):
+        if not arch_entry.is_dir():
+            continue
+        for entry in sorted(os.scandir(arch_entry.path), key=lambda e: e.name):
+            scenario = scenario_from_filename(entry.name) if entry.is_file() else None
+            if scenario is not None:
+                yield arch_entry.name, scenario, entry.path
+
+
+def iter_energy_records(data_dir):
+    """Yield (architecture, scenario, EnergyIteration) across all detailed CSVs, lazily"""
+    for arch, scenario, path in iter_detailed_files(data_dir):
+        for record in iter_detailed_csv(path):
+            yield arch, scenario, record
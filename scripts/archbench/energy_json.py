@@ -0,0 +1,125 @@
+"""
+Repairing reader for the device's energy_consumption.json summaries
+
+EnergyHelper.saveJsonResults builds the document by hand with
+String.format("%.4f") in the device locale, so on comma-decimal locales
+every number is written as `"energy_mWh": 41,2500` and the file is not
+valid JSON. The writer puts one `"key": value` per line, so each line
+is repaired on its own while the file is streamed: a comma between two
+digit runs directly after `"key":` can only be a decimal mark (JSON
+never allows a digit after a value separator). Locale-specific
+non-finite values (NaN, ∞) are mapped to JSON's NaN/Infinity.
+
+A document carries per-scenario medians (`energy_mWh`, `charge_mAh`,
+`average_power_mW`, `duration_sec`), the on-device `statistics` block
+(mean, median, std_dev, cv, min, max, ci_95_*) and a run `summary`.
+"""
+
+import json
+import os
+import re
+import statistics
+
+from archbench.energy_csv import iter_detailed_csv
+
+SUMMARY_PREFIX = "energy_consumption"
+
+_COMMA_DECIMAL = re.compile(r'("[^"\\]*"\s*:\s*-?\d+),(\d+)(?=\s*(?:,|\}|\]|$))')
+_NON_FINITE = re.compile(r'("[^"\\]*"\s*:\s*)(-?)(?:∞|Infinity)(?=\s*(?:,|\}|\]|$))')
+
+# Fraction digits written by "%.4f": medians are compared at this precision
+DECIMALS = 4
+
+
+def repair_line(line):
+    """Rewrite comma decimals and non-finite values of one line as JSON"""
+    line = _COMMA_DECIMAL.sub(r"\1.\2", line)
+    return _NON_FINITE.sub(lambda m: f"{m.group(1)}{m.group(2)}Infinity", line)
+
+
+def iter_repaired_lines(path):
+    """Yield the repaired lines of a summary file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield repair_line(line)
+
+
+def load_energy_json(path):
+    """Parse one energy_consumption*.json (valid or comma-decimal); None if unreadable"""
+    try:
+        return json.loads("".join(iter_repaired_lines(path)))
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not parse {path}: {e}")
+        return None
+
+
+def find_energy_json(arch_dir):
+    """energy_consumption.json, else the newest energy_consumption_<timestamp>.json"""
+    plain = os.path.join(arch_dir, f"{SUMMARY_PREFIX}.json")
+    if os.path.exists(plain):
+        return plain
+    candidates = sorted(
+        name for name in os.listdir(arch_dir)
+        if name.startswith(f"{SUMMARY_PREFIX}_") and name.endswith(".json")
+    )
+    return os.path.join(arch_dir, candidates[-1]) if candidates else None
+
+
+def scenario_results(document):
+    """{scenario: result} of a parsed summary document"""
+    return {result["scenario"]: result for result in document.get("results", [])}
+
+
+def check_against_csv(document, arch_dir):
+    """
+    Compare the on-device median energy per scenario with the median of
+    the valid iterations in detailed_<Scenario>.csv.
+
+    Returns {scenario: {"reported", "recomputed", "consistent"}} for the
+    scenarios that have both.
+    """
+    checks = {}
+    for scenario, result in scenario_results(document).items():
+        reported = (result.get("statistics") or {}).get("median", result.get("energy_mWh"))
+        csv_path = os.path.join(arch_dir, f"detailed_{scenario}.csv")
+        if reported is None or not os.path.exists(csv_path):
+            continue
+        energies = [record.energy_mwh for record in iter_detailed_csv(csv_path) if record.valid]
+        if not energies:
+            continue
+        recomputed = statistics.median(energies)
+        checks[scenario] = {
+            "reported": reported,
+            "recomputed": round(recomputed, DECIMALS),
+            "consistent": abs(recomputed - reported) <= 10 ** -DECIMALS
+        }
+    return checks
+
+
+def load_device_summaries(data_dir, architectures):
+    """{arch: summary} for every architecture folder that has a readable summary JSON"""
+    summaries = {}
+    for arch_name in architectures:
+        arch_dir = os.path.join(data_dir, arch_name)
+        if not os.path.isdir(arch_dir):
+            continue
+        path = find_energy_json(arch_dir)
+        document = load_energy_json(path) if path else None
+        if document is None:
+            continue
+
+        checks = check_against_csv(document, arch_dir)
+        for scenario, check in checks.items():
+            if not check["consistent"]:
+                print(f"Warning: {arch_name}/{scenario} device median {check['reported']} "
+                      f"!= CSV median {check['recomputed']}")
+        summaries[arch_name] = {
+            "source": os.path.basename(path),
+            "device": document.get("device"),
+            "timestamp": document.get("timestamp_readable"),
+            "measurement_method": document.get("measurement_method"),
+            "scenarios": scenario_results(document),
+            "summary": document.get("summary", {}),
+            "csv_check": checks
+        }
+    return summaries
@@ -0,0 +1,83 @@
+"""
+Dependency-tracked result cache for incremental re-analysis
+
+Every unit of work (one test, one architecture pair) is keyed by a
+fingerprint: the SHA-256 of everything it depends on (input series,
+architecture set, parameters, ANALYSIS_VERSION). Results are stored as
+JSON, so a cached result is byte-for-byte what a fresh run would write.
+When one architecture's result file changes, only the tests and pairs
+that include its series get new fingerprints and are recomputed.
+
+Entries that were not used by the latest run are dropped on save, so the
+cache never outgrows the current input set. A reused unit touches the
+entries it was built from (a test its pairs) so they survive as well.
+"""
+
+import hashlib
+import json
+import os
+
+CACHE_DIR = ".archbench_cache"
+
+# Bump when the statistics of a cached unit change meaning
+ANALYSIS_VERSION = 1
+
+
+def _native(obj):
+    if hasattr(obj, "item"):
+        return obj.item()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Not JSON serialisable: {type(obj).__name__}")
+
+
+def fingerprint(*parts):
+    """Stable SHA-256 of JSON-serialisable parts (floats keep full precision)"""
+    payload = json.dumps([ANALYSIS_VERSION, *parts], sort_keys=True, separators=(",", ":"), default=_native)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """JSON-backed {fingerprint: result} store"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    stored = json.load(f)
+                if stored.get("version") == ANALYSIS_VERSION:
+                    self.entries = stored.get("entries", {})
+            except (OSError, ValueError):
+                print(f"Warning: ignoring unreadable cache {path}")
+
+    def get(self, key):
+        if key in self.entries:
+            self.used.add(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def touch(self, key):
+        """Keep an entry on save without reading it (e.g. the pairs of a reused test)"""
+        if key in self.entries:
+            self.used.add(key)
+
+    def put(self, key, value):
+        """Store a result; NumPy scalars are stored as native JSON values"""
+        self.entries[key] = json.loads(json.dumps(value, default=_native))
+        self.used.add(key)
+
+    def save(self):
+        """Write used entries only (atomic replace)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        kept = {key: self.entries[key] for key in sorted(self.used)}
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({"version": ANALYSIS_VERSION, "entries": kept}, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,300 @@
+"""
+Single-pass loader for the rawdata/performance/*_result.json files
+
+Each result file is opened and parsed exactly once per process. The
+benchmarks, memoryBenchmarkResult snapshots, staticCodeAnalysis block and
+device context are split out in that one pass and handed to every analysis
+entry point through a BenchmarkDataset.
+
+Every result carries the identity of the device it ran on (DeviceIdentity,
+from `context`). load_device_datasets() walks a tree of result files from
+any number of devices, parses them on a process pool and returns one
+BenchmarkDataset per device.
+
+By default the files are served from the columnar run store
+(archbench.runstore), so only files whose content changed are parsed.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+from archbench import runstore
+from archbench.parallel import parallel_map
+
+DATA_DIR = "rawdata/performance"
+RESULT_SUFFIX = "_result.json"
+
+STARTUP_TESTS = ("startupCold", "startupWarm")
+
+# (abspath, mtime_ns, size) -> parsed blocks, shared by all loads in a process
+_PARSE_CACHE = {}
+
+
+# ============ METRIC SELECTION ============
+def get_metric_name(test_name):
+    """Determine metric name for a test"""
+    if test_name in STARTUP_TESTS:
+        return "timeToInitialDisplayMs"
+    else:
+        return "frameCount"
+
+
+def get_runs_from_benchmark(benchmark, metric_name):
+    """Extract runs data from benchmark"""
+    if "metrics" in benchmark and metric_name in benchmark["metrics"]:
+        if "runs" in benchmark["metrics"][metric_name]:
+            return benchmark["metrics"][metric_name]["runs"]
+    return None
+
+
+# ============ DEVICE ============
+@dataclass(frozen=True)
+class DeviceIdentity:
+    """Device class a result file was measured on (from its `context`)"""
+    model: Optional[str] = None
+    sdk: Optional[int] = None
+    cpu_max_freq_hz: Optional[int] = None
+    compilation_mode: Optional[str] = None
+
+    @property
+    def label(self):
+        parts = [self.model or "unknown"]
+        if self.sdk is not None:
+            parts.append(f"SDK {self.sdk}")
+        if self.cpu_max_freq_hz:
+            parts.append(f"{self.cpu_max_freq_hz / 1e9:.2f} GHz")
+        if self.compilation_mode:
+            parts.append(self.compilation_mode)
+        return " / ".join(parts)
+
+    def as_dict(self):
+        return {
+            "model": self.model,
+            "sdk": self.sdk,
+            "cpuMaxFreqHz": self.cpu_max_freq_hz,
+            "compilationMode": self.compilation_mode
+        }
+
+
+def device_identity(context):
+    """DeviceIdentity of a result file's context block"""
+    build = context.get("build", {})
+    return DeviceIdentity(
+        model=build.get("model"),
+        sdk=build.get("version", {}).get("sdk"),
+        cpu_max_freq_hz=context.get("cpuMaxFreqHz"),
+        compilation_mode=context.get("compilationMode"),
+    )
+
+
+# ============ DATASET ============
+@dataclass
+class ArchitectureResult:
+    """Everything one *_result.json contains for one architecture"""
+    key: str
+    name: str
+    source: str
+    context: dict = field(default_factory=dict)
+    benchmarks: Dict[str, dict] = field(default_factory=dict)
+    memory_rows: List[dict] = field(default_factory=list)
+    static_analysis: Optional[dict] = None
+    has_benchmarks: bool = True
+
+    @property
+    def device(self):
+        return device_identity(self.context)
+
+    def runs(self, test_name, metric_name=None):
+        """Per-iteration runs of a test, or None if the test is missing"""
+        benchmark = self.benchmarks.get(test_name)
+        if benchmark is None:
+            return None
+        return get_runs_from_benchmark(benchmark, metric_name or get_metric_name(test_name))
+
+    def sampled(self, test_name):
+        """sampledMetrics block of a test (frame timing), or None"""
+        benchmark = self.benchmarks.get(test_name)
+        if benchmark is None:
+            return None
+        return benchmark.get("sampledMetrics") or None
+
+
+@dataclass
+class BenchmarkDataset:
+    """Result files of one analysis, keyed by architecture display name"""
+    data_dir: str
+    results: Dict[str, ArchitectureResult] = field(default_factory=dict)
+
+    def names(self):
+        return list(self.results.keys())
+
+    def devices(self):
+        """Distinct devices of the loaded results, in load order"""
+        return list(dict.fromkeys(result.device for result in self.results.values()))
+
+    def by_key(self, arch_key):
+        for result in self.results.values():
+            if result.key == arch_key:
+                return result
+        return None
+
+    def select(self, arch_mapping):
+        """
+        Dataset restricted to arch_mapping ({arch_key: display_name}),
+        renamed to its display names; lets one loaded dataset serve
+        analyses with different architecture sets.
+        """
+        subset = BenchmarkDataset(data_dir=self.data_dir)
+        for arch_key, arch_name in arch_mapping.items():
+            result = self.by_key(arch_key)
+            if result is None:
+                print(f"Warning: {arch_key} not in loaded dataset, skipping")
+                continue
+            subset.results[arch_name] = replace(result, name=arch_name)
+        return subset
+
+    def benchmark_runs(self, tests):
+        """{arch_name: {test_name: runs}} for the given tests (non-empty runs only)"""
+        data = {}
+        for arch_name, result in self.results.items():
+            data[arch_name] = {}
+            for test_name in result.benchmarks:
+                if test_name not in tests:
+                    continue
+                runs = result.runs(test_name)
+                if runs is None or len(runs) == 0:
+                    continue
+                data[arch_name][test_name] = runs
+        return data
+
+
+# ============ LOADING ============
+def result_path(data_dir, arch_key):
+    return os.path.join(data_dir, f"{arch_key}{RESULT_SUFFIX}")
+
+
+def _read_raw(filepath, use_cache):
+    if use_cache:
+        try:
+            return runstore.load_result(filepath)
+        except OSError as e:
+            print(f"Warning: run store unavailable ({e}), parsing {filepath}")
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+def _parse_result_file(filepath, use_cache=True):
+    """Parse a result file once and split it into its blocks"""
+    stat = os.stat(filepath)
+    cache_key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+    cached = _PARSE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    raw = _read_raw(filepath, use_cache)
+
+    benchmarks = {}
+    for benchmark in raw.get("benchmarks", []):
+        name = benchmark.get("name")
+        if name is not None:
+            benchmarks[name] = benchmark
+
+    parsed = {
+        "context": raw.get("context", {}),
+        "benchmarks": benchmarks,
+        "has_benchmarks": "benchmarks" in raw,
+        "memory_rows": raw.get("memoryBenchmarkResult") or [],
+        "static_analysis": raw.get("staticCodeAnalysis"),
+    }
+    _PARSE_CACHE[cache_key] = parsed
+    return parsed
+
+
+def load_dataset(data_dir, arch_mapping, use_cache=True):
+    """
+    Load the result file of every architecture in arch_mapping.
+
+    arch_mapping: {arch_key: display_name}, e.g. {"mvi": "MVI"}; the order
+    of the mapping is kept. Missing files are reported and skipped.
+    use_cache: read through the columnar run store instead of the JSON.
+    """
+    dataset = BenchmarkDataset(data_dir=data_dir)
+
+    for arch_key, arch_name in arch_mapping.items():
+        filepath = result_path(data_dir, arch_key)
+        filename = os.path.basename(filepath)
+        if not os.path.exists(filepath):
+            print(f"Warning: {filename} not found, skipping {arch_key}")
+            continue
+
+        parsed = _parse_result_file(filepath, use_cache)
+        if not parsed["has_benchmarks"]:
+            print(f"Warning: No 'benchmarks' in {filename}")
+
+        dataset.results[arch_name] = _architecture_result(arch_key, arch_name, filepath, parsed)
+
+    return dataset
+
+
+def _architecture_result(arch_key, arch_name, filepath, parsed):
+    return ArchitectureResult(
+        key=arch_key,
+        name=arch_name,
+        source=filepath,
+        context=parsed["context"],
+        benchmarks=parsed["benchmarks"],
+        memory_rows=parsed["memory_rows"],
+        static_analysis=parsed["static_analysis"],
+        has_benchmarks=parsed["has_benchmarks"],
+    )
+
+
+# ============ MULTI-DEVICE ============
+def discover_result_files(root_dir):
+    """Every *_result.json below root_dir (recursive, sorted)"""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        dirnames.sort()
+        found.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.endswith(RESULT_SUFFIX))
+    return found
+
+
+def _architecture_key(filepath, context):
+    """context.build.architecture, else the file name prefix"""
+    arch_key = context.get("build", {}).get("architecture")
+    if arch_key:
+        return arch_key
+    return os.path.basename(filepath)[:-len(RESULT_SUFFIX)]
+
+
+def load_device_datasets(root_dir, arch_mapping, jobs=1, use_cache=True):
+    """
+    {DeviceIdentity: BenchmarkDataset} for all result files below root_dir.
+
+    Files are parsed on a process pool (jobs workers) and grouped by the
+    device identity in their context; architectures not in arch_mapping
+    are skipped. A second file for the same device and architecture is
+    reported and ignored, so each dataset has one result per architecture.
+    """
+    paths = discover_result_files(root_dir)
+    parsed_files = parallel_map(_parse_result_file, [(path, use_cache) for path in paths], jobs)
+
+    datasets = {}
+    for filepath, parsed in zip(paths, parsed_files):
+        arch_key = _architecture_key(filepath, parsed["context"])
+        if arch_key not in arch_mapping:
+            continue
+        arch_name = arch_mapping[arch_key]
+        device = device_identity(parsed["context"])
+        dataset = datasets.setdefault(device, BenchmarkDataset(data_dir=root_dir))
+        if arch_name in dataset.results:
+            print(f"Warning: duplicate {arch_key} result for {device.label} ({filepath}), skipping")
+            continue
+        dataset.results[arch_name] = _architecture_result(arch_key, arch_name, filepath, parsed)
+
+    # Keep each dataset in arch_mapping order, as load_dataset does
+    for device, dataset in datasets.items():
+        dataset.results = {name: dataset.results[name] for name in arch_mapping.values() if name in dataset.results}
+    return datasets
@@ -0,0 +1,220 @@
+"""
+Memory snapshot ingest for the memoryBenchmarkResult block
+
+BenchmarkHelper.exportMemoryResults writes one CSV line per snapshot
+phase (`01_AppLaunch` ... `10_Peak_AfterAllOperations`):
+
+    Label,Timestamp,TotalPSS_MB,PrivateDirty_MB,...,MemoryPressure_%
+    01_AppLaunch,1761306039500,29,57,21,27,...
+
+with every value formatted "%.2f" in the device locale. The result JSON
+holds that file transposed (one object per CSV column, one key per
+phase), and on comma-decimal locales each value was split in two columns,
+so the object labelled `TotalPSS_MB` holds the integer parts and the
+next one (labelled `PrivateDirty_MB`) the fraction digits. The labels are
+therefore ignored: the objects are read as the CSV columns in order, each
+phase's line is rebuilt from them, and the values are re-joined as
+`<integer>.<fraction>` when the line has two tokens per metric.
+
+The `# Initial_PSS_MB: 29` / `# Peak_PSS_MB: 38` keys of the summary block
+were split the same way (the fraction is the value of the first row) and
+are used to cross-check the rebuilt TotalPSS series.
+
+Files written with integer values only (one token per metric) are read
+as they are and reported with a 1 MB resolution.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple
+
+# CSV value columns after Label and Timestamp, in file order
+CSV_COLUMNS = (
+    "TotalPSS_MB", "PrivateDirty_MB", "SharedDirty_MB", "NativeHeap_MB", "DalvikHeap_MB",
+    "UsedMemory_MB", "TotalMemory_MB", "MaxMemory_MB", "FreeMemory_MB", "MemoryPressure_%",
+)
+FIELDS = (
+    "total_pss_mb", "private_dirty_mb", "shared_dirty_mb", "native_heap_mb", "dalvik_heap_mb",
+    "used_memory_mb", "total_memory_mb", "max_memory_mb", "free_memory_mb", "memory_pressure_pct",
+)
+
+# "%.2f" fraction digits
+DECIMALS = 2
+SUMMARY_TOLERANCE_MB = 0.005
+
+_PHASE = re.compile(r"^\d{2}_")
+_SUMMARY_KEY = re.compile(r"^# (Initial_PSS|Peak_PSS|Final_PSS|Growth)_MB: (-?\d+)(?:[.,](\d+))?$")
+_HEADER_KEY = re.compile(r"^# (Architecture|Test|Timestamp|Snapshots): (.*)$")
+_FRACTION = re.compile(r"^(\d+)(?:\s+\((.*)\))?$")
+
+
+class MemorySnapshot(NamedTuple):
+    """One phase of MemoryUsageBenchmark, values in MB (pressure in %)"""
+    phase: str
+    timestamp_ms: int
+    total_pss_mb: float
+    private_dirty_mb: float
+    shared_dirty_mb: float
+    native_heap_mb: float
+    dalvik_heap_mb: float
+    used_memory_mb: float
+    total_memory_mb: float
+    max_memory_mb: float
+    free_memory_mb: float
+    memory_pressure_pct: float
+
+
+@dataclass
+class MemoryProfile:
+    """All snapshots of one memory benchmark run"""
+    header: Dict[str, str] = field(default_factory=dict)
+    snapshots: List[MemorySnapshot] = field(default_factory=list)
+    resolution_mb: float = 10 ** -DECIMALS
+    reported_summary: Dict[str, object] = field(default_factory=dict)
+
+    def series(self, name):
+        """Values of one FIELDS entry in phase order"""
+        return [getattr(snapshot, name) for snapshot in self.snapshots]
+
+    @property
+    def full_precision(self):
+        return self.resolution_mb < 1
+
+    def summary(self):
+        """Initial, peak (and its phase), final and growth of TotalPSS, as the benchmark defines them"""
+        pss = self.series("total_pss_mb")
+        peak = max(range(len(pss)), key=lambda i: pss[i])
+        return {
+            "initial": pss[0],
+            "peak": pss[peak],
+            "peak_phase": self.snapshots[peak].phase,
+            "final": pss[-1],
+            "growth": round(pss[-1] - pss[0], DECIMALS)
+        }
+
+
+# ============ DECODING ============
+def _decimal(integer_part, fraction):
+    """Re-join a split "%.2f" value; the fraction keeps its leading zeros only when it was a string"""
+    digits = fraction if isinstance(fraction, str) else str(fraction).zfill(DECIMALS)
+    if not digits.isdigit():
+        raise ValueError(f"fraction {fraction!r}")
+    sign = "-" if str(integer_part).startswith("-") else ""
+    return float(f"{sign}{abs(int(integer_part))}.{digits}")
+
+
+def _line_values(tokens):
+    """Metric values of one rebuilt CSV line (after the timestamp); None if the width does not fit"""
+    if len(tokens) == 2 * len(CSV_COLUMNS):
+        return [_decimal(tokens[i], tokens[i + 1]) for i in range(0, len(tokens), 2)], 10 ** -DECIMALS
+    if len(tokens) == len(CSV_COLUMNS):
+        values = [float(token) for token in tokens]
+        resolution = 10 ** -DECIMALS if any(v != int(v) for v in values) else 1.0
+        return values, resolution
+    return None, None
+
+
+def _reported_summary(first_row):
+    """Summary block values from the split `# Initial_PSS_MB: 29`: 57 style keys"""
+    summary = {}
+    for key, value in first_row.items():
+        match = _SUMMARY_KEY.match(key)
+        if not match:
+            continue
+        name, integer_part, fraction = match.groups()
+        phase = None
+        if fraction is None and value != "":
+            fraction_match = _FRACTION.match(str(value))
+            if fraction_match:
+                fraction, phase = fraction_match.groups()
+        summary[name.lower()] = _decimal(integer_part, fraction) if fraction is not None else float(integer_part)
+        if phase:
+            summary["peak_phase"] = phase
+    return summary
+
+
+def parse_memory_rows(rows):
+    """MemoryProfile of a memoryBenchmarkResult block, or None if it cannot be rebuilt"""
+    if not rows:
+        return None
+    phases = [key for key in rows[0] if _PHASE.match(key)]
+    if not phases:
+        return None
+
+    header = {}
+    for key in rows[0]:
+        match = _HEADER_KEY.match(key)
+        if match:
+            header[match.group(1).lower()] = match.group(2)
+
+    # The objects are the CSV columns: Timestamp first, then the value tokens
+    columns = [row for row in rows if all(row.get(phase, "") != "" for phase in phases)]
+    profile = MemoryProfile(header=header, reported_summary=_reported_summary(rows[0]))
+    resolutions = []
+    for phase in phases:
+        tokens = [column[phase] for column in columns]
+        try:
+            values, resolution = _line_values(tokens[1:])
+        except ValueError as e:
+            print(f"Warning: Could not rebuild memory phase {phase}: {e}")
+            return None
+        if values is None:
+            print(f"Warning: Memory phase {phase} has {len(tokens) - 1} values, "
+                  f"expected {len(CSV_COLUMNS)} or {2 * len(CSV_COLUMNS)}")
+            return None
+        profile.snapshots.append(MemorySnapshot(phase, int(tokens[0]), *values))
+        resolutions.append(resolution)
+    profile.resolution_mb = max(resolutions)
+    return profile
+
+
+def check_summary(profile):
+    """Summary values where the rebuilt series and the file's own summary block disagree"""
+    rebuilt = profile.summary()
+    mismatches = {}
+    for name, key in (("initial_pss", "initial"), ("peak_pss", "peak"), ("final_pss", "final"), ("growth", "growth")):
+        reported = profile.reported_summary.get(name)
+        if reported is None:
+            continue
+        tolerance = max(SUMMARY_TOLERANCE_MB, profile.resolution_mb)
+        if abs(reported - rebuilt[key]) > tolerance:
+            mismatches[key] = {"reported": reported, "rebuilt": rebuilt[key]}
+    return mismatches
+
+
+# ============ DATASET ============
+def load_memory_profiles(dataset):
+    """{arch_name: MemoryProfile} for the results of a BenchmarkDataset"""
+    profiles = {}
+    for arch_name in dataset.names():
+        profile = parse_memory_rows(dataset.results[arch_name].memory_rows)
+        if profile is None:
+            print(f"Warning: Could not parse memory data for {arch_name}")
+            continue
+        if not profile.full_precision:
+            print(f"Warning: {arch_name} memory snapshots have integer values only "
+                  f"({profile.resolution_mb:g} MB resolution)")
+        for key, mismatch in check_summary(profile).items():
+            print(f"Warning: {arch_name} memory {key} rebuilt as {mismatch['rebuilt']} "
+                  f"but the summary block reports {mismatch['reported']}")
+        profiles[arch_name] = profile
+    return profiles
+
+
+def memory_summary(profiles):
+    """{arch_name: {"initial", "peak", "growth", "resolution_mb"}} TotalPSS summary used by the memory score"""
+    memory_data = {}
+    for arch_name, profile in profiles.items():
+        summary = profile.summary()
+        memory_data[arch_name] = {
+            "initial": summary["initial"],
+            "peak": summary["peak"],
+            "growth": summary["growth"],
+            "resolution_mb": profile.resolution_mb
+        }
+    return memory_data
+
+
+def load_memory_data(dataset):
+    """memory_summary() of a BenchmarkDataset"""
+    return memory_summary(load_memory_profiles(dataset))
@@ -0,0 +1,274 @@
+"""
+Memory timeline analysis over the CompleteFlow snapshot phases
+
+Initial, peak and growth ignore how long the app sits at each level, yet
+low-memory kills depend on the time-weighted residency. Every run is
+treated as a PSS curve over wall time, linearly interpolated between the
+phase snapshots, and summarised as:
+
+  - per-phase deltas: PSS change against the previous phase and the time
+    until the next snapshot;
+  - area under the curve (MB·s, trapezoidal) and the time-weighted
+    average PSS (AUC / run duration);
+  - a robust leak slope: Theil-Sen slope of PSS over time (MB/min) with
+    its 95% interval, pooled over all runs of an architecture so the
+    transient cart spike does not dominate;
+  - S_mem_timeline = ((TWA_norm + Peak_norm + Slope_norm) / 3) × 100,
+    inverse min-max normalized across architectures like S_mem. Integer
+    (1 MB) snapshots truncate a slow leak to a zero slope, so such
+    architectures are listed as not comparable instead of being ranked
+    against 0.01 MB data.
+
+Runs come from the memoryBenchmarkResult block of each result file
+(archbench.memory, full precision) and, for repeated runs, from any
+number of memory_phases.csv-style files (architecture, phase,
+phase_index, timestamp_ns, end_timestamp_ns, pss_mb); a new run starts
+whenever phase_index goes back to 1. merge_timelines() adds those runs to
+the result-file runs; a CSV run that starts within SAME_RUN_S of a run
+already present is the same CompleteFlow run (the shipped
+memory_phases.csv is the result files' snapshots rounded to whole MB) and
+only the finer copy is kept.
+"""
+
+import csv
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from scipy.stats import theilslopes
+
+from archbench.memory import load_memory_profiles
+
+# Timestamps below this are epoch milliseconds (the shipped memory_phases.csv
+# stores milliseconds in its *_ns columns), above it nanoseconds
+_MS_EPOCH_LIMIT = 1e14
+
+# Snapshot resolution at and above which a timeline is not scored against finer ones
+COARSE_RESOLUTION_MB = 1.0
+
+# Runs of one architecture starting this close together are the same run
+SAME_RUN_S = 1.0
+
+SCORE_FORMULA = "S_mem_timeline = ((TWA_norm + Peak_norm + Slope_norm) / 3) × 100"
+
+
+@dataclass
+class MemoryTimeline:
+    """One CompleteFlow run: PSS per phase snapshot and when it was taken"""
+    architecture: str
+    phases: List[str]
+    time_s: np.ndarray
+    pss_mb: np.ndarray
+    resolution_mb: float = 0.01
+
+    @property
+    def duration_s(self):
+        return float(self.time_s[-1] - self.time_s[0])
+
+    def auc(self):
+        """Area under the PSS curve in MB·s"""
+        return float(np.sum((self.pss_mb[1:] + self.pss_mb[:-1]) / 2 * np.diff(self.time_s)))
+
+    def time_weighted_pss(self):
+        if self.duration_s <= 0:
+            return float(np.mean(self.pss_mb))
+        return self.auc() / self.duration_s
+
+    def phase_deltas(self):
+        """{phase: {"pss_mb", "delta_mb", "duration_s"}}; duration runs to the next snapshot"""
+        deltas = np.diff(self.pss_mb, prepend=self.pss_mb[0])
+        durations = np.diff(self.time_s, append=self.time_s[-1])
+        return {
+            phase: {
+                "pss_mb": round(float(pss), 4),
+                "delta_mb": round(float(delta), 4),
+                "duration_s": round(float(duration), 3)
+            }
+            for phase, pss, delta, duration in zip(self.phases, self.pss_mb, deltas, durations)
+        }
+
+
+# ============ SOURCES ============
+def timelines_from_profiles(profiles):
+    """{arch_name: [MemoryTimeline]} from {arch_name: archbench.memory.MemoryProfile}"""
+    timelines = {}
+    for arch_name, profile in profiles.items():
+        times = np.array([snapshot.timestamp_ms for snapshot in profile.snapshots], dtype=np.float64) / 1e3
+        timelines[arch_name] = [MemoryTimeline(
+            architecture=arch_name,
+            phases=[snapshot.phase for snapshot in profile.snapshots],
+            time_s=times,
+            pss_mb=np.array(profile.series("total_pss_mb"), dtype=np.float64),
+            resolution_mb=profile.resolution_mb
+        )]
+    return timelines
+
+
+def timelines_from_dataset(dataset):
+    """Timelines of the memoryBenchmarkResult blocks of a BenchmarkDataset"""
+    return timelines_from_profiles(load_memory_profiles(dataset))
+
+
+def _seconds(timestamp):
+    value = float(timestamp)
+    return value / 1e3 if value < _MS_EPOCH_LIMIT else value / 1e9
+
+
+def read_memory_phases(path, arch_mapping=None):
+    """
+    {arch: [MemoryTimeline]} from a memory_phases.csv-style file; rows are
+    sorted by phase_index within each run. arch_mapping renames the
+    architecture keys (unmapped keys are kept as they are).
+    """
+    runs = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            arch = (arch_mapping or {}).get(row["architecture"], row["architecture"])
+            arch_runs = runs.setdefault(arch, [])
+            if not arch_runs or int(row["phase_index"]) == 1:
+                arch_runs.append([])
+            arch_runs[-1].append(row)
+
+    timelines = {}
+    for arch, arch_runs in runs.items():
+        for rows in arch_runs:
+            rows.sort(key=lambda r: int(r["phase_index"]))
+            pss = np.array([float(r["pss_mb"]) for r in rows])
+            timelines.setdefault(arch, []).append(MemoryTimeline(
+                architecture=arch,
+                phases=[r["phase"] for r in rows],
+                time_s=np.array([_seconds(r["timestamp_ns"]) for r in rows]),
+                pss_mb=pss,
+                resolution_mb=0.01 if np.any(pss != np.round(pss)) else 1.0
+            ))
+    return timelines
+
+
+def merge_timelines(timelines, extra):
+    """
+    Add the runs of extra to timelines in place ({arch: [MemoryTimeline]}).
+    Returns (added, duplicates); of two copies of a run the finer one stays.
+    """
+    added = duplicates = 0
+    for arch, runs in extra.items():
+        existing = timelines.setdefault(arch, [])
+        for run in runs:
+            same = next((i for i, known in enumerate(existing)
+                         if abs(known.time_s[0] - run.time_s[0]) <= SAME_RUN_S), None)
+            if same is None:
+                existing.append(run)
+                added += 1
+                continue
+            duplicates += 1
+            if run.resolution_mb < existing[same].resolution_mb:
+                existing[same] = run
+    return added, duplicates
+
+
+def load_timelines(profiles, memory_phases=(), arch_mapping=None):
+    """
+    Result-file timelines plus the runs of any number of
+    memory_phases.csv-style files (architectures outside arch_mapping are
+    skipped). Returns (timelines, {path: {"added_runs", "duplicate_runs"}}).
+    """
+    timelines = timelines_from_profiles(profiles)
+    sources = {}
+    for path in memory_phases or ():
+        extra = read_memory_phases(path, arch_mapping)
+        if arch_mapping is not None:
+            extra = {arch: runs for arch, runs in extra.items() if arch in arch_mapping.values()}
+        added, duplicates = merge_timelines(timelines, extra)
+        sources[path] = {"added_runs": added, "duplicate_runs": duplicates}
+    return timelines, sources
+
+
+# ============ METRICS ============
+def leak_slope(runs):
+    """Theil-Sen slope of PSS over time (MB/min) pooled over runs, with its 95% interval"""
+    minutes = np.concatenate([(run.time_s - run.time_s[0]) / 60 for run in runs])
+    pss = np.concatenate([run.pss_mb for run in runs])
+    if len(np.unique(minutes)) < 2:
+        return None
+    slope, intercept, low, high = theilslopes(pss, minutes)
+    return {
+        "mb_per_min": round(float(slope), 4),
+        "ci_lower": round(float(low), 4),
+        "ci_upper": round(float(high), 4)
+    }
+
+
+def architecture_timeline(runs):
+    """Timeline metrics of one architecture (medians over its runs)"""
+    return {
+        "n_runs": len(runs),
+        "resolution_mb": max(run.resolution_mb for run in runs),
+        "duration_s": round(float(np.median([run.duration_s for run in runs])), 3),
+        "time_weighted_pss_mb": round(float(np.median([run.time_weighted_pss() for run in runs])), 4),
+        "auc_mb_s": round(float(np.median([run.auc() for run in runs])), 2),
+        "peak_mb": float(np.median([run.pss_mb.max() for run in runs])),
+        "growth_mb": round(float(np.median([run.pss_mb[-1] - run.pss_mb[0] for run in runs])), 4),
+        "leak_slope": leak_slope(runs),
+        "phases": runs[0].phase_deltas() if len(runs) == 1 else _median_phase_deltas(runs)
+    }
+
+
+def _median_phase_deltas(runs):
+    """Per-phase medians over runs that share the phase"""
+    collected = {}
+    for run in runs:
+        for phase, values in run.phase_deltas().items():
+            collected.setdefault(phase, []).append(values)
+    return {
+        phase: {key: round(float(np.median([v[key] for v in values])), 4) for key in values[0]}
+        for phase, values in collected.items()
+    }
+
+
+def _normalize_inverse(value, values):
+    low, high = min(values), max(values)
+    return 1.0 if high == low else (high - value) / (high - low)
+
+
+def comparable_architectures(metrics):
+    """
+    Architectures whose timelines can be scored against each other: at
+    COARSE_RESOLUTION_MB a leak of a few tenths of a MB per minute is
+    truncated to a zero slope, so coarse data is only compared with
+    other coarse data.
+    """
+    usable = {arch: m for arch, m in metrics.items() if m["leak_slope"] is not None}
+    fine = [arch for arch, m in usable.items() if m["resolution_mb"] < COARSE_RESOLUTION_MB]
+    return fine or list(usable)
+
+
+def timeline_scores(metrics):
+    """{arch: S_mem_timeline} for the comparable architectures of architecture_timeline() results"""
+    usable = {arch: metrics[arch] for arch in comparable_architectures(metrics)}
+    twa = [m["time_weighted_pss_mb"] for m in usable.values()]
+    peak = [m["peak_mb"] for m in usable.values()]
+    slope = [m["leak_slope"]["mb_per_min"] for m in usable.values()]
+    return {
+        arch: round(100 * (
+            _normalize_inverse(m["time_weighted_pss_mb"], twa)
+            + _normalize_inverse(m["peak_mb"], peak)
+            + _normalize_inverse(m["leak_slope"]["mb_per_min"], slope)
+        ) / 3, 2)
+        for arch, m in usable.items()
+    }
+
+
+def memory_timeline_analysis(timelines):
+    """Timeline metrics, scores and ranking for {arch: [MemoryTimeline]}"""
+    metrics = {arch: architecture_timeline(runs) for arch, runs in timelines.items() if runs}
+    scores = timeline_scores(metrics)
+    return {
+        "formula": SCORE_FORMULA,
+        "interpolation": "linear between phase snapshots (trapezoidal AUC)",
+        "per_architecture": metrics,
+        "scores": scores,
+        "ranking": sorted(scores, key=scores.get, reverse=True),
+        "not_comparable": {
+            arch: f"{m['resolution_mb']:g} MB resolution; not scored against finer data"
+            for arch, m in metrics.items() if arch not in scores
+        }
+    }
@@ -0,0 +1,30 @@
+"""
+Process-pool helpers for the analysis scripts
+
+parallel_map() fans independent jobs (one test, one bootstrap batch, one
+permutation batch, ...) out to a ProcessPoolExecutor and returns results
+in input order, so output is identical to the sequential run regardless
+of scheduling. jobs=1 runs inline without spawning processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def resolve_jobs(jobs):
+    """Number of worker processes; 0 or negative means all cores"""
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def parallel_map(fn, arg_tuples, jobs=1):
+    """[fn(*args) for args in arg_tuples], optionally across a process pool"""
+    arg_tuples = list(arg_tuples)
+    workers = min(resolve_jobs(jobs), len(arg_tuples))
+    if workers <= 1:
+        return [fn(*args) for args in arg_tuples]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fn, *args) for args in arg_tuples]
+        return [future.result() for future in futures]
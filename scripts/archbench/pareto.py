@@ -0,0 +1,218 @@
+"""
+Pareto front and weight-simplex sweep over the score dimensions
+
+The overall score folds performance, code quality and memory into one
+weighted geometric mean, so its winner depends on weights nobody
+measured. This analysis reuses the per-dimension scores of
+comprehensive_analysis_6arch.json (plus S_energy from the energy
+analysis, see scoring.json) and asks two weight-free questions:
+
+  - Pareto front: architectures no other architecture matches or beats
+    on every dimension. A dominated architecture cannot rank first under
+    any positive weights of a monotone aggregate such as the overall score.
+  - Simplex sweep: weight vectors drawn uniformly from the simplex
+    (Dirichlet(1), 100k by default) are evaluated in batches with the
+    `pareto` scoring profile; for each architecture the share of the
+    simplex where it ranks first (with its Monte-Carlo standard error),
+    its mean rank, and the mean weight vector of the region it wins.
+
+Dimensions missing for some architecture (e.g. code quality when a
+static-analysis block is absent) are left out of both analyses.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+from archbench.scoring import DEFAULT_SEED, load_scoring, sample_weights
+
+ANALYSIS_FILE = "analysis_result/comprehensive_analysis_6arch.json"
+# The energy analysis writes to analysis_result/; the committed copy lives under future_work/
+ENERGY_FILES = ("analysis_result/energy_analysis_results.json", "future_work/energy/energy_analysis_results.json")
+OUTPUT_FILE = "analysis_result/pareto_analysis.json"
+
+DEFAULT_SAMPLES = 100000
+BATCH_SIZE = 20000
+
+
+# ============ INPUTS ============
+def _number(value):
+    if isinstance(value, dict):
+        value = value.get("score")
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def analysis_scores(analysis):
+    """{dimension: {arch: score}} from a comprehensive_analysis_6arch.json document"""
+    return {
+        dimension: {arch: _number(score) for arch, score in analysis["scores"][dimension]["scores"].items()}
+        for dimension in ("performance", "memory", "code_quality")
+        if dimension in analysis.get("scores", {})
+    }
+
+
+def energy_scores(energy, model, arch_mapping):
+    """
+    {arch_name: S_energy} from an energy analysis document: total of the
+    per-scenario median normalized energy, scored by the `energy` dimension.
+    """
+    totals = {
+        arch_mapping.get(entry["architecture"], entry["architecture"]): {"total_energy": entry["total_median"]}
+        for entry in energy["summary"]["overall"]["rankings"]
+    }
+    return model.score_table("energy", totals)["scores"]
+
+
+def find_energy_file(candidates=ENERGY_FILES):
+    return next((path for path in candidates if os.path.exists(path)), None)
+
+
+# ============ PARETO ============
+def pareto_front(matrix):
+    """
+    Boolean mask of non-dominated rows (higher is better in every column)
+    and, per row, the indices of the rows that dominate it.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    at_least = np.all(matrix[:, None, :] >= matrix[None, :, :], axis=-1)
+    better = np.any(matrix[:, None, :] > matrix[None, :, :], axis=-1)
+    dominates = at_least & better                  # dominates[i, j]: row i dominates row j
+    return ~dominates.any(axis=0), [np.flatnonzero(dominates[:, j]).tolist() for j in range(len(matrix))]
+
+
+# ============ SIMPLEX SWEEP ============
+def simplex_sweep(model, matrix, n_samples=DEFAULT_SAMPLES, seed=DEFAULT_SEED, batch_size=BATCH_SIZE):
+    """
+    Rank-1 counts, rank sums and summed winning weights over n_samples
+    Dirichlet(1) weight vectors; matrix is (architectures, dimensions).
+    """
+    n_archs, n_dims = matrix.shape
+    columns = {name: matrix[:, j] for j, name in enumerate(model.dimension_names)}
+    weights = sample_weights(n_samples, n_dims, seed)
+    wins = np.zeros(n_archs, dtype=np.int64)
+    rank_sums = np.zeros(n_archs)
+    winning_weights = np.zeros((n_archs, n_dims))
+    for start in range(0, n_samples, batch_size):
+        batch = weights[start:start + batch_size]
+        overall = model.overall(columns, batch)                      # (batch, architectures)
+        winners = overall.argmax(axis=1)
+        wins += np.bincount(winners, minlength=n_archs)
+        rank_sums += (np.argsort(np.argsort(-overall, axis=1), axis=1) + 1).sum(axis=0)
+        np.add.at(winning_weights, winners, batch)
+    return wins, rank_sums / n_samples, winning_weights
+
+
+def load_scoring_subset(model, dimensions):
+    """Copy of a compiled profile restricted to the given overall dimensions"""
+    config = json.loads(json.dumps(model.config))
+    weights = config["overall"]["weights"]
+    config["overall"]["weights"] = {name: weights[name] for name in dimensions}
+    config["overall"]["fallback"] = []
+    total = sum(config["overall"]["weights"].values())
+    if total > 0:
+        config["overall"]["weights"] = {name: w / total for name, w in config["overall"]["weights"].items()}
+    return type(model)(config)
+
+
+def pareto_analysis(scores, architectures, model, n_samples=DEFAULT_SAMPLES, seed=DEFAULT_SEED):
+    """Pareto front and simplex sweep for {dimension: {arch: score}}"""
+    dimensions = [
+        name for name in model.dimension_names
+        if all(scores.get(name, {}).get(arch) is not None for arch in architectures)
+    ]
+    skipped = [name for name in model.dimension_names if name not in dimensions]
+    for name in skipped:
+        print(f"Warning: {name} scores missing for some architectures; dimension left out")
+
+    matrix = np.array([[scores[name][arch] for name in dimensions] for arch in architectures], dtype=np.float64)
+    front, dominated_by = pareto_front(matrix)
+
+    # Sweep over the dimensions that are present, with the profile's remaining structure
+    sub_model = model if not skipped else load_scoring_subset(model, dimensions)
+    wins, mean_ranks, winning_weights = simplex_sweep(sub_model, matrix, n_samples, seed)
+    shares = wins / n_samples
+    default_overall = sub_model.overall({name: matrix[:, j] for j, name in enumerate(dimensions)})
+
+    per_arch = {}
+    for i, arch in enumerate(architectures):
+        per_arch[arch] = {
+            "scores": dict(zip(dimensions, matrix[i].round(4).tolist())),
+            "pareto_optimal": bool(front[i]),
+            "dominated_by": [architectures[j] for j in dominated_by[i]],
+            "rank1_share": round(float(shares[i]), 5),
+            "rank1_share_se": round(float(np.sqrt(shares[i] * (1 - shares[i]) / n_samples)), 5),
+            "mean_rank": round(float(mean_ranks[i]), 4),
+            "winning_region_mean_weights": (
+                dict(zip(dimensions, (winning_weights[i] / wins[i]).round(4).tolist())) if wins[i] else None
+            ),
+            "default_weights_overall": round(float(default_overall[i]), 4)
+        }
+    return {
+        "dimensions": dimensions,
+        "skipped_dimensions": skipped,
+        "default_weights": dict(zip(sub_model.dimension_names, sub_model.weights.tolist())),
+        "aggregate": sub_model.aggregate,
+        "pareto_front": [arch for i, arch in enumerate(architectures) if front[i]],
+        "sweep": {
+            "method": "Weight vectors drawn uniformly from the simplex (Dirichlet(1)), overall score per vector",
+            "n_weight_vectors": n_samples,
+            "seed": seed,
+            "rank1_share": {arch: per_arch[arch]["rank1_share"] for arch in
+                            sorted(architectures, key=lambda a: per_arch[a]["rank1_share"], reverse=True)},
+            "rank1_outside_pareto_front": round(float(shares[~front].sum()), 5)
+        },
+        "default_weights_winner": architectures[int(np.argmax(default_overall))],
+        "per_architecture": per_arch
+    }
+
+
+# ============ STAGE ============
+def print_report(results):
+    """Console summary of pareto_analysis() output"""
+    print(f"\nDIMENSIONS: {', '.join(results['dimensions'])}")
+    print(f"PARETO FRONT: {', '.join(results['pareto_front'])}")
+    sweep = results["sweep"]
+    print(f"\nSIMPLEX SWEEP ({sweep['n_weight_vectors']} weight vectors, {results['aggregate']} aggregate):")
+    print(f"  {'Architecture':25} {'Pareto':>7} {'Rank-1 share':>13} {'Mean rank':>10}  Dominated by")
+    for arch in sweep["rank1_share"]:
+        entry = results["per_architecture"][arch]
+        print(f"  {arch:25} {'✓' if entry['pareto_optimal'] else '✗':>7} {entry['rank1_share']:>13.2%} "
+              f"{entry['mean_rank']:>10.2f}  {', '.join(entry['dominated_by']) or '-'}")
+    print(f"\n  Default weights winner: {results['default_weights_winner']} "
+          f"(ranks 1st on {results['per_architecture'][results['default_weights_winner']]['rank1_share']:.1%} of the simplex)")
+
+
+def run_pareto_analysis(arch_mapping, analysis_file=ANALYSIS_FILE, energy_file=None, output_file=OUTPUT_FILE,
+                        n_samples=DEFAULT_SAMPLES, seed=DEFAULT_SEED):
+    """Read the analysis (and energy) results, run the Pareto/simplex analysis, write JSON and print"""
+    with open(analysis_file, 'r', encoding='utf-8') as f:
+        analysis = json.load(f)
+    model = load_scoring("pareto")
+    scores = analysis_scores(analysis)
+    architectures = analysis["metadata"]["architectures"]
+
+    energy_file = energy_file or find_energy_file()
+    if energy_file:
+        with open(energy_file, 'r', encoding='utf-8') as f:
+            scores["energy"] = energy_scores(json.load(f), model, arch_mapping)
+        print(f"Energy scores from {energy_file}")
+    else:
+        print("Warning: No energy analysis found; energy dimension left out")
+
+    results = {
+        "metadata": {
+            "analysis_file": analysis_file,
+            "energy_file": energy_file,
+            "analysis_date": datetime.now().isoformat(),
+            "energy_formula": model.formula("energy")
+        },
+        **pareto_analysis(scores, architectures, model, n_samples, seed)
+    }
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print_report(results)
+    print(f"\n✓ Results saved to: {output_file}")
+    return results
@@ -0,0 +1,126 @@
+"""
+Two-sample permutation tests for pairwise architecture comparisons
+
+The statistic is the difference in means of the per-iteration runs
+(two-sided, |mean_x - mean_y|). Iterations of different architectures
+are independent runs, so labels are exchangeable under H0.
+
+  - exact:       every split of the pooled runs is enumerated when
+                 C(n_x + n_y, n_x) ≤ EXACT_LIMIT (e.g. 5 vs 5 → 252)
+  - monte_carlo: n_permutations random splits drawn as one
+                 argsort(uniform) matrix; p = (1 + hits) / (1 + n)
+
+Group sums are computed for all splits at once (the exact index matrix is
+built column by column with np.repeat); the difference in means then
+follows from the pooled total, so no Python loop runs per split.
+Each pair gets its own SeedSequence derived from (seed, test, arch1,
+arch2), so p-values do not depend on the order or process the pairs run
+in, nor on which other architectures are part of the analysis.
+"""
+
+import math
+import zlib
+from itertools import combinations
+
+import numpy as np
+
+EXACT_LIMIT = 100_000
+DEFAULT_PERMUTATIONS = 10_000
+DEFAULT_SEED = 42
+ALPHA = 0.05
+
+# Relative tolerance so that splits equal to the observed split count as hits
+TOLERANCE = 1e-12
+BATCH_SIZE = 10_000
+
+
+def _hits(split_sums, total, n_x, n_y, observed):
+    diff = split_sums / n_x - (total - split_sums) / n_y
+    return int(np.count_nonzero(np.abs(diff) >= observed - TOLERANCE * max(1.0, observed)))
+
+
+def _combination_indices(n, k):
+    """
+    Every k-subset of range(n) as a (C(n, k), k) index matrix in
+    itertools.combinations order, built one column at a time: each row is
+    repeated once per admissible next index, so the loop runs k times.
+    """
+    idx = np.arange(n - k + 1)[:, None]
+    for j in range(1, k):
+        last = idx[:, -1]
+        counts = (n - k + j) - last                    # next index runs over last+1 .. n-k+j
+        starts = np.cumsum(counts) - counts
+        following = np.repeat(last + 1 - starts, counts) + np.arange(counts.sum())
+        idx = np.hstack([np.repeat(idx, counts, axis=0), following[:, None]])
+    return idx
+
+
+def _exact_sums(pooled, n_x):
+    """Sum of the x-group for every one of the C(N, n_x) splits"""
+    return pooled[_combination_indices(len(pooled), n_x)].sum(axis=1)
+
+
+def permutation_test(x, y, n_permutations=DEFAULT_PERMUTATIONS, seed=DEFAULT_SEED, exact_limit=EXACT_LIMIT):
+    """Two-sided permutation test on the difference in means"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n_x, n_y = len(x), len(y)
+    if n_x == 0 or n_y == 0:
+        return None
+
+    pooled = np.concatenate([x, y])
+    total = pooled.sum()
+    observed_diff = float(x.mean() - y.mean())
+    observed = abs(observed_diff)
+    n_splits = math.comb(n_x + n_y, n_x)
+
+    if n_splits <= exact_limit:
+        hits = _hits(_exact_sums(pooled, n_x), total, n_x, n_y, observed)
+        return {
+            "mean_difference": observed_diff,
+            "p_value": hits / n_splits,
+            "method": "exact",
+            "permutations": n_splits
+        }
+
+    rng = np.random.default_rng(seed)
+    hits = 0
+    for start in range(0, n_permutations, BATCH_SIZE):
+        size = min(BATCH_SIZE, n_permutations - start)
+        order = np.argsort(rng.random((size, n_x + n_y)), axis=1)
+        hits += _hits(pooled[order[:, :n_x]].sum(axis=1), total, n_x, n_y, observed)
+    return {
+        "mean_difference": observed_diff,
+        "p_value": (1 + hits) / (1 + n_permutations),
+        "method": "monte_carlo",
+        "permutations": n_permutations
+    }
+
+
+def pair_seed(seed, test_name, arch1, arch2):
+    """Deterministic per-pair seed, independent of scheduling and of the other architectures"""
+    return np.random.SeedSequence([seed] + [zlib.crc32(name.encode("utf-8")) for name in (test_name, arch1, arch2)])
+
+
+def permutation_test_pairs(test_name, runs_by_arch, n_permutations=DEFAULT_PERMUTATIONS, seed=DEFAULT_SEED,
+                           cached=None):
+    """
+    Permutation test for every architecture pair of one test.
+
+    cached: optional {(arch1, arch2): result} reused instead of recomputing.
+    Returns {(arch1, arch2): result} in itertools.combinations order.
+    """
+    cached = cached or {}
+    results = {}
+    for arch1, arch2 in combinations(runs_by_arch.keys(), 2):
+        if (arch1, arch2) in cached:
+            results[(arch1, arch2)] = cached[(arch1, arch2)]
+            continue
+        result = permutation_test(
+            runs_by_arch[arch1], runs_by_arch[arch2],
+            n_permutations, pair_seed(seed, test_name, arch1, arch2)
+        )
+        if result is not None:
+            result["significant"] = result["p_value"] < ALPHA
+        results[(arch1, arch2)] = result
+    return results
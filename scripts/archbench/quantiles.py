@@ -0,0 +1,241 @@
+"""
+Mergeable quantile sketch (KLL) and streaming descriptive statistics
+
+KLLSketch keeps a stack of compactors: level h holds items of weight 2^h.
+When the sketch is over capacity the lowest full level is sorted and every
+other item (random offset) is promoted to the next level, so memory stays
+O(k) regardless of how many frames are streamed. Sketches built per
+iteration can be merged across iterations, devices and architectures.
+
+Error bound: the normalized rank error of a quantile query is at most
+`rank_error(k)` = 2.296 / k^0.9723 with 99% confidence (≈1.33% for the
+default k = 200), the empirical KLL characterization. Until the first
+compaction the sketch holds every item and quantiles are exact (same
+linear interpolation as np.percentile).
+
+StreamingSummary adds exact count/mean/std/min/max (Chan et al. parallel
+moments) to a sketch; calculate_descriptive_stats() turns either a plain
+list of values or a summary into the dict the analysis scripts report.
+archbench.devices builds one summary per device and merges them for the
+pooled per-test statistics. Percentiles of per-frame traces come from the
+fixed-bin archbench.frames.FrameHistogram instead, whose absolute error
+suits the P99 tail better than a rank error.
+"""
+
+import math
+
+import numpy as np
+
+DEFAULT_K = 200
+DEFAULT_SEED = 42
+
+# Capacity decay between levels (KLL paper uses c = 2/3)
+CAPACITY_DECAY = 2 / 3
+MIN_CAPACITY = 2
+
+
+def rank_error(k=DEFAULT_K):
+    """Normalized rank error bound (99% confidence) for a single quantile"""
+    return 2.296 / k ** 0.9723
+
+
+# ============ KLL SKETCH ============
+class KLLSketch:
+    """KLL quantile sketch over float values"""
+
+    def __init__(self, k=DEFAULT_K, seed=DEFAULT_SEED):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, int(math.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    def _size(self):
+        return sum(len(items) for items in self.levels)
+
+    def _total_capacity(self):
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    @property
+    def is_exact(self):
+        """True while no item has been compacted away"""
+        return len(self.levels) == 1
+
+    def update(self, values):
+        """Add a chunk of values (NaNs are ignored)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        while self._size() > self._total_capacity():
+            for h, items in enumerate(self.levels):
+                if len(items) >= self._capacity(h):
+                    self._compact(h)
+                    break
+
+    def _compact(self, level):
+        items = np.sort(self.levels[level])
+        keep = items[-1:] if len(items) % 2 else items[:0]
+        pairs = items[:len(items) - len(keep)]
+        promoted = pairs[int(self._rng.integers(2))::2]
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        self.levels[level] = keep
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def _weighted(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(v), 2 ** h, dtype=np.int64) for h, v in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """q-quantile (0 ≤ q ≤ 1); exact while is_exact"""
+        if self.n == 0:
+            return None
+        if self.is_exact:
+            return float(np.quantile(self.levels[0], q))
+        items, weights = self._weighted()
+        cumulative = np.cumsum(weights)
+        target = q * cumulative[-1]
+        return float(items[min(int(np.searchsorted(cumulative, target, side="left")), len(items) - 1)])
+
+    def quantiles(self, qs):
+        return [self.quantile(q) for q in qs]
+
+    def rank(self, value):
+        """Estimated fraction of items ≤ value"""
+        if self.n == 0:
+            return None
+        items, weights = self._weighted()
+        below = weights[items <= value].sum()
+        return float(below / weights.sum())
+
+    def rank_error(self):
+        return 0.0 if self.is_exact else rank_error(self.k)
+
+    def retained(self):
+        """Number of items held in memory"""
+        return self._size()
+
+
+# ============ STREAMING SUMMARY ============
+class StreamingSummary:
+    """Exact moments + KLL quantiles; mergeable across iterations/devices"""
+
+    def __init__(self, k=DEFAULT_K, seed=DEFAULT_SEED):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sketch = KLLSketch(k, seed)
+
+    def update(self, values):
+        """Add a chunk of values (NaNs are ignored)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        chunk = StreamingSummary.__new__(StreamingSummary)
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(((values - chunk.mean) ** 2).sum())
+        chunk.minimum = float(values.min())
+        chunk.maximum = float(values.max())
+        self._merge_moments(chunk)
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        self._merge_moments(other)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def _merge_moments(self, other):
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def std(self, ddof=1):
+        return math.sqrt(self.m2 / (self.count - ddof)) if self.count > ddof else 0.0
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+
+def summarize(runs, k=DEFAULT_K, seed=DEFAULT_SEED):
+    """
+    StreamingSummary of a flat list of values or of per-iteration traces
+    ([[frame, ...], ...]); each iteration gets its own sketch, then they
+    are merged.
+    """
+    summary = StreamingSummary(k, seed)
+    if len(runs) > 0 and isinstance(runs[0], (list, tuple, np.ndarray)):
+        for i, iteration in enumerate(runs):
+            summary.merge(StreamingSummary(k, seed + i + 1).update(iteration))
+    else:
+        summary.update(runs)
+    return summary
+
+
+# ============ DESCRIPTIVE STATISTICS ============
+def calculate_descriptive_stats(values):
+    """Calculate descriptive statistics (values: list/array or StreamingSummary)"""
+    if isinstance(values, StreamingSummary):
+        if values.count == 0:
+            return {"mean": 0, "median": 0, "std": 0, "cv_percent": 0, "min": 0, "max": 0, "n": 0}
+        std_val = values.std()
+        return {
+            "mean": float(values.mean),
+            "median": float(values.quantile(0.5)),
+            "std": float(std_val),
+            "cv_percent": float(std_val / values.mean * 100) if values.mean != 0 else 0.0,
+            "min": float(values.minimum),
+            "max": float(values.maximum),
+            "n": int(values.count)
+        }
+
+    if len(values) == 0:
+        return {"mean": 0, "median": 0, "std": 0, "cv_percent": 0, "min": 0, "max": 0, "n": 0}
+
+    values_arr = np.array(values)
+    mean_val = np.mean(values_arr)
+    median_val = np.median(values_arr)
+    std_val = np.std(values_arr, ddof=1) if len(values) > 1 else 0.0
+    cv_percent = (std_val / mean_val * 100) if mean_val != 0 else 0.0
+
+    return {
+        "mean": float(mean_val),
+        "median": float(median_val),
+        "std": float(std_val),
+        "cv_percent": float(cv_percent),
+        "min": float(np.min(values_arr)),
+        "max": float(np.max(values_arr)),
+        "n": int(len(values_arr))
+    }
@@ -0,0 +1,233 @@
+"""
+Energy-counter quantization model
+
+The fuel gauge behind BATTERY_PROPERTY_ENERGY_COUNTER / CHARGE_COUNTER
+only moves in coarse steps (5 mAh on the SM-A556E runs), so
+EnergyHelper.calculateEnergyConsumption, which subtracts two counter
+readings, returns a whole number k of steps:
+
+    Charge_mAh = k · q_charge          Energy_mWh = k · q_charge · V
+
+where V = Energy_mWh / Charge_mAh is the battery voltage over the
+iteration. The counter's phase at the start of an iteration is
+arbitrary, so an iteration that truly used t steps reads ⌊t⌋ or ⌈t⌉,
+the upper level with probability frac(t). Two things follow:
+
+  - the median of such readings snaps to one level and can swap
+    architectures whose true energies differ by a fraction of a step;
+  - the mean of the readings is unbiased for t, and with readings on two
+    adjacent levels the share of upper readings is a binomial proportion,
+    which gives a Clopper-Pearson interval for t (quantization-aware
+    bounds). Cells spread over more levels fall back to a t-interval
+    clamped to the ±1-step hard bounds.
+
+The step is estimated from the Charge_mAh readings (estimate_quantum)
+and converted to mWh with the implied voltage; Power_mW, the step counts
+of both counters and the voltage are cross-checked per architecture.
+"""
+
+from itertools import combinations
+
+import numpy as np
+from scipy.stats import beta, spearmanr, t as t_dist
+
+BASELINE_DURATION_SEC = 60
+DEFAULT_CONFIDENCE = 0.95
+
+# A value is "on a level" if value / q is within this many steps of an integer
+LEVEL_TOLERANCE = 0.05
+MAX_DIVISOR = 10
+
+# Plausible Li-ion terminal voltage while discharging (V)
+VOLTAGE_RANGE = (3.0, 4.6)
+# Power_mW is Energy × 3600 / Duration on the device; allowed relative drift
+POWER_TOLERANCE = 0.01
+
+
+# ============ QUANTUM ESTIMATION ============
+def estimate_quantum(values, tolerance=LEVEL_TOLERANCE, max_divisor=MAX_DIVISOR):
+    """
+    Largest step q such that every positive value is (nearly) a whole
+    multiple of q; None if no step up to min(values) / max_divisor fits.
+
+    Candidates are min(values) / m for m = 1..max_divisor, each refined
+    by least squares on the assigned levels.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values) & (values > 0)]
+    if len(values) == 0:
+        return None
+    smallest = values.min()
+    for divisor in range(1, max_divisor + 1):
+        q = smallest / divisor
+        levels = np.round(values / q)
+        q = float(np.sum(levels * values) / np.sum(levels * levels))
+        if np.all(np.abs(values / q - np.round(values / q)) <= tolerance):
+            return q
+    return None
+
+
+# ============ BOUNDS ============
+def clopper_pearson(successes, n, confidence=DEFAULT_CONFIDENCE):
+    """Exact binomial interval for a proportion"""
+    alpha = 1 - confidence
+    lower = beta.ppf(alpha / 2, successes, n - successes + 1) if successes > 0 else 0.0
+    upper = beta.ppf(1 - alpha / 2, successes + 1, n - successes) if successes < n else 1.0
+    return float(lower), float(upper)
+
+
+def cell_estimate(levels, step_normalized, readings, confidence=DEFAULT_CONFIDENCE):
+    """
+    Quantization-aware estimate for one architecture × scenario.
+
+    levels: whole steps k per iteration; step_normalized: one step in
+    normalized mWh per iteration (q_charge · V / duration · 60);
+    readings: normalized energy per iteration.
+    """
+    n = len(readings)
+    low_level = int(levels.min())
+    upper = levels > low_level
+    estimate = float(np.mean(readings))
+    hard_lower = float(np.mean((levels - 1).clip(min=0) * step_normalized))
+    hard_upper = float(np.mean((levels + 1) * step_normalized))
+
+    if levels.max() - low_level <= 1:
+        p_lower, p_upper = clopper_pearson(int(upper.sum()), n, confidence)
+        step = float(np.mean(step_normalized))
+        ci_lower, ci_upper = (low_level + p_lower) * step, (low_level + p_upper) * step
+        method = "two_level_binomial"
+    else:
+        half_width = 0.0
+        if n > 1:
+            half_width = t_dist.ppf(0.5 + confidence / 2, n - 1) * np.std(readings, ddof=1) / np.sqrt(n)
+        ci_lower, ci_upper = max(estimate - half_width, hard_lower), min(estimate + half_width, hard_upper)
+        method = "t_interval"
+
+    return {
+        "estimate": round(estimate, 4),
+        "median": round(float(np.median(readings)), 4),
+        "ci_lower": round(float(ci_lower), 4),
+        "ci_upper": round(float(ci_upper), 4),
+        "method": method,
+        "levels": sorted(int(k) for k in set(levels.tolist())),
+        "upper_level_share": round(float(upper.mean()), 4),
+        "doubled_iterations": int(np.count_nonzero(levels == 2 * low_level)) if low_level > 0 else 0
+    }
+
+
+# ============ CROSS-CHECKS ============
+def cross_checks(energy, charge, power, duration, battery, levels, q_energy):
+    """
+    Power, step-count and voltage consistency of one architecture's
+    iterations (1-D arrays). The voltage is not exported by the device;
+    it is implied by the two counters as Energy_mWh / Charge_mAh.
+    """
+    voltage = energy / charge
+    expected_power = energy * 3600 / duration
+    power_error = np.abs(power - expected_power) / expected_power
+    energy_levels = np.round(energy / q_energy)
+    checks = {
+        "voltage_median_v": round(float(np.median(voltage)), 4),
+        "voltage_min_v": round(float(voltage.min()), 4),
+        "voltage_max_v": round(float(voltage.max()), 4),
+        "voltage_out_of_range": int(np.count_nonzero((voltage < VOLTAGE_RANGE[0]) | (voltage > VOLTAGE_RANGE[1]))),
+        "power_max_relative_error": round(float(power_error.max()), 6),
+        "power_consistent": bool(np.all(power_error <= POWER_TOLERANCE)),
+        "energy_levels_match_charge": bool(np.array_equal(energy_levels, levels))
+    }
+    if len(np.unique(battery)) > 1 and len(np.unique(voltage)) > 1:
+        rho = spearmanr(battery, voltage)[0]
+        checks["voltage_vs_battery_spearman"] = round(float(rho), 4)
+    return checks
+
+
+# ============ STAGE ============
+def _ranking(values):
+    ranked = sorted(values.items(), key=lambda x: x[1])
+    return [arch for arch, _ in ranked]
+
+
+def quantization_analysis(data, confidence=DEFAULT_CONFIDENCE):
+    """
+    Counter step, per-cell quantization-aware estimates and rankings for
+    an archbench.energy.EnergyData. Returns None when the charge readings
+    are not quantized (e.g. the charge × voltage fallback was used).
+    """
+    charge = data["charge_mah"]
+    q_charge = estimate_quantum(charge)
+    if q_charge is None:
+        return None
+
+    valid = np.isfinite(charge) & (charge > 0) & (data["duration_sec"] > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        levels = np.where(valid, np.round(charge / q_charge), np.nan)
+        voltage = np.where(valid, data["energy_mwh"] / charge, np.nan)
+        scale = BASELINE_DURATION_SEC / data["duration_sec"]
+    step_normalized = q_charge * voltage * scale
+    readings = data["energy_mwh"] * scale
+
+    result = {
+        "charge_quantum_mah": round(q_charge, 4),
+        "confidence": confidence,
+        "by_architecture": {},
+        "by_scenario": {}
+    }
+    estimates = {}
+    for a, arch in enumerate(data.architectures):
+        mask = valid[a]
+        if not mask.any():
+            continue
+        # One counter step in energy units at this run's typical voltage
+        q_energy = float(q_charge * np.median(voltage[a][mask]))
+        arch_result = {
+            "energy_quantum_mwh": round(q_energy, 4),
+            "cross_checks": cross_checks(
+                data["energy_mwh"][a][mask], charge[a][mask], data["power_mw"][a][mask],
+                data["duration_sec"][a][mask], data["battery_pct"][a][mask], levels[a][mask], q_energy
+            )
+        }
+        for s, scenario in enumerate(data.scenarios):
+            cell = valid[a, s]
+            if not cell.any():
+                continue
+            stats = cell_estimate(levels[a, s][cell], step_normalized[a, s][cell], readings[a, s][cell], confidence)
+            result["by_scenario"].setdefault(scenario, {})[arch] = stats
+            estimates.setdefault(arch, {})[scenario] = stats
+        result["by_architecture"][arch] = arch_result
+
+    result["rankings"] = _compare_rankings(estimates, data.scenarios)
+    return result
+
+
+def _compare_rankings(estimates, scenarios):
+    """Rankings by quantization-aware estimate vs by median, per scenario and overall"""
+    rankings = {}
+    for scenario in scenarios:
+        cells = {arch: by_scenario[scenario] for arch, by_scenario in estimates.items() if scenario in by_scenario}
+        if cells:
+            rankings[scenario] = _ranking_pair(
+                {arch: c["estimate"] for arch, c in cells.items()},
+                {arch: c["median"] for arch, c in cells.items()}
+            )
+    # Overall compares architectures measured in every scenario
+    complete = {arch: by_scenario for arch, by_scenario in estimates.items() if all(s in by_scenario for s in scenarios)}
+    rankings["overall"] = _ranking_pair(
+        {arch: round(sum(c[s]["estimate"] for s in scenarios), 4) for arch, c in complete.items()},
+        {arch: round(sum(c[s]["median"] for s in scenarios), 4) for arch, c in complete.items()}
+    )
+    return rankings
+
+
+def _ranking_pair(estimates, medians):
+    by_estimate, by_median = _ranking(estimates), _ranking(medians)
+    swapped = [
+        f"{arch1}_vs_{arch2}" for arch1, arch2 in combinations(by_estimate, 2)
+        if by_median.index(arch1) > by_median.index(arch2)
+    ]
+    return {
+        "by_estimate": by_estimate,
+        "by_median": by_median,
+        "totals": estimates,
+        "swapped_pairs": swapped,
+        "rankings_flip": bool(swapped)
+    }
@@ -0,0 +1,318 @@
+"""
+Columnar run store: a NumPy .npz cache for the raw benchmark JSON
+
+Every per-iteration series found in a source file is flattened into five
+columns (architecture, test, metric, iteration, value) and written to
+`<cache_dir>/<file stem>.<directory hash>-<content hash>.npz`. Whatever else the file holds
+(device context, memory snapshots, static analysis, metric summaries) is
+kept in the same archive as a JSON document with the `runs` arrays removed,
+so a result file can be rebuilt from the cache without parsing the source.
+
+Files are keyed by the SHA-256 of their content; an index of
+(mtime, size) -> hash avoids re-hashing unchanged files. Editing a source
+file changes its hash and only that file is re-ingested.
+
+runs_detail.json stores each series twice (`<arch>_<test>_<metric>` and
+`<arch>_<test>`); ingest keeps one copy per (architecture, test, metric).
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+CACHE_DIR = ".archbench_cache/runstore"
+INDEX_FILE = "index.json"
+RUNS_DETAIL_FILE = "runs_detail.json"
+RESULT_SUFFIX = "_result.json"
+
+COLUMNS = ("architecture", "test", "metric", "iteration", "value")
+
+# Bump when the on-disk layout changes; old archives are then ignored
+STORE_VERSION = 1
+
+HASH_CHUNK = 1 << 20
+
+
+# ============ TABLE ============
+@dataclass
+class RunTable:
+    """One source file as columns; row i is one iteration of one series"""
+    source: str
+    digest: str
+    architecture: np.ndarray
+    test: np.ndarray
+    metric: np.ndarray
+    iteration: np.ndarray
+    value: np.ndarray
+    meta: dict = None
+
+    def __len__(self):
+        return len(self.value)
+
+    def series(self, architecture, test, metric):
+        """Values of one series in iteration order (empty if missing)"""
+        mask = (self.architecture == architecture) & (self.test == test) & (self.metric == metric)
+        return self.value[mask][np.argsort(self.iteration[mask], kind="stable")]
+
+    def keys(self):
+        """(architecture, test, metric) of every series, in source order"""
+        seen = {}
+        for key in zip(self.architecture.tolist(), self.test.tolist(), self.metric.tolist()):
+            seen.setdefault(key, None)
+        return list(seen)
+
+    def nested(self):
+        """{architecture: {test: {metric: [values]}}}"""
+        data = {}
+        for arch, test, metric in self.keys():
+            values = self.series(arch, test, metric).tolist()
+            data.setdefault(arch, {}).setdefault(test, {})[metric] = values
+        return data
+
+
+def _table_from_rows(source, digest, rows, meta):
+    if rows:
+        arch, test, metric, iteration, value = zip(*rows)
+    else:
+        arch = test = metric = iteration = value = ()
+    return RunTable(
+        source=source,
+        digest=digest,
+        architecture=np.array(arch, dtype=str),
+        test=np.array(test, dtype=str),
+        metric=np.array(metric, dtype=str),
+        iteration=np.array(iteration, dtype=np.int32),
+        value=np.array(value, dtype=np.float64),
+        meta=meta,
+    )
+
+
+# ============ FLATTENING ============
+def _series_rows(arch, test, metric, runs):
+    return [(arch, test, metric, i, float(v)) for i, v in enumerate(runs)]
+
+
+def _flatten_result(raw, arch):
+    """Rows for every metrics/sampledMetrics series; meta without the runs"""
+    rows = []
+    meta = dict(raw)
+    benchmarks = []
+    for benchmark in raw.get("benchmarks", []):
+        benchmark = dict(benchmark)
+        test = benchmark.get("name")
+        for block in ("metrics", "sampledMetrics"):
+            if not isinstance(benchmark.get(block), dict):
+                continue
+            stripped = {}
+            for metric, summary in benchmark[block].items():
+                if isinstance(summary, dict) and "runs" in summary:
+                    rows.extend(_series_rows(arch, test, metric, summary["runs"]))
+                    summary = {k: v for k, v in summary.items() if k != "runs"}
+                    summary["runs"] = None
+                stripped[metric] = summary
+            benchmark[block] = stripped
+        benchmarks.append(benchmark)
+    if "benchmarks" in raw:
+        meta["benchmarks"] = benchmarks
+    return rows, meta
+
+
+def _flatten_runs_detail(raw):
+    """Rows for runs_detail.json, one copy per (architecture, test, metric)"""
+    rows = []
+    seen = set()
+    for entry in raw.values():
+        key = (entry["architecture"], entry["test_name"], entry["metric_name"])
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.extend(_series_rows(*key, entry["runs"]))
+    return rows, {}
+
+
+def _rebuild_result(table):
+    """Reassemble the parsed result JSON from meta + columns"""
+    raw = dict(table.meta)
+    arch = _architecture_of(table.source)
+    benchmarks = []
+    for benchmark in raw.get("benchmarks", []):
+        benchmark = dict(benchmark)
+        for block in ("metrics", "sampledMetrics"):
+            if not isinstance(benchmark.get(block), dict):
+                continue
+            restored = {}
+            for metric, summary in benchmark[block].items():
+                if isinstance(summary, dict) and "runs" in summary:
+                    summary = dict(summary)
+                    summary["runs"] = table.series(arch, benchmark.get("name"), metric).tolist()
+                restored[metric] = summary
+            benchmark[block] = restored
+        benchmarks.append(benchmark)
+    if "benchmarks" in raw:
+        raw["benchmarks"] = benchmarks
+    return raw
+
+
+def _architecture_of(filepath):
+    filename = os.path.basename(filepath)
+    if filename.endswith(RESULT_SUFFIX):
+        return filename[:-len(RESULT_SUFFIX)]
+    return None
+
+
+# ============ HASHING ============
+def content_digest(filepath):
+    """SHA-256 of the file content"""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_index(cache_dir):
+    path = os.path.join(cache_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(cache_dir, index):
+    path = os.path.join(cache_dir, INDEX_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _cached_digest(filepath, index):
+    """Digest from the stat index, re-hashing only when mtime/size changed"""
+    stat = os.stat(filepath)
+    key = os.path.abspath(filepath)
+    entry = index.get(key)
+    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return entry["digest"], False
+    digest = content_digest(filepath)
+    index[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": digest}
+    return digest, True
+
+
+# ============ STORE ============
+def _store_stem(filepath):
+    """File stem qualified by its directory, so same-named files of different devices do not collide"""
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    directory = os.path.dirname(os.path.abspath(filepath))
+    return f"{stem}.{hashlib.sha256(directory.encode('utf-8')).hexdigest()[:8]}"
+
+
+def store_path(cache_dir, filepath, digest):
+    return os.path.join(cache_dir, f"{_store_stem(filepath)}-{digest[:16]}.npz")
+
+
+def _write_table(path, table):
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(
+        tmp,
+        version=np.array(STORE_VERSION),
+        digest=np.array(table.digest),
+        meta=np.array(json.dumps(table.meta, ensure_ascii=False)),
+        **{name: getattr(table, name) for name in COLUMNS},
+    )
+    os.replace(tmp, path)
+
+
+def _read_table(path, source):
+    with np.load(path, allow_pickle=False) as archive:
+        if int(archive["version"]) != STORE_VERSION:
+            return None
+        return RunTable(
+            source=source,
+            digest=str(archive["digest"]),
+            meta=json.loads(str(archive["meta"])),
+            **{name: archive[name] for name in COLUMNS},
+        )
+
+
+def _ingest_source(filepath, digest):
+    with open(filepath, 'r') as f:
+        raw = json.load(f)
+    if os.path.basename(filepath) == RUNS_DETAIL_FILE:
+        rows, meta = _flatten_runs_detail(raw)
+    else:
+        rows, meta = _flatten_result(raw, _architecture_of(filepath))
+    return _table_from_rows(filepath, digest, rows, meta)
+
+
+def ingest(filepath, cache_dir=CACHE_DIR, index=None):
+    """
+    Columnar table of one source file, read from the cache when the content
+    hash is already stored. Returns (table, ingested) where ingested tells
+    whether the source had to be parsed.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    own_index = index is None
+    if own_index:
+        index = _load_index(cache_dir)
+
+    digest, rehashed = _cached_digest(filepath, index)
+    path = store_path(cache_dir, filepath, digest)
+
+    table = None
+    if os.path.exists(path):
+        try:
+            table = _read_table(path, filepath)
+        except (OSError, ValueError, KeyError):
+            table = None
+
+    ingested = table is None
+    if ingested:
+        table = _ingest_source(filepath, digest)
+        _write_table(path, table)
+        _prune_stale(cache_dir, filepath, path)
+
+    if own_index and (rehashed or ingested):
+        _save_index(cache_dir, index)
+    return table, ingested
+
+
+def _prune_stale(cache_dir, filepath, keep):
+    """Drop archives of older versions of the same source file"""
+    stem = _store_stem(filepath)
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if path == keep or not name.endswith(".npz"):
+            continue
+        base = name[:-len(".npz")]
+        if base.rsplit("-", 1)[0] == stem:
+            os.remove(path)
+
+
+def ingest_directory(data_dir, cache_dir=CACHE_DIR):
+    """Ingest every *_result.json and runs_detail.json under data_dir"""
+    index = _load_index(cache_dir) if os.path.isdir(cache_dir) else {}
+    tables = {}
+    ingested = []
+    for filename in sorted(os.listdir(data_dir)):
+        if not (filename.endswith(RESULT_SUFFIX) or filename == RUNS_DETAIL_FILE):
+            continue
+        filepath = os.path.join(data_dir, filename)
+        table, fresh = ingest(filepath, cache_dir, index)
+        tables[filename] = table
+        if fresh:
+            ingested.append(filename)
+    if tables:
+        _save_index(cache_dir, index)
+    return tables, ingested
+
+
+def load_result(filepath, cache_dir=CACHE_DIR):
+    """Parsed *_result.json, served from the run store"""
+    table, _ = ingest(filepath, cache_dir)
+    return _rebuild_result(table)
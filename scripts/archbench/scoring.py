@@ -0,0 +1,280 @@
+"""
+Declarative scoring engine for the composite architecture score
+
+The score formulas live in scoring.json instead of the scripts:
+
+  - tests: direction of every benchmark test (HIGHER_IS_BETTER);
+  - derived: inputs computed from others (debt density per KLOC);
+  - dimensions: each dimension score is the mean of its normalized
+    components times `scale`; normalizers are `linear` (intercept +
+    slope·x, optional clip), `minmax` (across architectures, direction
+    lower/higher, 1.0 when all values are equal) and `threshold`
+    (max(0, 1 - x/limit));
+  - overall: weighted `geometric` (Π (S + offset)^w) or `arithmetic`
+    (Σ w·S) aggregate; `fallback` weights apply when an architecture
+    lacks a dimension (other gaps renormalize the remaining weights);
+  - profiles: per-script overrides merged over the base (the 5/6
+    architecture analyses and calculate_scores_with_hybrid.py differ only
+    in the performance line).
+
+load_scoring() compiles a profile once into a ScoringModel whose
+evaluation works on NumPy arrays with architectures on the last axis,
+so bootstrap replicates and weight sweeps are scored in one call:
+sweep() evaluates a (W, dimensions) weight matrix against the
+dimension scores and reports how often each architecture ranks first.
+"""
+
+import copy
+import json
+import os
+
+import numpy as np
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring.json")
+DEFAULT_SWEEP = 10000
+DEFAULT_SEED = 42
+
+
+# ============ CONFIG ============
+def _merge(base, override):
+    """Deep merge of override into a copy of base (None values are kept, not skipped)"""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def load_config(path=DEFAULT_CONFIG, profile=None):
+    """Scoring config with `profile` merged over the base sections"""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    profiles = config.pop("profiles", {})
+    if profile is not None:
+        if profile not in profiles:
+            raise ValueError(f"Unknown scoring profile {profile!r} (choose from {', '.join(profiles)})")
+        config = _merge(config, profiles[profile])
+    return config
+
+
+# ============ NORMALIZERS ============
+def _linear(spec):
+    intercept, slope, clip = spec["intercept"], spec["slope"], spec.get("clip")
+
+    def normalize(x):
+        y = intercept + slope * x
+        return np.clip(y, clip[0], clip[1]) if clip else y
+    return normalize
+
+
+def _minmax(spec):
+    lower = spec.get("direction", "lower") == "lower"
+
+    def normalize(x):
+        low = np.nanmin(x, axis=-1, keepdims=True)
+        high = np.nanmax(x, axis=-1, keepdims=True)
+        span = high - low
+        with np.errstate(invalid='ignore', divide='ignore'):
+            y = ((high - x) if lower else (x - low)) / span
+        return np.where(span == 0, 1.0, y)
+    return normalize
+
+
+def _threshold(spec):
+    limit = spec["limit"]
+
+    def normalize(x):
+        return np.maximum(0, 1 - x / limit)
+    return normalize
+
+
+NORMALIZERS = {"linear": _linear, "minmax": _minmax, "threshold": _threshold}
+
+
+# ============ MODEL ============
+class Dimension:
+    """One compiled dimension: normalized components averaged and scaled"""
+
+    def __init__(self, name, spec, derived):
+        self.name = name
+        self.formula = spec.get("formula")
+        self.scale = spec.get("scale", 1)
+        self.components = []
+        for component, component_spec in spec["components"].items():
+            normalizer = component_spec["normalizer"]
+            if normalizer["type"] not in NORMALIZERS:
+                raise ValueError(f"{name}.{component}: unknown normalizer {normalizer['type']!r}")
+            self.components.append((component, component_spec["input"], NORMALIZERS[normalizer["type"]](normalizer)))
+        self.derived = derived
+
+    @property
+    def inputs(self):
+        return [source for _, source, _ in self.components]
+
+    def _input(self, inputs, name):
+        if name in inputs:
+            return np.asarray(inputs[name], dtype=np.float64)
+        rule = self.derived[name]
+        numerator, denominator = (self._input(inputs, key) for key in rule["ratio"])
+        return numerator / (denominator / rule.get("per", 1))
+
+    def evaluate(self, inputs):
+        """(scores, {component: normalized}) for {input: array (..., architectures)}"""
+        normalized = {name: fn(self._input(inputs, source)) for name, source, fn in self.components}
+        total = 0
+        for value in normalized.values():
+            total = total + value
+        return (total / len(normalized)) * self.scale, normalized
+
+    def score_table(self, values_by_arch):
+        """
+        {"scores", "normalized"} per architecture for {arch: {input: value}};
+        architectures with None are skipped (and left out of the min-max range).
+        """
+        archs = [arch for arch, values in values_by_arch.items() if values is not None]
+        inputs = {}
+        for source in set(self.inputs) | {key for name in self.inputs if name in self.derived
+                                          for key in self.derived[name]["ratio"]}:
+            if all(source in values_by_arch[arch] for arch in archs):
+                inputs[source] = np.array([values_by_arch[arch][source] for arch in archs], dtype=np.float64)
+        scores, normalized = self.evaluate(inputs)
+        return {
+            "scores": {arch: float(scores[i]) for i, arch in enumerate(archs)},
+            "normalized": {arch: {name: float(values[i]) for name, values in normalized.items()}
+                           for i, arch in enumerate(archs)}
+        }
+
+
+class ScoringModel:
+    """A compiled scoring profile"""
+
+    def __init__(self, config):
+        self.config = config
+        self.higher_is_better = {test: spec["direction"] == "higher" for test, spec in config["tests"].items()}
+        derived = config.get("derived", {})
+        self.dimensions = {name: Dimension(name, spec, derived) for name, spec in config["dimensions"].items()}
+        overall = config["overall"]
+        self.aggregate = overall.get("aggregate", "geometric")
+        if self.aggregate not in ("geometric", "arithmetic"):
+            raise ValueError(f"Unknown overall aggregate {self.aggregate!r}")
+        self.offset = overall.get("offset", 0)
+        self.overall_formula = overall.get("formula")
+        self.dimension_names = list(overall["weights"])
+        self.weights = np.array([overall["weights"][name] for name in self.dimension_names], dtype=np.float64)
+        self.fallback = [
+            np.array([weights.get(name, 0.0) for name in self.dimension_names], dtype=np.float64)
+            for weights in overall.get("fallback", [])
+        ]
+
+    def formula(self, dimension):
+        return self.dimensions[dimension].formula
+
+    def score(self, dimension, inputs):
+        """Vectorized dimension score for {input: array (..., architectures)}"""
+        return self.dimensions[dimension].evaluate(inputs)[0]
+
+    def score_table(self, dimension, values_by_arch):
+        return self.dimensions[dimension].score_table(values_by_arch)
+
+    def _effective_weights(self, available, weights):
+        """
+        Per-architecture weights (..., W, architectures, dimensions): fallback
+        sets for the default weights, renormalized weights otherwise.
+        """
+        effective = weights[:, None, :] * available[None, :, :]
+        total = effective.sum(axis=-1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            effective = np.where(total > 0, effective / total, np.nan)
+        if weights.shape[0] == 1 and np.array_equal(weights[0], self.weights):
+            for fallback in self.fallback:
+                matches = np.all(available == (fallback > 0), axis=-1)
+                effective[0, matches] = fallback
+            effective[0, np.all(available, axis=-1)] = self.weights
+        return effective
+
+    def overall(self, scores, weights=None):
+        """
+        Overall score from dimension scores.
+
+        scores: {dimension: scalar or array (..., architectures)}, None or
+        NaN where a dimension is missing; weights: None (config weights),
+        (dimensions,) or (W, dimensions). Returns the broadcast shape of
+        the scores, with a leading W axis for a weight matrix.
+        """
+        columns = [scores.get(name) for name in self.dimension_names]
+        shape = np.broadcast(*[np.asarray(c, dtype=np.float64) for c in columns if c is not None]).shape
+        matrix = np.stack([
+            np.full(shape, np.nan) if c is None else np.broadcast_to(np.asarray(c, dtype=np.float64), shape)
+            for c in columns
+        ], axis=-1)
+        flat = matrix.reshape(-1, len(columns))
+        single = weights is None or np.ndim(weights) == 1
+        weight_matrix = np.atleast_2d(self.weights if weights is None else np.asarray(weights, dtype=np.float64))
+
+        effective = self._effective_weights(~np.isnan(flat), weight_matrix)
+        values = np.where(np.isnan(flat), 0.0, flat)
+        if self.aggregate == "geometric":
+            # Sequential product keeps the config-order floating-point result of the scalar formula
+            result = np.ones(effective.shape[:2])
+            for j in range(len(columns)):
+                result = result * (values[None, :, j] + self.offset) ** effective[:, :, j]
+        else:
+            result = np.einsum("wad,ad->wa", np.nan_to_num(effective), values)
+        result = np.where(np.isnan(effective).any(axis=-1), np.nan, result)
+        result = result.reshape((weight_matrix.shape[0],) + shape)
+        return result[0] if single else result
+
+    def sweep(self, scores, architectures, weights):
+        """
+        Overall scores and rank-1 shares for a (W, dimensions) weight matrix.
+
+        scores: {dimension: {arch: score}} (e.g. the `scores` sections of
+        comprehensive_analysis_6arch.json).
+        """
+        columns = {
+            name: np.array([_number(scores.get(name, {}).get(arch)) for arch in architectures])
+            for name in self.dimension_names
+        }
+        overall = self.overall(columns, weights)
+        ranked = np.where(np.isnan(overall), -np.inf, overall)
+        winners = ranked.argmax(axis=1)
+        return {
+            "overall": overall,
+            "winners": winners,
+            "rank1_share": {arch: float(np.mean(winners == i)) for i, arch in enumerate(architectures)}
+        }
+
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def load_scoring(profile=None, path=DEFAULT_CONFIG):
+    """Compiled ScoringModel of a scoring.json profile"""
+    return ScoringModel(load_config(path, profile))
+
+
+# ============ WEIGHT SENSITIVITY ============
+def sample_weights(n, n_dimensions, seed=DEFAULT_SEED, concentration=1.0):
+    """n weight vectors drawn uniformly (Dirichlet(1)) from the simplex, or Dirichlet(concentration)"""
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.full(n_dimensions, concentration), size=n)
+
+
+def weight_sensitivity(model, scores, architectures, n=DEFAULT_SWEEP, seed=DEFAULT_SEED):
+    """How often each architecture ranks first when the overall weights are drawn from the simplex"""
+    default = model.sweep(scores, architectures, model.weights[None, :])
+    default_winner = architectures[int(default["winners"][0])]
+    swept = model.sweep(scores, architectures, sample_weights(n, len(model.dimension_names), seed))
+    return {
+        "method": "Overall score re-evaluated for weight vectors drawn uniformly from the simplex (Dirichlet(1))",
+        "dimensions": model.dimension_names,
+        "default_weights": dict(zip(model.dimension_names, model.weights.tolist())),
+        "n_weight_vectors": n,
+        "seed": seed,
+        "default_winner": default_winner,
+        "default_winner_share": swept["rank1_share"][default_winner],
+        "rank1_share": dict(sorted(swept["rank1_share"].items(), key=lambda x: x[1], reverse=True))
+    }
@@ -0,0 +1,338 @@
+"""
+Sequential testing of benchmark iterations (group-sequential design)
+
+Every test runs a fixed repeatIterations (15 for startup, 5 for the
+rendering tests) whatever the variance, so clear-cut comparisons burn
+device time and close ones stay unresolved. Here each (test,
+architecture pair) comparison is re-evaluated at interim looks every
+`look_every` iterations, up to `max_iterations`:
+
+  - statistic: Mann-Whitney U of the first n iterations of both
+    architectures, standardized with the tie-corrected variance (z > 0
+    when the first architecture is higher); Cliff's delta = 2U/(n·n) - 1;
+  - efficacy bound c_k: Lan-DeMets O'Brien-Fleming alpha spending,
+    α(t) = 2 - 2Φ(z_{1-α/2} / √t) at information fraction t = n / max;
+  - futility bound b_k: the same spending shape for β under the design
+    drift θ, the effect the design detects with power 1 - β by
+    max_iterations (non-binding, so the type I error is α regardless);
+  - the bounds come from the exact recursive integration of the
+    group-sequential score process (Armitage, McPherson & Rowe), computed
+    once per design on a grid with NumPy convolutions.
+
+At each look |z| ≥ c_k settles the pair in favour of the better
+architecture (HIGHER_IS_BETTER), |z| < b_k settles it as no difference
+worth more runs, anything else needs the next look. Evaluation only uses
+the iterations present, so the same call can be repeated as iterations
+stream in; a test's plan is the look at which all its pairs settled, or
+the next look while any pair is pending.
+
+runs_detail.json pads the 15 startup iterations to n = 30 by repeating
+them; strip_padding() undoes that before the looks are formed.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import cached_property
+from itertools import combinations
+
+import numpy as np
+from scipy.optimize import brentq
+from scipy.stats import norm
+
+from archbench import runstore
+from archbench.loader import get_metric_name
+
+OUTPUT_FILE = "analysis_result/sequential_plan.json"
+
+DEFAULT_ALPHA = 0.05
+DEFAULT_POWER = 0.80
+DEFAULT_LOOK_EVERY = 5
+DEFAULT_MAX_ITERATIONS = 30
+
+# Score-process grid (information scale, total information 1)
+GRID_STEP = 0.01
+GRID_LIMIT = 15.0
+
+
+# ============ BOUNDARIES ============
+def obrien_fleming_spending(t, level):
+    """Lan-DeMets O'Brien-Fleming spending function: error spent by information fraction t"""
+    t = np.asarray(t, dtype=np.float64)
+    return 2 - 2 * norm.cdf(norm.ppf(1 - level / 2) / np.sqrt(t))
+
+
+def _advance(density, dt, drift):
+    """Density of the score after an independent N(drift·dt, dt) increment"""
+    half = int(np.ceil((abs(drift) * dt + 8 * np.sqrt(dt)) / GRID_STEP))
+    x = GRID_STEP * np.arange(-half, half + 1)
+    kernel = norm.pdf(x, loc=drift * dt, scale=np.sqrt(dt))
+    return np.convolve(density, kernel, mode="same") * GRID_STEP
+
+
+def _outside_mass(density, grid, limit):
+    """Mass of the score density with |S| ≥ limit"""
+    cdf = np.concatenate([[0.0], np.cumsum((density[1:] + density[:-1]) / 2) * GRID_STEP])
+    return float(np.interp(-limit, grid, cdf) + cdf[-1] - np.interp(limit, grid, cdf))
+
+
+def _inside_mass(density, grid, limit):
+    cdf = np.concatenate([[0.0], np.cumsum((density[1:] + density[:-1]) / 2) * GRID_STEP])
+    return float(np.interp(limit, grid, cdf) - np.interp(-limit, grid, cdf))
+
+
+def efficacy_bounds(fractions, alpha):
+    """Two-sided z bounds c_k spending alpha(t) under H0"""
+    grid = np.arange(-GRID_LIMIT, GRID_LIMIT + GRID_STEP / 2, GRID_STEP)
+    spent = np.diff(np.concatenate([[0.0], obrien_fleming_spending(fractions, alpha)]))
+    bounds = []
+    density, previous = None, 0.0
+    for t, target in zip(fractions, spent):
+        if density is None:
+            density = norm.pdf(grid, scale=np.sqrt(t))
+        else:
+            density = _advance(density, t - previous, 0.0)
+        root_t = np.sqrt(t)
+        if _outside_mass(density, grid, 0.0) <= target:
+            c = 0.0
+        else:
+            c = brentq(lambda z: _outside_mass(density, grid, z * root_t) - target, 0.0, GRID_LIMIT / root_t)
+        bounds.append(c)
+        density = np.where(np.abs(grid) < c * root_t, density, 0.0)
+        previous = t
+    return np.array(bounds)
+
+
+def _futility_run(fractions, beta, drift, bounds):
+    """Futility bounds b_k under drift θ and the β left unspent at the final look"""
+    grid = np.arange(-GRID_LIMIT, GRID_LIMIT + GRID_STEP / 2, GRID_STEP)
+    spent = np.diff(np.concatenate([[0.0], obrien_fleming_spending(fractions, beta)]))
+    futility = []
+    density, previous = None, 0.0
+    for k, (t, target, c) in enumerate(zip(fractions, spent, bounds)):
+        if density is None:
+            density = norm.pdf(grid, loc=drift * t, scale=np.sqrt(t))
+        else:
+            density = _advance(density, t - previous, drift)
+        root_t = np.sqrt(t)
+        if k == len(fractions) - 1:
+            return np.array(futility + [c]), _inside_mass(density, grid, c * root_t) - target
+        if _inside_mass(density, grid, c * root_t) <= target:
+            b = c
+        else:
+            b = brentq(lambda z: _inside_mass(density, grid, z * root_t) - target, 0.0, c)
+        futility.append(b)
+        density = np.where((np.abs(grid) >= b * root_t) & (np.abs(grid) < c * root_t), density, 0.0)
+        previous = t
+
+
+@dataclass
+class SequentialDesign:
+    """Group-sequential design: looks every look_every iterations up to max_iterations"""
+    alpha: float = DEFAULT_ALPHA
+    power: float = DEFAULT_POWER
+    look_every: int = DEFAULT_LOOK_EVERY
+    max_iterations: int = DEFAULT_MAX_ITERATIONS
+    looks: list = field(init=False)
+
+    def __post_init__(self):
+        self.looks = list(range(self.look_every, self.max_iterations + 1, self.look_every))
+        if not self.looks or self.looks[-1] != self.max_iterations:
+            self.looks.append(self.max_iterations)
+
+    @property
+    def fractions(self):
+        return np.array(self.looks, dtype=np.float64) / self.max_iterations
+
+    @cached_property
+    def efficacy(self):
+        return efficacy_bounds(self.fractions, self.alpha)
+
+    @cached_property
+    def _futility_design(self):
+        """(futility bounds, drift θ) with the final futility bound meeting the efficacy bound"""
+        beta = 1 - self.power
+        drift = brentq(lambda theta: _futility_run(self.fractions, beta, theta, self.efficacy)[1], 0.5, 10.0)
+        return _futility_run(self.fractions, beta, drift, self.efficacy)[0], drift
+
+    @property
+    def futility(self):
+        return self._futility_design[0]
+
+    @property
+    def drift(self):
+        return self._futility_design[1]
+
+    def as_dict(self):
+        return {
+            "alpha": self.alpha,
+            "power": self.power,
+            "looks": self.looks,
+            "information_fractions": [round(t, 4) for t in self.fractions.tolist()],
+            "efficacy_z": [round(c, 4) for c in self.efficacy.tolist()],
+            "futility_z": [round(b, 4) for b in self.futility.tolist()],
+            "design_drift": round(float(self.drift), 4),
+            "spending": "Lan-DeMets O'Brien-Fleming (alpha for efficacy, beta for non-binding futility)"
+        }
+
+
+# ============ STATISTIC ============
+def strip_padding(values):
+    """Runs without the repetition runs_detail.json uses to pad a series (15 values written twice)"""
+    values = list(values)
+    half = len(values) // 2
+    if half and len(values) % 2 == 0 and values[:half] == values[half:]:
+        return values[:half]
+    return values
+
+
+def mann_whitney_z(x, y):
+    """(z, Cliff's delta) of two equal-length samples; z > 0 when x tends to be higher"""
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    n_x, n_y = len(x), len(y)
+    u = np.sum(x[:, None] > y[None, :]) + 0.5 * np.sum(x[:, None] == y[None, :])
+    n = n_x + n_y
+    _, ties = np.unique(np.concatenate([x, y]), return_counts=True)
+    variance = n_x * n_y / 12 * ((n + 1) - np.sum(ties ** 3 - ties) / (n * (n - 1)))
+    z = (u - n_x * n_y / 2) / np.sqrt(variance) if variance > 0 else 0.0
+    return float(z), float(2 * u / (n_x * n_y) - 1)
+
+
+def monitor_pair(x, y, design, higher_is_better):
+    """
+    Replay the looks available in two iteration streams (arrival order).
+
+    Returns the decision ("settled" / "continue"), the winner (None for a
+    futility stop), the stopping look and the z path.
+    """
+    available = min(len(x), len(y))
+    path = []
+    for k, n in enumerate(design.looks):
+        if n > available:
+            break
+        z, delta = mann_whitney_z(x[:n], y[:n])
+        path.append({"n": n, "z": round(z, 4), "cliffs_delta": round(delta, 4)})
+        if abs(z) >= design.efficacy[k]:
+            return {"decision": "settled", "outcome": "difference", "winner": "first" if (z > 0) == higher_is_better
+                    else "second", "stopped_at": n, "path": path}
+        if abs(z) < design.futility[k]:
+            return {"decision": "settled", "outcome": "no_difference", "winner": None, "stopped_at": n, "path": path}
+    next_look = next((n for n in design.looks if n > available), None)
+    return {"decision": "continue", "outcome": None, "winner": None, "stopped_at": None,
+            "next_look": next_look, "path": path}
+
+
+# ============ PLAN ============
+def test_plan(runs_by_arch, design, higher_is_better, repeat_iterations=None):
+    """Pair decisions and the recommended iteration count of one test"""
+    pairs = {}
+    for arch1, arch2 in combinations(sorted(runs_by_arch), 2):
+        outcome = monitor_pair(runs_by_arch[arch1], runs_by_arch[arch2], design, higher_is_better)
+        outcome["winner"] = {"first": arch1, "second": arch2}.get(outcome["winner"])
+        pairs[f"{arch1} vs {arch2}"] = outcome
+
+    observed = min(len(runs) for runs in runs_by_arch.values())
+    pending = [pair for pair, outcome in pairs.items() if outcome["decision"] == "continue"]
+    if pending:
+        recommended = max(outcome["next_look"] or design.max_iterations for outcome in pairs.values()
+                          if outcome["decision"] == "continue")
+    else:
+        recommended = max(outcome["stopped_at"] for outcome in pairs.values())
+    return {
+        "repeat_iterations": repeat_iterations,
+        "observed_iterations": observed,
+        "status": "continue" if pending else "settled",
+        "recommended_iterations": recommended,
+        "iterations_saved": (repeat_iterations - recommended) if repeat_iterations and not pending else 0,
+        "settled_pairs": len(pairs) - len(pending),
+        "pending_pairs": pending,
+        "pairs": pairs
+    }
+
+
+def sequential_plan(runs, tests, higher_is_better, design, repeat_iterations=None):
+    """
+    Per-test plans for {arch: {test: runs}} (iterations in arrival order);
+    repeat_iterations: {test: configured iterations}.
+    """
+    plans = {}
+    for test in tests:
+        runs_by_arch = {arch: strip_padding(arch_runs[test]) for arch, arch_runs in runs.items() if test in arch_runs}
+        if len(runs_by_arch) < 2:
+            continue
+        plans[test] = test_plan(runs_by_arch, design, higher_is_better[test],
+                                (repeat_iterations or {}).get(test))
+    return plans
+
+
+# ============ SOURCES ============
+def dataset_runs(dataset, tests):
+    """({arch: {test: runs}}, {test: repeatIterations}) from a BenchmarkDataset"""
+    repeat = {}
+    for result in dataset.results.values():
+        for test in tests:
+            iterations = result.benchmarks.get(test, {}).get("repeatIterations")
+            if iterations is not None:
+                repeat[test] = max(repeat.get(test, 0), iterations)
+    return dataset.benchmark_runs(tests), repeat
+
+
+def runs_detail_runs(path, tests, arch_mapping):
+    """{arch: {test: runs}} from a runs_detail.json (through the run store), padding removed"""
+    table, _ = runstore.ingest(path)
+    runs = {}
+    for arch_key, by_test in table.nested().items():
+        arch = arch_mapping.get(arch_key, arch_key)
+        for test in tests:
+            values = by_test.get(test, {}).get(get_metric_name(test))
+            if values:
+                runs.setdefault(arch, {})[test] = strip_padding(values)
+    return runs
+
+
+# ============ STAGE ============
+def print_report(results):
+    """Console summary of the per-test plans"""
+    design = results["design"]
+    print(f"\nDESIGN: looks at {design['looks']} iterations, α = {design['alpha']}, power {design['power']:.0%}")
+    print(f"  Efficacy |z| ≥ {', '.join(f'{c:.2f}' for c in design['efficacy_z'])}")
+    print(f"  Futility |z| <  {', '.join(f'{b:.2f}' for b in design['futility_z'])}")
+    print(f"\n  {'Test':40} {'Runs':>5} {'Status':>9} {'Settled':>8} {'Plan':>5} {'Saved':>6}")
+    for test, plan in results["tests"].items():
+        n_pairs = plan["settled_pairs"] + len(plan["pending_pairs"])
+        print(f"  {test:40} {plan['repeat_iterations'] or plan['observed_iterations']:>5} {plan['status']:>9} "
+              f"{plan['settled_pairs']:>3}/{n_pairs:<4} {plan['recommended_iterations']:>5} "
+              f"{plan['iterations_saved']:>6}")
+    summary = results["summary"]
+    print(f"\n  Iterations per architecture: {summary['configured_iterations']} configured, "
+          f"{summary['recommended_iterations']} recommended")
+
+
+def run_sequential_analysis(runs, tests, higher_is_better, repeat_iterations=None, design=None,
+                            output_file=OUTPUT_FILE, source=None):
+    """Plan every test, write JSON and print the summary"""
+    design = design or SequentialDesign()
+    plans = sequential_plan(runs, tests, higher_is_better, design, repeat_iterations)
+    results = {
+        "metadata": {
+            "analysis_date": datetime.now().isoformat(),
+            "data_source": source,
+            "statistic": "Mann-Whitney z of the first n iterations per pair (tie-corrected)"
+        },
+        "design": design.as_dict(),
+        "tests": plans,
+        "summary": {
+            "settled_tests": [test for test, plan in plans.items() if plan["status"] == "settled"],
+            "pending_tests": [test for test, plan in plans.items() if plan["status"] == "continue"],
+            "configured_iterations": sum(plan["repeat_iterations"] or plan["observed_iterations"]
+                                         for plan in plans.values()),
+            "recommended_iterations": sum(plan["recommended_iterations"] for plan in plans.values())
+        }
+    }
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print_report(results)
+    print(f"\n✓ Results saved to: {output_file}")
+    return results
@@ -0,0 +1,254 @@
+"""
+Build variants for product/cart/chat module compositions
+
+update_dependencies.py switches a build by commenting lines of the
+tracked app/build.gradle.kts in place, so only one variant can exist per
+checkout and CI builds them one after another. Here every composition
+becomes a generated Gradle init script instead:
+
+    ./gradlew -I build/variants/<variant>/variant.init.gradle.kts \\
+        --project-cache-dir build/variants/<variant>/.gradle :app:assembleMockRelease
+
+The script replaces the :feature:<feature>-impl[-<arch>] project
+dependencies of :app with the variant's modules and moves every build
+directory under build/variants/<variant>/, so any number of variants
+build side by side from one untouched checkout. (Project modules are not
+version-catalog entries, which is why an init script rather than a
+catalog fragment carries the selection.)
+
+Generation is pure string templating over the settings.gradle.kts
+includes: the output depends only on the compositions, files are only
+rewritten when their content changes, init scripts of variants missing
+from the new manifest are removed (their build outputs are kept), and
+all 125 variants are written in well under a second. manifest.json lists every variant with its
+modules, command, output paths and a content hash for a build farm.
+BuildConfig.CURRENT_ARCHITECTURE keeps its tracked value, so the farm
+files each run under the variant's `result_file` instead.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from archbench.code_metrics import COMPOSITIONS, DEFAULT_IMPL, FEATURES
+from archbench.composition import enumerate_compositions
+
+OUTPUT_DIR = "build/variants"
+SETTINGS_FILE = "settings.gradle.kts"
+INIT_SCRIPT = "variant.init.gradle.kts"
+MANIFEST = "manifest.json"
+GRADLE_TASKS = (":app:assembleMockRelease", ":benchmark:assembleMockRelease")
+
+_INCLUDE = re.compile(r'^\s*include\(\s*"(?P<path>:[^"]+)"\s*\)', re.MULTILINE)
+
+_TEMPLATE = """\
+// Generated by `archbench variants` - do not edit
+// Variant {name}: {description}
+//
+//   ./gradlew -I {init_script} --project-cache-dir {cache_dir} {tasks}
+//
+// Replaces the feature implementation modules of :app and moves every build
+// directory under {build_dir}/, leaving app/build.gradle.kts untouched.
+
+val variantModules = listOf(
+{modules}
+)
+val featureImplementation = Regex("^:feature:({features})-impl(-[a-z]+)?$")
+
+gradle.beforeProject {{
+    val projectDir = path.trim(':').replace(':', '/').ifEmpty {{ "root" }}
+    layout.buildDirectory.set(rootDir.resolve("{build_dir}/$projectDir"))
+}}
+
+gradle.afterProject {{
+    if (path == ":app") {{
+        configurations.getByName("implementation").dependencies.removeIf {{
+            it is ProjectDependency && featureImplementation.matches(it.path)
+        }}
+        variantModules.forEach {{ dependencies.add("implementation", dependencies.project(mapOf("path" to it))) }}
+    }}
+}}
+"""
+
+
+# ============ NAMING ============
+def module_path(feature, arch_key):
+    """Gradle path of a feature implementation (the Single-State MVVM one has no suffix)"""
+    return f":feature:{feature}-impl" if arch_key == DEFAULT_IMPL else f":feature:{feature}-impl-{arch_key}"
+
+
+def variant_name(composition):
+    """"classicmvvm-mvp-singlestatemvvm" (feature order)"""
+    return "-".join(composition[feature] for feature in FEATURES)
+
+
+def variant_label(composition):
+    """Architecture key a benchmark result of this build is filed under, if it has one"""
+    if len(set(composition.values())) == 1:
+        return composition[FEATURES[0]]
+    return next((key for key, known in COMPOSITIONS.items() if known == composition), None)
+
+
+def parse_composition(text):
+    """{feature: arch_key} from "classicmvvm/mvp/singlestatemvvm" or a known key ("hybrid", "mvp")"""
+    if text in COMPOSITIONS:
+        return dict(COMPOSITIONS[text])
+    parts = text.split("/")
+    if len(parts) == 1:
+        parts = parts * len(FEATURES)
+    if len(parts) != len(FEATURES):
+        raise ValueError(f"Composition {text!r} needs one architecture per feature ({'/'.join(FEATURES)})")
+    return dict(zip(FEATURES, parts))
+
+
+def included_projects(settings_file=SETTINGS_FILE):
+    """Project paths included by settings.gradle.kts"""
+    with open(settings_file, 'r', encoding='utf-8') as f:
+        return set(_INCLUDE.findall(f.read()))
+
+
+def available_architectures(projects):
+    """Architecture keys that have an implementation module for every feature"""
+    keys = set()
+    for path in projects:
+        match = re.match(r"^:feature:([a-z]+)-impl(?:-([a-z]+))?$", path)
+        if match:
+            keys.add(match.group(2) or DEFAULT_IMPL)
+    return sorted(key for key in keys if all(module_path(f, key) in projects for f in FEATURES))
+
+
+# ============ GENERATION ============
+def render_init_script(composition, output_dir=OUTPUT_DIR):
+    """Init script text of one variant (deterministic)"""
+    name = variant_name(composition)
+    build_dir = f"{output_dir}/{name}"
+    return _TEMPLATE.format(
+        name=name,
+        description=", ".join(f"{feature}={arch_key}" for feature, arch_key in composition.items()),
+        init_script=f"{build_dir}/{INIT_SCRIPT}",
+        cache_dir=f"{build_dir}/.gradle",
+        tasks=" ".join(GRADLE_TASKS),
+        build_dir=build_dir,
+        modules="\n".join(f'    "{module_path(feature, composition[feature])}",' for feature in FEATURES),
+        features="|".join(FEATURES)
+    )
+
+
+def _write_if_changed(path, content):
+    """Write content unless the file already holds it; True when written"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def _remove_stale(output_dir, keep):
+    """
+    Delete generated init scripts of variants not in keep (names), and their
+    directory when nothing else is left in it; returns the number removed.
+    Build outputs and files this generator did not write are left alone.
+    """
+    removed = 0
+    if not os.path.isdir(output_dir):
+        return removed
+    for name in sorted(os.listdir(output_dir)):
+        path = os.path.join(output_dir, name, INIT_SCRIPT)
+        if name in keep or not os.path.isfile(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            if not f.read().startswith(_TEMPLATE.split("\n", 1)[0]):
+                continue
+        os.remove(path)
+        removed += 1
+        if not os.listdir(os.path.join(output_dir, name)):
+            os.rmdir(os.path.join(output_dir, name))
+    return removed
+
+
+def variant_entry(composition, output_dir, content):
+    name = variant_name(composition)
+    build_dir = f"{output_dir}/{name}"
+    init_script = f"{build_dir}/{INIT_SCRIPT}"
+    return {
+        "name": name,
+        "composition": composition,
+        "label": variant_label(composition),
+        "modules": [module_path(feature, composition[feature]) for feature in FEATURES],
+        "init_script": init_script,
+        "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        "build_dir": build_dir,
+        "project_cache_dir": f"{build_dir}/.gradle",
+        "command": f"./gradlew -I {init_script} --project-cache-dir {build_dir}/.gradle {' '.join(GRADLE_TASKS)}",
+        "result_file": f"{name}_result.json"
+    }
+
+
+def generate_variants(compositions, output_dir=OUTPUT_DIR, settings_file=SETTINGS_FILE):
+    """
+    Write one init script per composition and the build-farm manifest.
+
+    Init scripts of variants left out of this manifest are removed, so the
+    directory always matches the manifest. Raises ValueError for a module
+    settings.gradle.kts does not include. Returns the manifest with the
+    written / unchanged / removed counts.
+    """
+    projects = included_projects(settings_file)
+    unique = list({variant_name(c): c for c in compositions}.values())
+    missing = sorted({path for c in unique for path in (module_path(f, c[f]) for f in FEATURES)} - projects)
+    if missing:
+        raise ValueError(f"Modules not included in {settings_file}: {', '.join(missing)}")
+
+    variants = []
+    written = 0
+    for composition in unique:
+        content = render_init_script(composition, output_dir)
+        entry = variant_entry(composition, output_dir, content)
+        written += _write_if_changed(entry["init_script"], content)
+        variants.append(entry)
+
+    manifest = {
+        "generator": "archbench variants",
+        "settings_file": settings_file,
+        "gradle_tasks": list(GRADLE_TASKS),
+        "variant_count": len(variants),
+        "variants": variants
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    written += _write_if_changed(manifest_path, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+    removed = _remove_stale(output_dir, {entry["name"] for entry in variants})
+    return {"manifest": manifest_path, "written": written, "unchanged": len(variants) + 1 - written,
+            "removed": removed, **manifest}
+
+
+# ============ STAGE ============
+def shortlist_compositions(search_file):
+    """Shortlisted compositions of an archbench compose result (composition_search.json)"""
+    with open(search_file, 'r', encoding='utf-8') as f:
+        search = json.load(f)
+    return [search["compositions"][key]["composition"] for key in search["shortlist"]]
+
+
+def run_variant_generation(requested=None, search_file=None, output_dir=OUTPUT_DIR, settings_file=SETTINGS_FILE):
+    """
+    Generate variants for requested compositions ("all" or None: every
+    composition of the available architectures), plus a compose shortlist.
+    """
+    compositions = []
+    if search_file:
+        compositions += shortlist_compositions(search_file)
+    if requested and requested != ["all"]:
+        compositions += [parse_composition(text) for text in requested]
+    elif not search_file:
+        compositions += enumerate_compositions(available_architectures(included_projects(settings_file)))
+
+    result = generate_variants(compositions, output_dir, settings_file)
+    print(f"✓ {result['variant_count']} variants in {output_dir}/ "
+          f"({result['written']} files written, {result['unchanged']} unchanged, "
+          f"{result['removed']} stale init scripts removed)")
+    print(f"  Manifest: {result['manifest']}")
+    return result
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cliff's Delta Benchmark
+Checks the vectorized kernels in archbench.effect_size against the original
+nested-loop implementation (exact equality) and reports the speed-up.
+
+Usage: python3 scripts/benchmark_effect_size.py
+"""
+
+import json
+import os
+import time
+from itertools import combinations
+
+import numpy as np
+
+from archbench.effect_size import cliffs_delta, cliffs_delta_batch, cliffs_delta_matrix
+
+DATA_DIR = "rawdata/performance"
+SAMPLE_SIZES = [5, 30, 300, 3000]
+ARCH_COUNT = 6
+SEED = 42
+
+
+# ============ REFERENCE ============
+def cliffs_delta_loop(x, y):
+    """Original O(n·m) implementation from the analysis scripts"""
+    n_x, n_y = len(x), len(y)
+    if n_x == 0 or n_y == 0:
+        return 0.0
+
+    dominance = 0
+    for xi in x:
+        for yj in y:
+            if xi > yj:
+                dominance += 1
+            elif xi < yj:
+                dominance -= 1
+
+    return dominance / (n_x * n_y)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+# ============ CHECKS ============
+def check_recorded_runs():
+    """Exact equality on every test × pair of the recorded result files"""
+    samples_by_test = {}
+    for filename in sorted(os.listdir(DATA_DIR)):
+        if not filename.endswith("_result.json"):
+            continue
+        arch = filename[:-len("_result.json")]
+        with open(os.path.join(DATA_DIR, filename), 'r') as f:
+            for benchmark in json.load(f).get("benchmarks", []):
+                for metric in benchmark.get("metrics", {}).values():
+                    if "runs" in metric:
+                        samples_by_test.setdefault(benchmark["name"], {})[arch] = metric["runs"]
+
+    batch, batch_time = timed(cliffs_delta_batch, samples_by_test)
+
+    loop_time = 0.0
+    pairs = 0
+    for test_name, runs_by_arch in samples_by_test.items():
+        for a1, a2 in combinations(runs_by_arch.keys(), 2):
+            expected, elapsed = timed(cliffs_delta_loop, runs_by_arch[a1], runs_by_arch[a2])
+            loop_time += elapsed
+            pairs += 1
+            assert batch[test_name][(a1, a2)] == expected, (test_name, a1, a2)
+
+    print(f"Recorded runs: {len(samples_by_test)} tests, {pairs} pairs identical")
+    print(f"  loop {loop_time * 1000:8.2f} ms | batch {batch_time * 1000:8.2f} ms")
+
+
+def check_synthetic(rng):
+    """Exact equality and timing on synthetic samples with ties"""
+    print(f"\n{'n per arch':>10} {'loop (s)':>10} {'pair (s)':>10} {'matrix (s)':>11} {'speed-up':>9}")
+    print("-" * 54)
+    for n in SAMPLE_SIZES:
+        # Rounded values force ties, like frame counts and mWh quanta
+        groups = [np.round(rng.normal(100 + i, 5, size=n), 1).tolist() for i in range(ARCH_COUNT)]
+
+        matrix, matrix_time = timed(cliffs_delta_matrix, groups)
+
+        loop_time = 0.0
+        pair_time = 0.0
+        for i, j in combinations(range(ARCH_COUNT), 2):
+            expected, elapsed = timed(cliffs_delta_loop, groups[i], groups[j])
+            loop_time += elapsed
+            actual, elapsed = timed(cliffs_delta, groups[i], groups[j])
+            pair_time += elapsed
+            assert actual == expected, (n, i, j)
+            assert matrix[i, j] == expected and matrix[j, i] == -expected, (n, i, j)
+
+        speedup = loop_time / matrix_time if matrix_time > 0 else float("inf")
+        print(f"{n:>10} {loop_time:>10.4f} {pair_time:>10.4f} {matrix_time:>11.4f} {speedup:>8.0f}x")
+
+
+def main():
+    print("=" * 54)
+    print("CLIFF'S DELTA: LOOP vs VECTORIZED")
+    print("=" * 54)
+    check_recorded_runs()
+    check_synthetic(np.random.default_rng(SEED))
+    print("\n✓ All vectorized results match the nested loop exactly")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,14 @@ Android Architecture Scoring Calculator with Hybrid Architecture
 Calculates Performance, Memory, and Code Quality scores
 """
 
-import json
-import os
 import numpy as np
 from scipy.stats import rankdata
 
+from archbench.code_metrics import load_code_quality_data
+from archbench.loader import load_dataset
+from archbench.memory import load_memory_data
+from archbench.scoring import load_scoring
+
 # ============ KONFIGÜRASYON ============
 ARCH_MAPPING = {
     "classicmvvm": "Classic MVVM",
@@ -28,186 +31,19 @@ ALL_TESTS = [
     "cartQuantityUpdatePerformance", "categoryFilterPerformance"
 ]
 
-HIGHER_IS_BETTER = {
-    "startupCold": False,
-    "startupWarm": False,
-    "productListScrollAndPagination": True,
-    "productListRapidScrolling": True,
-    "productListCategoryFiltering": True,
-    "cartQuantityUpdatesWithDynamicSetup": True,
-    "cartCheckoutFlow": True,
-    "chatListRealtimeUpdates": True,
-    "chatDetailMessageStreamAndSending": True,
-    "chatRapidSwitching": True,
-    "continuousScrollJankTest": True,
-    "flingJankTest": True,
-    "rapidDirectionChangeJankTest": True,
-    "cartQuantityUpdatePerformance": True,
-    "categoryFilterPerformance": True
-}
+SCORING = load_scoring("scores")
+HIGHER_IS_BETTER = SCORING.higher_is_better
 
 DATA_DIR = "rawdata/performance"
 
 # ============ VERİ YÜKLEME ============
-def get_metric_name(test_name):
-    """Determine metric name for a test"""
-    if test_name in ["startupCold", "startupWarm"]:
-        return "timeToInitialDisplayMs"
-    else:
-        return "frameCount"
-
-def get_runs_from_benchmark(benchmark, metric_name):
-    """Extract runs data from benchmark"""
-    if "metrics" in benchmark and metric_name in benchmark["metrics"]:
-        if "runs" in benchmark["metrics"][metric_name]:
-            return benchmark["metrics"][metric_name]["runs"]
-    return None
-
-def load_benchmark_data():
-    """Load all benchmark data from JSON files"""
-    data = {}
-    
-    json_files = {
-        "classicmvvm": "classicmvvm_result.json",
-        "mvc": "mvc_result.json",
-        "mvi": "mvi_result.json",
-        "mvp": "mvp_result.json",
-        "singlestatemvvm": "singlestatemvvm_result.json",
-        "hybrid": "hybrid_result.json"
-    }
-    
-    for arch_key, filename in json_files.items():
-        filepath = os.path.join(DATA_DIR, filename)
-        if not os.path.exists(filepath):
-            print(f"Warning: {filename} not found, skipping {arch_key}")
-            continue
-        
-        with open(filepath, 'r') as f:
-            arch_data = json.load(f)
-        
-        arch_name = ARCH_MAPPING[arch_key]
-        data[arch_name] = {}
-        
-        if "benchmarks" not in arch_data:
-            print(f"Warning: No 'benchmarks' in {filename}")
-            continue
-        
-        for benchmark in arch_data["benchmarks"]:
-            test_name = benchmark.get("name")
-            if test_name not in ALL_TESTS:
-                continue
-            
-            metric_name = get_metric_name(test_name)
-            runs = get_runs_from_benchmark(benchmark, metric_name)
-            
-            if runs is None or len(runs) == 0:
-                continue
-            
-            data[arch_name][test_name] = runs
-    
-    return data
-
-def parse_memory_from_json(filepath):
-    """Parse memory data from JSON file"""
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    
-    # Try to find memory data in memoryBenchmarkResult
-    if "memoryBenchmarkResult" in data and len(data["memoryBenchmarkResult"]) > 0:
-        # Find TotalPSS_MB row
-        totalpss_row = None
-        for row in data["memoryBenchmarkResult"]:
-            if row.get("Label") == "TotalPSS_MB":
-                totalpss_row = row
-                break
-        
-        if totalpss_row:
-            # Extract initial value
-            initial = totalpss_row.get("01_AppLaunch")
-            if initial is None:
-                return None
-            
-            # Find peak value (check all snapshot columns)
-            peak = initial
-            for key, value in totalpss_row.items():
-                if key.startswith(("0", "1")) and isinstance(value, (int, float)) and value > peak:
-                    peak = value
-            
-            # Extract final value
-            final = totalpss_row.get("10_Peak_AfterAllOperations") or totalpss_row.get("09_ChatDetail_AfterStream")
-            if final is None:
-                final = initial
-            
-            # Calculate growth
-            growth = final - initial
-            
-            return {"initial": float(initial), "peak": float(peak), "growth": float(growth)}
-    
-    return None
-
-def load_memory_data():
-    """Load memory data from JSON files"""
-    memory_data = {}
-    
-    json_files = {
-        "classicmvvm": "classicmvvm_result.json",
-        "mvc": "mvc_result.json",
-        "mvi": "mvi_result.json",
-        "mvp": "mvp_result.json",
-        "singlestatemvvm": "singlestatemvvm_result.json",
-        "hybrid": "hybrid_result.json"
-    }
-    
-    # Known memory values (for non-hybrid architectures)
-    known_values = {
-        "Classic MVVM": {"initial": 30.40, "peak": 38.42, "growth": 0.55},
-        "MVC": {"initial": 30.34, "peak": 37.71, "growth": 0.48},
-        "MVI": {"initial": 29.57, "peak": 38.42, "growth": 1.09},
-        "MVP": {"initial": 30.00, "peak": 38.00, "growth": 1.00},
-        "Single-State MVVM": {"initial": 33.28, "peak": 40.87, "growth": 0.37}
-    }
-    
-    for arch_key, filename in json_files.items():
-        arch_name = ARCH_MAPPING[arch_key]
-        filepath = os.path.join(DATA_DIR, filename)
-        
-        if arch_name in known_values:
-            memory_data[arch_name] = known_values[arch_name]
-        elif os.path.exists(filepath):
-            parsed = parse_memory_from_json(filepath)
-            if parsed:
-                memory_data[arch_name] = parsed
-            else:
-                print(f"Warning: Could not parse memory data for {arch_name}")
-    
-    return memory_data
-
-def load_code_quality_data():
-    """Load code quality data (hybrid has no static analysis)"""
-    code_data = {
-        "Classic MVVM": {"sloc": 2459, "debt_hours": 2.9, "avg_cog": 2.61, "avg_cyc": 1.95, "max_cyc": 9},
-        "MVC": {"sloc": 2715, "debt_hours": 1.7, "avg_cog": 1.83, "avg_cyc": 1.75, "max_cyc": 9},
-        "MVI": {"sloc": 2510, "debt_hours": 2.0, "avg_cog": 2.60, "avg_cyc": 2.38, "max_cyc": 9},
-        "MVP": {"sloc": 3001, "debt_hours": 4.6, "avg_cog": 1.50, "avg_cyc": 1.61, "max_cyc": 10},
-        "Single-State MVVM": {"sloc": 2442, "debt_hours": 2.0, "avg_cog": 2.50, "avg_cyc": 2.02, "max_cyc": 14}
-        # Hybrid: no static analysis data
-    }
-    return code_data
+def load_benchmark_data(dataset):
+    """Extract per-test runs for all architectures"""
+    return dataset.benchmark_runs(ALL_TESTS)
 
 # ============ SCORE HESAPLAMA ============
-def normalize_inverse(value, values_list):
-    """Inverse normalization: lower = better"""
-    values_arr = np.array(values_list)
-    min_val = np.min(values_arr)
-    max_val = np.max(values_arr)
-    
-    if max_val == min_val:
-        return 1.0
-    
-    return (max_val - value) / (max_val - min_val)
-
 def calculate_performance_score(benchmark_data):
-    """Calculate Performance Score: PerfScore = 120 - (AvgRank × 20)"""
+    """Calculate Performance Score (scores profile of scoring.json)"""
     
     # Get all architectures
     architectures = list(benchmark_data.keys())
@@ -250,8 +86,7 @@ def calculate_performance_score(benchmark_data):
         
         if len(ranks) > 0:
             avg_rank = np.mean(ranks)
-            perf_score = 120 - (avg_rank * 20)
-            perf_score = max(20, min(100, perf_score))  # Clamp to [20, 100]
+            perf_score = SCORING.score("performance", {"avg_rank": avg_rank})
             
             perf_scores[arch_name] = {
                 "avg_rank": float(avg_rank),
@@ -263,103 +98,42 @@ def calculate_performance_score(benchmark_data):
 
 def calculate_memory_score(memory_data):
     """Calculate Memory Efficiency Score"""
-    
-    architectures = list(memory_data.keys())
-    
-    # Get all values for normalization
-    all_initial = [memory_data[arch]["initial"] for arch in architectures]
-    all_peak = [memory_data[arch]["peak"] for arch in architectures]
-    all_growth = [memory_data[arch]["growth"] for arch in architectures]
+    table = SCORING.score_table("memory", memory_data)
     
     mem_scores = {}
-    normalized_data = {}
-    
-    for arch_name in architectures:
-        mem = memory_data[arch_name]
-        
-        # Normalize (inverse: lower = better)
-        i_norm = normalize_inverse(mem["initial"], all_initial)
-        p_norm = normalize_inverse(mem["peak"], all_peak)
-        g_norm = normalize_inverse(mem["growth"], all_growth)
-        
-        # Calculate score
-        mem_score = 100 * (i_norm + p_norm + g_norm) / 3
-        
-        normalized_data[arch_name] = {
-            "i_norm": float(i_norm),
-            "p_norm": float(p_norm),
-            "g_norm": float(g_norm)
-        }
-        
+    for arch_name, mem in memory_data.items():
         mem_scores[arch_name] = {
-            "score": float(mem_score),
+            "score": table["scores"][arch_name],
             "raw": {
                 "initial": mem["initial"],
                 "peak": mem["peak"],
                 "growth": mem["growth"]
             },
-            "normalized": normalized_data[arch_name]
+            "normalized": table["normalized"][arch_name]
         }
     
     return mem_scores
 
 def calculate_code_quality_score(code_data):
     """Calculate Code Quality Score"""
-    
-    architectures = [arch for arch in code_data.keys()]
-    
-    # Calculate Debt Density for each architecture
-    debt_densities = {}
-    for arch_name in architectures:
-        code = code_data[arch_name]
-        debt_density = code["debt_hours"] / (code["sloc"] / 1000)
-        debt_densities[arch_name] = debt_density
-    
-    # Get all values for normalization
-    all_dd = list(debt_densities.values())
-    all_cog = [code_data[arch]["avg_cog"] for arch in architectures]
-    all_cyc = [code_data[arch]["avg_cyc"] for arch in architectures]
+    table = SCORING.score_table("code_quality", code_data)
     
     code_scores = {}
-    
-    for arch_name in architectures:
-        code = code_data[arch_name]
-        dd = debt_densities[arch_name]
-        
-        # Normalize (inverse: lower = better)
-        dd_norm = normalize_inverse(dd, all_dd)
-        cog_norm = normalize_inverse(code["avg_cog"], all_cog)
-        cyc_norm = normalize_inverse(code["avg_cyc"], all_cyc)
-        
-        # Hotspot penalty
-        hotspot = max(0, 1 - code["max_cyc"] / 20)
-        
-        # Calculate score
-        code_score = 100 * (dd_norm + cog_norm + cyc_norm + hotspot) / 4
-        
+    for arch_name, code in code_data.items():
         code_scores[arch_name] = {
-            "score": float(code_score),
-            "debt_density": float(dd),
-            "dd_norm": float(dd_norm),
-            "cog_norm": float(cog_norm),
-            "cyc_norm": float(cyc_norm),
-            "hotspot": float(hotspot)
+            "score": table["scores"][arch_name],
+            "debt_density": float(code["debt_hours"] / (code["sloc"] / 1000)),
+            **table["normalized"][arch_name]
         }
     
     return code_scores
 
 def calculate_overall_score(perf_score, code_score, mem_score):
-    """Calculate Overall Score"""
-    if code_score is None:
-        # If no code quality score, use only perf and memory with adjusted weights
-        # Overall = (Perf+1)^0.50 × (Mem+1)^0.50
-        return (perf_score + 1) ** 0.50 * (mem_score + 1) ** 0.50
-    else:
-        # Normal formula
-        return (perf_score + 1) ** 0.40 * (code_score + 1) ** 0.35 * (mem_score + 1) ** 0.25
+    """Overall = (Perf+1)^0.40 × (Code+1)^0.35 × (Mem+1)^0.25, (Perf+1)^0.50 × (Mem+1)^0.50 without code"""
+    return float(SCORING.overall({"performance": perf_score, "code_quality": code_score, "memory": mem_score}))
 
 # ============ MAIN ============
-def main():
+def main(data_dir=DATA_DIR, arch_mapping=ARCH_MAPPING, dataset=None):
     print("=" * 80)
     print("ANDROID ARCHITECTURE SCORING CALCULATOR (WITH HYBRID)")
     print("=" * 80)
@@ -367,13 +141,14 @@ def main():
     
     # Load data
     print("Loading benchmark data...")
-    benchmark_data = load_benchmark_data()
+    dataset = dataset.select(arch_mapping) if dataset is not None else load_dataset(data_dir, arch_mapping)
+    benchmark_data = load_benchmark_data(dataset)
     
     print("Loading memory data...")
-    memory_data = load_memory_data()
+    memory_data = load_memory_data(dataset)
     
     print("Loading code quality data...")
-    code_data = load_code_quality_data()
+    code_data = {arch: code for arch, code in load_code_quality_data(dataset).items() if code is not None}
     
     print(f"\nArchitectures loaded: {sorted(benchmark_data.keys())}")
     print(f"Memory data for: {sorted(memory_data.keys())}")
@@ -411,7 +186,7 @@ def main():
         print(f"{perf_scores[arch]['avg_rank']:>15.2f}", end="")
     print()
     
-    print("\nPerformance Scores (PerfScore = 120 - AvgRank × 20):")
+    print(f"\nPerformance Scores ({SCORING.formula('performance')}):")
     for arch in sorted(perf_scores.items(), key=lambda x: x[1]['score'], reverse=True):
         print(f"  {arch[0]:<25} {arch[1]['score']:>6.2f} (Avg Rank: {arch[1]['avg_rank']:.2f})")
     
@@ -421,7 +196,7 @@ def main():
     print("=" * 80)
     mem_scores = calculate_memory_score(memory_data)
     
-    print("\nMemory Scores (MemScore = 100 × (I_norm + P_norm + G_norm) / 3):")
+    print(f"\nMemory Scores ({SCORING.formula('memory')}):")
     print("\nArchitecture".ljust(25), "Initial".rjust(10), "Peak".rjust(10), "Growth".rjust(10), "Score".rjust(10))
     print("-" * 65)
     for arch in sorted(mem_scores.items(), key=lambda x: x[1]['score'], reverse=True):
@@ -435,15 +210,18 @@ def main():
     print("=" * 80)
     code_scores = calculate_code_quality_score(code_data)
     
-    print("\nCode Quality Scores (CodeQuality = 100 × (DD_norm + Cog_norm + Cyc_norm + Hotspot) / 4):")
+    print(f"\nCode Quality Scores ({SCORING.formula('code_quality')}):")
     print("\nArchitecture".ljust(25), "DebtDensity".rjust(12), "Score".rjust(10))
     print("-" * 47)
     for arch in sorted(code_scores.items(), key=lambda x: x[1]['score'], reverse=True):
         code = arch[1]
         print(f"{arch[0]:<25} {code['debt_density']:>12.4f} {code['score']:>10.2f}")
     
-    if "Hybrid" not in code_scores:
-        print(f"\n  {'Hybrid':<25} {'N/A (No static analysis)':>32}")
+    for arch_name in sorted(set(perf_scores) - set(code_scores)):
+        print(f"\n  {arch_name:<25} {'N/A (No code metrics)':>32}")
+    for arch_name, code in code_data.items():
+        if code["source"] != "staticCodeAnalysis":
+            print(f"  {arch_name}: {code['source']}")
     
     # Calculate Overall Scores
     print("\n" + "=" * 80)
@@ -459,7 +237,7 @@ def main():
         overall = calculate_overall_score(perf, code, mem)
         overall_scores[arch_name] = overall
     
-    print("\nOverall Scores (Overall = (Perf+1)^0.40 × (Code+1)^0.35 × (Mem+1)^0.25):")
+    print(f"\nOverall Scores ({SCORING.overall_formula}):")
     print("\nArchitecture".ljust(25), "Perf".rjust(10), "Memory".rjust(10), "Code".rjust(10), "Overall".rjust(10))
     print("-" * 65)
     
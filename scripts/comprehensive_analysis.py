@@ -15,6 +15,13 @@ from itertools import combinations
 from datetime import datetime
 from collections import defaultdict
 
+from archbench.code_metrics import load_code_quality_data
+from archbench.effect_size import cliffs_delta_matrix, interpret_delta
+from archbench.loader import load_dataset
+from archbench.memory import load_memory_data
+from archbench.quantiles import calculate_descriptive_stats
+from archbench.scoring import load_scoring
+
 # ============ KONFIGÜRASYON ============
 ARCH_MAPPING = {
     "classicmvvm": "Classic MVVM",
@@ -33,138 +40,18 @@ ALL_TESTS = [
     "cartQuantityUpdatePerformance", "categoryFilterPerformance"
 ]
 
-HIGHER_IS_BETTER = {
-    "startupCold": False,
-    "startupWarm": False,
-    "productListScrollAndPagination": True,
-    "productListRapidScrolling": True,
-    "productListCategoryFiltering": True,
-    "cartQuantityUpdatesWithDynamicSetup": True,
-    "cartCheckoutFlow": True,
-    "chatListRealtimeUpdates": True,
-    "chatDetailMessageStreamAndSending": True,
-    "chatRapidSwitching": True,
-    "continuousScrollJankTest": True,
-    "flingJankTest": True,
-    "rapidDirectionChangeJankTest": True,
-    "cartQuantityUpdatePerformance": True,
-    "categoryFilterPerformance": True
-}
+SCORING = load_scoring("5arch")
+HIGHER_IS_BETTER = SCORING.higher_is_better
 
 DATA_DIR = "rawdata/performance"
 OUTPUT_FILE = "analysis_result/comprehensive_analysis.json"
 
 # ============ VERİ YÜKLEME ============
-def get_metric_name(test_name):
-    """Determine metric name for a test"""
-    if test_name in ["startupCold", "startupWarm"]:
-        return "timeToInitialDisplayMs"
-    else:
-        return "frameCount"
-
-def get_runs_from_benchmark(benchmark, metric_name):
-    """Extract runs data from benchmark"""
-    # First try: metrics.[metricName].runs
-    if "metrics" in benchmark and metric_name in benchmark["metrics"]:
-        if "runs" in benchmark["metrics"][metric_name]:
-            return benchmark["metrics"][metric_name]["runs"]
-    
-    return None
-
-def load_benchmark_data():
-    """Load all benchmark data from JSON files"""
-    data = {}
-    
-    # Find all result JSON files
-    json_files = {
-        "classicmvvm": "classicmvvm_result.json",
-        "mvc": "mvc_result.json",
-        "mvi": "mvi_result.json",
-        "mvp": "mvp_result.json",
-        "singlestatemvvm": "singlestatemvvm_result.json"
-    }
-    
-    for arch_key, filename in json_files.items():
-        filepath = os.path.join(DATA_DIR, filename)
-        if not os.path.exists(filepath):
-            print(f"Warning: {filename} not found, skipping {arch_key}")
-            continue
-        
-        with open(filepath, 'r') as f:
-            arch_data = json.load(f)
-        
-        arch_name = ARCH_MAPPING[arch_key]
-        data[arch_name] = {}
-        
-        if "benchmarks" not in arch_data:
-            print(f"Warning: No 'benchmarks' in {filename}")
-            continue
-        
-        for benchmark in arch_data["benchmarks"]:
-            test_name = benchmark.get("name")
-            if test_name not in ALL_TESTS:
-                continue
-            
-            metric_name = get_metric_name(test_name)
-            runs = get_runs_from_benchmark(benchmark, metric_name)
-            
-            if runs is None or len(runs) == 0:
-                continue
-            
-            data[arch_name][test_name] = runs
-    
-    return data
-
-def load_memory_data():
-    """Load memory data from JSON files"""
-    # Memory data is in the same JSON files, in a "memory" section or similar
-    # For now, using hardcoded values from user's specification
-    memory_data = {
-        "Classic MVVM": {"initial": 30.40, "peak": 38.42, "growth": 0.55},
-        "MVC": {"initial": 30.34, "peak": 37.71, "growth": 0.48},
-        "MVI": {"initial": 29.57, "peak": 38.42, "growth": 1.09},
-        "MVP": {"initial": 30.00, "peak": 38.00, "growth": 1.00},
-        "Single-State MVVM": {"initial": 33.28, "peak": 40.87, "growth": 0.37}
-    }
-    return memory_data
-
-def load_code_quality_data():
-    """Load code quality data"""
-    # Using hardcoded values from user's specification
-    code_data = {
-        "Classic MVVM": {"sloc": 2459, "debt_hours": 2.9, "avg_cog": 2.61, "avg_cyc": 1.95, "max_cyc": 9},
-        "MVC": {"sloc": 2715, "debt_hours": 1.7, "avg_cog": 1.83, "avg_cyc": 1.75, "max_cyc": 9},
-        "MVI": {"sloc": 2510, "debt_hours": 2.0, "avg_cog": 2.60, "avg_cyc": 2.38, "max_cyc": 9},
-        "MVP": {"sloc": 3001, "debt_hours": 4.6, "avg_cog": 1.50, "avg_cyc": 1.61, "max_cyc": 10},
-        "Single-State MVVM": {"sloc": 2442, "debt_hours": 2.0, "avg_cog": 2.50, "avg_cyc": 2.02, "max_cyc": 14}
-    }
-    return code_data
+def load_benchmark_data(dataset):
+    """Extract per-test runs for all architectures"""
+    return dataset.benchmark_runs(ALL_TESTS)
 
 # ============ İSTATİSTİKSEL ANALİZ ============
-def calculate_descriptive_stats(values):
-    """Calculate descriptive statistics"""
-    if len(values) == 0:
-        return {"mean": 0, "median": 0, "std": 0, "cv_percent": 0, "min": 0, "max": 0, "n": 0}
-    
-    values_arr = np.array(values)
-    mean_val = np.mean(values_arr)
-    median_val = np.median(values_arr)
-    std_val = np.std(values_arr, ddof=1) if len(values) > 1 else 0.0
-    cv_percent = (std_val / mean_val * 100) if mean_val != 0 else 0.0
-    min_val = np.min(values_arr)
-    max_val = np.max(values_arr)
-    n = len(values_arr)
-    
-    return {
-        "mean": float(mean_val),
-        "median": float(median_val),
-        "std": float(std_val),
-        "cv_percent": float(cv_percent),
-        "min": float(min_val),
-        "max": float(max_val),
-        "n": int(n)
-    }
-
 def friedman_test(all_runs):
     """Perform Friedman test"""
     # Ensure equal sample sizes
@@ -211,39 +98,16 @@ def nemenyi_test(all_runs, arch_names):
     except Exception as e:
         return {}
 
-def cliffs_delta(x, y):
-    """Calculate Cliff's Delta effect size"""
-    n_x, n_y = len(x), len(y)
-    dominance = 0
-    for xi in x:
-        for yj in y:
-            if xi > yj:
-                dominance += 1
-            elif xi < yj:
-                dominance -= 1
-    return dominance / (n_x * n_y)
-
-def interpret_delta(delta):
-    """Interpret Cliff's Delta"""
-    abs_d = abs(delta)
-    if abs_d < 0.147:
-        return "negligible"
-    elif abs_d < 0.33:
-        return "small"
-    elif abs_d < 0.474:
-        return "medium"
-    else:
-        return "large"
-
 def calculate_cliffs_delta_all(all_runs, arch_names):
     """Calculate Cliff's Delta for all pairs"""
     result = {}
+    deltas = cliffs_delta_matrix(all_runs)
     for i, arch1 in enumerate(arch_names):
         for j, arch2 in enumerate(arch_names):
             if i >= j:
                 continue
             pair_name = f"{arch1} vs {arch2}"
-            delta = cliffs_delta(all_runs[i], all_runs[j])
+            delta = deltas[i, j]
             result[pair_name] = {
                 "delta": float(delta),
                 "effect": interpret_delta(delta)
@@ -263,48 +127,11 @@ def calculate_ranking(medians, higher_is_better):
 
 # ============ SKOR HESAPLAMA ============
 def calculate_performance_score(avg_rank):
-    """S_perf = 120 - (Rank_avg × 20)"""
-    return 120 - (avg_rank * 20)
-
-def normalize_inverse(value, all_values):
-    """Inverse normalization (lower value = higher score)"""
-    min_val, max_val = min(all_values), max(all_values)
-    if max_val == min_val:
-        return 1.0
-    return (max_val - value) / (max_val - min_val)
-
-def calculate_memory_score(arch_data, all_data):
-    """S_mem = ((I_norm + P_norm + G_norm) / 3) × 100"""
-    all_initial = [d["initial"] for d in all_data.values()]
-    all_peak = [d["peak"] for d in all_data.values()]
-    all_growth = [d["growth"] for d in all_data.values()]
-    
-    i_norm = normalize_inverse(arch_data["initial"], all_initial)
-    p_norm = normalize_inverse(arch_data["peak"], all_peak)
-    g_norm = normalize_inverse(arch_data["growth"], all_growth)
-    
-    return ((i_norm + p_norm + g_norm) / 3) * 100
-
-def calculate_code_quality_score(arch_data, all_data):
-    """S_code = ((DD_norm + Cog_norm + Cyc_norm + Hotspot) / 4) × 100"""
-    # Debt Density
-    dd = arch_data["debt_hours"] / (arch_data["sloc"] / 1000)
-    all_dd = [d["debt_hours"] / (d["sloc"] / 1000) for d in all_data.values()]
-    
-    all_cog = [d["avg_cog"] for d in all_data.values()]
-    all_cyc = [d["avg_cyc"] for d in all_data.values()]
-    
-    dd_norm = normalize_inverse(dd, all_dd)
-    cog_norm = normalize_inverse(arch_data["avg_cog"], all_cog)
-    cyc_norm = normalize_inverse(arch_data["avg_cyc"], all_cyc)
-    
-    # Hotspot penalty
-    hotspot = max(0, 1 - (arch_data["max_cyc"] / 20))
-    
-    return ((dd_norm + cog_norm + cyc_norm + hotspot) / 4) * 100
+    """S_perf from the 5arch profile of scoring.json"""
+    return SCORING.score("performance", {"avg_rank": avg_rank})
 
 # ============ ANA FONKSİYON ============
-def main():
+def main(data_dir=DATA_DIR, output_file=OUTPUT_FILE, arch_mapping=ARCH_MAPPING, dataset=None):
     """Main execution"""
     print("="*80)
     print("ANDROID ARCHITECTURE BENCHMARK - COMPREHENSIVE ANALYSIS")
@@ -313,13 +140,14 @@ def main():
     
     # Load data
     print("Loading data...")
-    benchmark_data = load_benchmark_data()
-    memory_data = load_memory_data()
-    code_data = load_code_quality_data()
+    dataset = dataset.select(arch_mapping) if dataset is not None else load_dataset(data_dir, arch_mapping)
+    benchmark_data = load_benchmark_data(dataset)
+    memory_data = load_memory_data(dataset)
+    code_data = load_code_quality_data(dataset)
     
     # Check data completeness
     print("\nDATA LOADED:")
-    for arch_name in ARCH_MAPPING.values():
+    for arch_name in arch_mapping.values():
         if arch_name in benchmark_data:
             tests_found = len(benchmark_data[arch_name])
             print(f"✓ {arch_name}: {tests_found}/15 tests")
@@ -331,8 +159,8 @@ def main():
         "metadata": {
             "analysis_date": datetime.now().strftime("%Y-%m-%d"),
             "total_tests": len(ALL_TESTS),
-            "architectures": sorted(list(set(ARCH_MAPPING.values()))),
-            "data_source": f"{DATA_DIR}/*.json",
+            "architectures": sorted(list(set(arch_mapping.values()))),
+            "data_source": f"{data_dir}/*.json",
             "statistical_methods": {
                 "friedman": "Nonparametric test for comparing 5+ related groups",
                 "nemenyi": "Post-hoc pairwise comparison after significant Friedman",
@@ -345,9 +173,9 @@ def main():
             "average_ranks": {}
         },
         "scores": {
-            "performance": {"formula": "S_perf = 120 - (Avg_Rank × 20)", "scores": {}, "ranking": []},
-            "memory": {"formula": "S_mem = ((I_norm + P_norm + G_norm) / 3) × 100", "raw_data": {}, "normalized": {}, "scores": {}, "ranking": []},
-            "code_quality": {"formula": "S_code = ((DD_norm + Cog_norm + Cyc_norm + Hotspot) / 4) × 100", "raw_data": {}, "normalized": {}, "scores": {}, "ranking": []}
+            "performance": {"formula": SCORING.formula("performance"), "scores": {}, "ranking": []},
+            "memory": {"formula": SCORING.formula("memory"), "raw_data": {}, "normalized": {}, "scores": {}, "ranking": []},
+            "code_quality": {"formula": SCORING.formula("code_quality"), "raw_data": {}, "normalized": {}, "scores": {}, "ranking": []}
         },
         "summary": {
             "dimension_leaders": {},
@@ -372,7 +200,7 @@ def main():
         test_medians = {}
         test_descriptive = {}
         
-        for arch_name in ARCH_MAPPING.values():
+        for arch_name in arch_mapping.values():
             if arch_name in benchmark_data and test_name in benchmark_data[arch_name]:
                 runs = benchmark_data[arch_name][test_name]
                 test_runs[arch_name] = runs
@@ -418,7 +246,7 @@ def main():
     
     # Calculate average ranks
     print("Calculating average ranks...")
-    for arch_name in ARCH_MAPPING.values():
+    for arch_name in arch_mapping.values():
         if arch_name in all_ranks:
             avg_rank = np.mean(all_ranks[arch_name])
             results["rankings"]["average_ranks"][arch_name] = float(avg_rank)
@@ -438,55 +266,33 @@ def main():
     
     # Memory scores
     print("Calculating memory scores...")
+    memory_table = SCORING.score_table("memory", memory_data)
     for arch_name, mem_data in memory_data.items():
         results["scores"]["memory"]["raw_data"][arch_name] = {
             "initial_mb": mem_data["initial"],
             "peak_mb": mem_data["peak"],
             "growth_mb": mem_data["growth"]
         }
-        
-        all_initial = [d["initial"] for d in memory_data.values()]
-        all_peak = [d["peak"] for d in memory_data.values()]
-        all_growth = [d["growth"] for d in memory_data.values()]
-        
-        results["scores"]["memory"]["normalized"][arch_name] = {
-            "i_norm": float(normalize_inverse(mem_data["initial"], all_initial)),
-            "p_norm": float(normalize_inverse(mem_data["peak"], all_peak)),
-            "g_norm": float(normalize_inverse(mem_data["growth"], all_growth))
-        }
-        
-        score = calculate_memory_score(mem_data, memory_data)
-        results["scores"]["memory"]["scores"][arch_name] = float(score)
+        results["scores"]["memory"]["normalized"][arch_name] = memory_table["normalized"][arch_name]
+        results["scores"]["memory"]["scores"][arch_name] = memory_table["scores"][arch_name]
     
     results["scores"]["memory"]["ranking"] = sorted(results["scores"]["memory"]["scores"].items(), key=lambda x: x[1], reverse=True)
     results["scores"]["memory"]["ranking"] = [arch for arch, _ in results["scores"]["memory"]["ranking"]]
     
     # Code quality scores
     print("Calculating code quality scores...")
+    code_table = SCORING.score_table("code_quality", code_data)
     for arch_name, code_data_arch in code_data.items():
-        dd = code_data_arch["debt_hours"] / (code_data_arch["sloc"] / 1000)
-        all_dd = [d["debt_hours"] / (d["sloc"] / 1000) for d in code_data.values()]
-        all_cog = [d["avg_cog"] for d in code_data.values()]
-        all_cyc = [d["avg_cyc"] for d in code_data.values()]
-        
         results["scores"]["code_quality"]["raw_data"][arch_name] = {
             "sloc": code_data_arch["sloc"],
             "debt_hours": code_data_arch["debt_hours"],
-            "debt_density": float(dd),
+            "debt_density": float(code_data_arch["debt_hours"] / (code_data_arch["sloc"] / 1000)),
             "avg_cog": code_data_arch["avg_cog"],
             "avg_cyc": code_data_arch["avg_cyc"],
             "max_cyc": code_data_arch["max_cyc"]
         }
-        
-        results["scores"]["code_quality"]["normalized"][arch_name] = {
-            "dd_norm": float(normalize_inverse(dd, all_dd)),
-            "cog_norm": float(normalize_inverse(code_data_arch["avg_cog"], all_cog)),
-            "cyc_norm": float(normalize_inverse(code_data_arch["avg_cyc"], all_cyc)),
-            "hotspot": float(max(0, 1 - (code_data_arch["max_cyc"] / 20)))
-        }
-        
-        score = calculate_code_quality_score(code_data_arch, code_data)
-        results["scores"]["code_quality"]["scores"][arch_name] = float(score)
+        results["scores"]["code_quality"]["normalized"][arch_name] = code_table["normalized"][arch_name]
+        results["scores"]["code_quality"]["scores"][arch_name] = code_table["scores"][arch_name]
     
     results["scores"]["code_quality"]["ranking"] = sorted(results["scores"]["code_quality"]["scores"].items(), key=lambda x: x[1], reverse=True)
     results["scores"]["code_quality"]["ranking"] = [arch for arch, _ in results["scores"]["code_quality"]["ranking"]]
@@ -522,7 +328,7 @@ def main():
     }
     
     # Validation
-    for arch_name in ARCH_MAPPING.values():
+    for arch_name in arch_mapping.values():
         if arch_name in benchmark_data:
             tests_found = list(benchmark_data[arch_name].keys())
             missing = [t for t in ALL_TESTS if t not in tests_found]
@@ -532,9 +338,9 @@ def main():
             }
     
     # Save JSON
-    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-    print(f"\nSaving results to: {OUTPUT_FILE}")
-    with open(OUTPUT_FILE, 'w') as f:
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    print(f"\nSaving results to: {output_file}")
+    with open(output_file, 'w') as f:
         json.dump(results, f, indent=2)
     
     # Print summary
@@ -546,7 +352,7 @@ def main():
     print(f"Total significant pairwise (Nemenyi): {sig_nemenyi}/{total_nemenyi}")
     print(f"Large effect sizes (Cliff's δ ≥ 0.474): {total_large_effects}/150")
     
-    print("\nPERFORMANCE SCORES (S_perf = 120 - Avg_Rank × 20):")
+    print(f"\nPERFORMANCE SCORES ({SCORING.formula('performance')}):")
     print()
     for arch_name, data in sorted(perf_scores.items(), key=lambda x: x[1]["score"], reverse=True):
         print(f"{arch_name:<20} {data['score']:>6.2f} (Avg Rank: {data['avg_rank']:.2f})")
@@ -568,7 +374,7 @@ def main():
     
     print("\n" + "="*80)
     print("✓ Analysis complete!")
-    print(f"✓ Results saved to: {OUTPUT_FILE}")
+    print(f"✓ Results saved to: {output_file}")
     print("="*80)
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Comprehensive Statistical Analysis and Score Calculation
 for Android Architecture Benchmarks (6 Architectures - Including HYBRID)
 """
 
+import argparse
 import json
 import os
 import numpy as np
@@ -15,299 +16,235 @@ from itertools import combinations
 from datetime import datetime
 from collections import defaultdict
 
-# ============ KONFIGÜRASYON ============
-ARCH_MAPPING = {
-    "classicmvvm": "Classic MVVM",
-    "mvc": "MVC",
-    "mvi": "MVI",
-    "mvp": "MVP",
-    "singlestatemvvm": "Single-State MVVM",
-    "hybrid": "HYBRID"
-}
-
-ALL_TESTS = [
-    "startupCold", "startupWarm",
-    "productListScrollAndPagination", "productListRapidScrolling", "productListCategoryFiltering",
-    "cartQuantityUpdatesWithDynamicSetup", "cartCheckoutFlow",
-    "chatListRealtimeUpdates", "chatDetailMessageStreamAndSending", "chatRapidSwitching",
-    "continuousScrollJankTest", "flingJankTest", "rapidDirectionChangeJankTest",
-    "cartQuantityUpdatePerformance", "categoryFilterPerformance"
-]
-
-HIGHER_IS_BETTER = {
-    "startupCold": False,
-    "startupWarm": False,
-    "productListScrollAndPagination": True,
-    "productListRapidScrolling": True,
-    "productListCategoryFiltering": True,
-    "cartQuantityUpdatesWithDynamicSetup": True,
-    "cartCheckoutFlow": True,
-    "chatListRealtimeUpdates": True,
-    "chatDetailMessageStreamAndSending": True,
-    "chatRapidSwitching": True,
-    "continuousScrollJankTest": True,
-    "flingJankTest": True,
-    "rapidDirectionChangeJankTest": True,
-    "cartQuantityUpdatePerformance": True,
-    "categoryFilterPerformance": True
-}
+from archbench.benchmarks import ALL_TESTS, ARCH_MAPPING, HIGHER_IS_BETTER, SCORING
+from archbench.bootstrap import (DEFAULT_RESAMPLES, DEFAULT_SEED, average_ranks, bootstrap_medians,
+                                 confidence_interval, rank1_probability)
+from archbench.code_metrics import load_code_quality_data
+from archbench.covariates import performance_adjustment
+from archbench.effect_size import cliffs_delta_batch, interpret_delta
+from archbench.frames import FRAME_BUDGET_MS, analyze_frame_timing
+from archbench.incremental import CACHE_DIR, ResultCache, fingerprint
+from archbench.loader import load_dataset
+from archbench.memory import load_memory_profiles, memory_summary
+from archbench.memory_timeline import load_timelines, memory_timeline_analysis
+from archbench.parallel import parallel_map, resolve_jobs
+from archbench.permutation import DEFAULT_PERMUTATIONS, permutation_test_pairs
+from archbench.quantiles import calculate_descriptive_stats
+from archbench.scoring import DEFAULT_SWEEP, weight_sensitivity
 
+# ============ KONFIGÜRASYON ============
 DATA_DIR = "rawdata/performance"
 OUTPUT_FILE = "analysis_result/comprehensive_analysis_6arch.json"
+ANALYSIS_CACHE_FILE = os.path.join(CACHE_DIR, "comprehensive_analysis_6arch.json")
 
 # ============ VERİ YÜKLEME ============
-def get_metric_name(test_name):
-    """Determine metric name for a test"""
-    if test_name in ["startupCold", "startupWarm"]:
-        return "timeToInitialDisplayMs"
-    else:
-        return "frameCount"
+def load_benchmark_data(dataset):
+    """Extract per-test runs for all architectures"""
+    return dataset.benchmark_runs(ALL_TESTS)
 
-def get_runs_from_benchmark(benchmark, metric_name):
-    """Extract runs data from benchmark"""
-    # First try: metrics.[metricName].runs
-    if "metrics" in benchmark and metric_name in benchmark["metrics"]:
-        if "runs" in benchmark["metrics"][metric_name]:
-            return benchmark["metrics"][metric_name]["runs"]
-    
-    # Could also check runs_detail here if needed
-    # For now, we rely on metrics.runs
-    
-    return None
+# ============ SCORE HESAPLAMA ============
+def calculate_performance_score(avg_rank):
+    """Performance score(s) for average rank(s) (scoring.json, 6arch profile)"""
+    return SCORING.score("performance", {"avg_rank": avg_rank})
 
-def load_benchmark_data():
-    """Load all benchmark data from JSON files"""
-    data = {}
-    
-    json_files = {
-        "classicmvvm": "classicmvvm_result.json",
-        "mvc": "mvc_result.json",
-        "mvi": "mvi_result.json",
-        "mvp": "mvp_result.json",
-        "singlestatemvvm": "singlestatemvvm_result.json",
-        "hybrid": "hybrid_result.json"
-    }
-    
-    for arch_key, filename in json_files.items():
-        filepath = os.path.join(DATA_DIR, filename)
-        if not os.path.exists(filepath):
-            print(f"Warning: {filename} not found, skipping {arch_key}")
-            continue
-        
-        with open(filepath, 'r') as f:
-            arch_data = json.load(f)
-        
-        arch_name = ARCH_MAPPING[arch_key]
-        data[arch_name] = {}
-        
-        if "benchmarks" not in arch_data:
-            print(f"Warning: No 'benchmarks' in {filename}")
+def calculate_overall_score(perf_score, code_score, mem_score):
+    """Calculate Overall Score (scalars or bootstrap arrays)"""
+    return SCORING.overall({"performance": perf_score, "code_quality": code_score, "memory": mem_score})
+
+def bootstrap_uncertainty(benchmark_data, architectures, tests, memory_scores, code_scores,
+                          n_resamples, seed, jobs):
+    """Bootstrap CIs and P(rank 1) for average ranks, performance and overall scores"""
+    test_runs = {test: {arch: benchmark_data[arch][test] for arch in architectures if test in benchmark_data[arch]}
+                 for test in tests}
+    directions = [HIGHER_IS_BETTER[test] for test in tests]
+    
+    # Point estimates and replicates share the same ranking kernel
+    point_medians = np.array([[np.median(test_runs[t][a]) if a in test_runs[t] else np.nan for a in architectures]
+                              for t in tests])
+    point_ranks = average_ranks(point_medians, directions)
+    boot_ranks = average_ranks(bootstrap_medians(test_runs, architectures, tests, n_resamples, seed, jobs), directions)
+    
+    point_perf = calculate_performance_score(point_ranks)
+    boot_perf = calculate_performance_score(boot_ranks)
+    
+    point_overall = np.full(len(architectures), np.nan)
+    boot_overall = np.full(boot_perf.shape, np.nan)
+    for i, arch in enumerate(architectures):
+        if arch not in memory_scores:
             continue
-        
-        for benchmark in arch_data["benchmarks"]:
-            test_name = benchmark.get("name")
-            if test_name not in ALL_TESTS:
-                continue
-            
-            metric_name = get_metric_name(test_name)
-            runs = get_runs_from_benchmark(benchmark, metric_name)
-            
-            if runs is None or len(runs) == 0:
-                continue
-            
-            data[arch_name][test_name] = runs
+        code = code_scores.get(arch)
+        code = code if isinstance(code, (int, float)) else None
+        point_overall[i] = calculate_overall_score(point_perf[i], code, memory_scores[arch])
+        boot_overall[:, i] = calculate_overall_score(boot_perf[:, i], code, memory_scores[arch])
+    
+    p_rank1_perf = rank1_probability(boot_perf)
+    p_rank1_overall = rank1_probability(boot_overall)
+    
+    per_arch = {}
+    for i, arch in enumerate(architectures):
+        per_arch[arch] = {
+            "avg_rank": confidence_interval(point_ranks[i], boot_ranks[:, i]),
+            "performance_score": confidence_interval(point_perf[i], boot_perf[:, i]),
+            "memory_score": confidence_interval(memory_scores[arch], np.full(1, memory_scores[arch])) if arch in memory_scores else None,
+            "overall_score": confidence_interval(point_overall[i], boot_overall[:, i]) if arch in memory_scores else None,
+            "p_rank1_performance": float(p_rank1_perf[i]),
+            "p_rank1_overall": float(p_rank1_overall[i]) if arch in memory_scores else None
+        }
     
-    return data
+    return {
+        "method": "Percentile bootstrap: iterations resampled with replacement per test and architecture, medians re-ranked per resample",
+        "n_resamples": n_resamples,
+        "seed": seed,
+        "confidence": 0.95,
+        "overall_formula": f"{SCORING.overall_formula}; (Perf+1)^0.50 × (Mem+1)^0.50 without code data",
+        "memory_note": "Memory has a single snapshot series per architecture, so S_mem is not resampled",
+        "architectures": per_arch
+    }
 
-def parse_memory_from_json(filepath):
-    """Parse memory data from JSON file"""
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    
-    if "memoryBenchmarkResult" in data and len(data["memoryBenchmarkResult"]) > 0:
-        totalpss_row = None
-        for row in data["memoryBenchmarkResult"]:
-            if row.get("Label") == "TotalPSS_MB":
-                totalpss_row = row
-                break
+# ============ TEST ANALİZİ ============
+def analyze_test(test_name, test_runs, architectures, n_permutations=DEFAULT_PERMUTATIONS, seed=DEFAULT_SEED,
+                 cached_permutations=None):
+    """Friedman, Nemenyi, Cliff's Delta and ranking for one test (runs in a worker process)"""
+    warnings = []
+    counts = {"friedman_sig": 0, "friedman_nonsig": 0, "sig_nemenyi": 0, "total_nemenyi": 0, "large_effects": 0,
+              "sig_permutation": 0, "total_permutation": 0}
+    
+    if len(test_runs) < 2:
+        warnings.append(f"Not enough data for {test_name}")
+        return {"analysis": None, "counts": counts, "warnings": warnings}
+    
+    # Descriptive statistics
+    descriptive = {}
+    for arch_name, runs in test_runs.items():
+        descriptive[arch_name] = calculate_descriptive_stats(runs)
+    
+    # Friedman test (need balanced data)
+    all_runs_list = [test_runs[arch] for arch in architectures if arch in test_runs]
+    if len(all_runs_list) < 3:
+        friedman_result = {"chi_squared": None, "df": None, "p_value": None, "significant": False}
+        nemenyi_result = {}
+    else:
+        # Balance data (truncate to minimum length)
+        min_len = min(len(runs) for runs in all_runs_list)
+        balanced = [runs[:min_len] for runs in all_runs_list]
         
-        if totalpss_row:
-            initial = totalpss_row.get("01_AppLaunch")
-            if initial is None:
-                return None
-            
-            peak = initial
-            for key, value in totalpss_row.items():
-                if key.startswith(("0", "1")) and isinstance(value, (int, float)) and value > peak:
-                    peak = value
-            
-            final = totalpss_row.get("10_Peak_AfterAllOperations") or totalpss_row.get("09_ChatDetail_AfterStream")
-            if final is None:
-                final = initial
+        # Transpose for Friedman (rows: iterations, columns: architectures)
+        matrix = np.array(balanced).T
+        
+        try:
+            stat, p_value = friedmanchisquare(*[matrix[:, i] for i in range(matrix.shape[1])])
+            friedman_result = {
+                "chi_squared": float(stat),
+                "df": len(all_runs_list) - 1,
+                "p_value": float(p_value),
+                "significant": p_value < 0.05
+            }
             
-            growth = final - initial
+            if friedman_result["significant"]:
+                counts["friedman_sig"] += 1
+            else:
+                counts["friedman_nonsig"] += 1
             
-            return {"initial": float(initial), "peak": float(peak), "growth": float(growth)}
-    
-    return None
-
-def load_memory_data():
-    """Load memory data from JSON files"""
-    memory_data = {}
-    
-    json_files = {
-        "classicmvvm": "classicmvvm_result.json",
-        "mvc": "mvc_result.json",
-        "mvi": "mvi_result.json",
-        "mvp": "mvp_result.json",
-        "singlestatemvvm": "singlestatemvvm_result.json",
-        "hybrid": "hybrid_result.json"
-    }
-    
-    # Known memory values (non-hybrid)
-    known_values = {
-        "Classic MVVM": {"initial": 30.40, "peak": 38.42, "growth": 0.55},
-        "MVC": {"initial": 30.34, "peak": 37.71, "growth": 0.48},
-        "MVI": {"initial": 29.57, "peak": 38.42, "growth": 1.09},
-        "MVP": {"initial": 30.00, "peak": 38.00, "growth": 1.00},
-        "Single-State MVVM": {"initial": 33.28, "peak": 40.87, "growth": 0.37}
-    }
+            # Nemenyi post-hoc (only if significant)
+            nemenyi_result = {}
+            if friedman_result["significant"]:
+                try:
+                    df = pd.DataFrame(matrix, columns=[arch for arch in architectures if arch in test_runs])
+                    nemenyi_matrix = sp.posthoc_nemenyi_friedman(df)
+                    
+                    for arch1, arch2 in combinations([arch for arch in architectures if arch in test_runs], 2):
+                        pair_key = f"{arch1} vs {arch2}"
+                        p_val = nemenyi_matrix.loc[arch1, arch2]
+                        significant = p_val < 0.05
+                        nemenyi_result[pair_key] = {"p_value": float(p_val), "significant": significant}
+                        
+                        counts["total_nemenyi"] += 1
+                        if significant:
+                            counts["sig_nemenyi"] += 1
+                except Exception as e:
+                    warnings.append(f"Nemenyi test failed for {test_name}: {e}")
+                    nemenyi_result = {}
+        except Exception as e:
+            warnings.append(f"Friedman test failed for {test_name}: {e}")
+            friedman_result = {"chi_squared": None, "df": None, "p_value": None, "significant": False}
+            nemenyi_result = {}
     
-    for arch_key, filename in json_files.items():
-        arch_name = ARCH_MAPPING[arch_key]
-        filepath = os.path.join(DATA_DIR, filename)
+    # Permutation tests (exact for small samples, Monte-Carlo otherwise)
+    permutation_result = {}
+    if n_permutations > 0:
+        pairs = permutation_test_pairs(test_name, test_runs, n_permutations, seed, cached_permutations)
+        for (arch1, arch2), perm in pairs.items():
+            if perm is None:
+                continue
+            permutation_result[f"{arch1} vs {arch2}"] = perm
+            counts["total_permutation"] += 1
+            if perm["significant"]:
+                counts["sig_permutation"] += 1
+    
+    # Cliff's Delta (all pairs, one vectorized batch)
+    pairwise_deltas = cliffs_delta_batch({test_name: test_runs})
+    cliffs_delta_result = {}
+    for arch1, arch2 in combinations([arch for arch in architectures if arch in test_runs], 2):
+        delta = pairwise_deltas[test_name][(arch1, arch2)]
+        effect = interpret_delta(delta)
+        pair_key = f"{arch1} vs {arch2}"
+        cliffs_delta_result[pair_key] = {"delta": float(delta), "effect": effect}
         
-        if arch_name in known_values:
-            memory_data[arch_name] = known_values[arch_name]
-        elif os.path.exists(filepath):
-            parsed = parse_memory_from_json(filepath)
-            if parsed:
-                memory_data[arch_name] = parsed
-            else:
-                print(f"Warning: Could not parse memory data for {arch_name}")
+        if effect == "large":
+            counts["large_effects"] += 1
     
-    return memory_data
-
-def load_code_quality_data():
-    """Load code quality data (HYBRID has no static analysis)"""
-    code_data = {
-        "Classic MVVM": {"sloc": 2459, "debt_hours": 2.9, "avg_cog": 2.61, "avg_cyc": 1.95, "max_cyc": 9},
-        "MVC": {"sloc": 2715, "debt_hours": 1.7, "avg_cog": 1.83, "avg_cyc": 1.75, "max_cyc": 9},
-        "MVI": {"sloc": 2510, "debt_hours": 2.0, "avg_cog": 2.60, "avg_cyc": 2.38, "max_cyc": 9},
-        "MVP": {"sloc": 3001, "debt_hours": 4.6, "avg_cog": 1.50, "avg_cyc": 1.61, "max_cyc": 10},
-        "Single-State MVVM": {"sloc": 2442, "debt_hours": 2.0, "avg_cog": 2.50, "avg_cyc": 2.02, "max_cyc": 14},
-        "HYBRID": None  # No static analysis data
-    }
-    return code_data
-
-# ============ İSTATİSTİKSEL ANALİZ ============
-def calculate_descriptive_stats(values):
-    """Calculate descriptive statistics"""
-    if len(values) == 0:
-        return {"mean": 0, "median": 0, "std": 0, "cv_percent": 0, "min": 0, "max": 0, "n": 0}
-    
-    values_arr = np.array(values)
-    mean_val = np.mean(values_arr)
-    median_val = np.median(values_arr)
-    std_val = np.std(values_arr, ddof=1) if len(values) > 1 else 0.0
-    cv_percent = (std_val / mean_val * 100) if mean_val != 0 else 0.0
-    min_val = np.min(values_arr)
-    max_val = np.max(values_arr)
-    n = len(values_arr)
+    # Ranking
+    higher_is_better = HIGHER_IS_BETTER[test_name]
+    medians = {}
+    for arch_name in architectures:
+        if arch_name in test_runs:
+            medians[arch_name] = np.median(test_runs[arch_name])
     
-    return {
-        "mean": float(mean_val),
-        "median": float(median_val),
-        "std": float(std_val),
-        "cv_percent": float(cv_percent),
-        "min": float(min_val),
-        "max": float(max_val),
-        "n": int(n)
-    }
-
-def cliffs_delta(x, y):
-    """Cliff's Delta: nonparametric effect size"""
-    n_x, n_y = len(x), len(y)
-    if n_x == 0 or n_y == 0:
-        return 0.0
-    
-    dominance = 0
-    for xi in x:
-        for yj in y:
-            if xi > yj:
-                dominance += 1
-            elif xi < yj:
-                dominance -= 1
-    
-    return dominance / (n_x * n_y)
-
-def interpret_delta(delta):
-    """Interpret Cliff's Delta effect size"""
-    abs_d = abs(delta)
-    if abs_d < 0.147:
-        return "negligible"
-    elif abs_d < 0.33:
-        return "small"
-    elif abs_d < 0.474:
-        return "medium"
-    else:
-        return "large"
-
-def normalize_inverse(value, values_list):
-    """Inverse normalization: lower = better"""
-    values_arr = np.array(values_list)
-    min_val = np.min(values_arr)
-    max_val = np.max(values_arr)
+    # Calculate ranks
+    arch_names_sorted = sorted(medians.keys(), key=lambda x: medians[x], reverse=higher_is_better)
+    values = [medians[arch] for arch in arch_names_sorted]
     
-    if max_val == min_val:
-        return 1.0
+    if higher_is_better:
+        ranks = rankdata([-v for v in values], method='average')
+    else:
+        ranks = rankdata(values, method='average')
+    
+    ranking_result = {}
+    for i, arch_name in enumerate(arch_names_sorted):
+        ranking_result[arch_name] = {"median": float(medians[arch_name]), "rank": float(ranks[i])}
+    
+    # Store results
+    metric_direction = "higher_is_better" if higher_is_better else "lower_is_better"
+    analysis = {
+        "metric_direction": metric_direction,
+        "descriptive": descriptive,
+        "friedman": friedman_result,
+        "nemenyi": nemenyi_result,
+        "permutation": permutation_result,
+        "cliffs_delta": cliffs_delta_result,
+        "ranking": ranking_result
+    }
     
-    return (max_val - value) / (max_val - min_val)
+    return {"analysis": analysis, "counts": counts, "warnings": warnings}
 
-# ============ SCORE HESAPLAMA ============
-def calculate_performance_score(avg_rank):
-    """Calculate Performance Score for 6 architectures: S_perf = 140 - (AvgRank × 20)"""
-    score = 140 - (avg_rank * 20)
-    return max(20, min(120, score))  # Clamp to [20, 120]
+# ============ ANA FONKSİYON ============
+def test_fingerprint(test_name, test_runs, n_permutations, seed):
+    """Everything a test's analysis block depends on"""
+    return fingerprint("test", test_name, HIGHER_IS_BETTER[test_name], list(test_runs.items()), n_permutations, seed)
 
-def calculate_memory_score(arch_data, all_data):
-    """Calculate Memory Efficiency Score"""
-    all_initial = [d["initial"] for d in all_data.values()]
-    all_peak = [d["peak"] for d in all_data.values()]
-    all_growth = [d["growth"] for d in all_data.values()]
-    
-    i_norm = normalize_inverse(arch_data["initial"], all_initial)
-    p_norm = normalize_inverse(arch_data["peak"], all_peak)
-    g_norm = normalize_inverse(arch_data["growth"], all_growth)
-    
-    return ((i_norm + p_norm + g_norm) / 3) * 100
+def bootstrap_fingerprint(benchmark_data, architectures, tests, memory_scores, code_scores, n_resamples, seed):
+    """Everything the bootstrap block depends on (resampling is independent of the worker count)"""
+    return fingerprint("bootstrap", architectures, [(test, HIGHER_IS_BETTER[test]) for test in tests],
+                       [[benchmark_data[arch].get(test) for arch in architectures] for test in tests],
+                       memory_scores, code_scores, SCORING.config, n_resamples, seed)
 
-def calculate_code_quality_score(arch_data, all_data):
-    """Calculate Code Quality Score (HYBRID returns None)"""
-    if arch_data is None:
-        return None
-    
-    # Only use architectures with data for normalization
-    valid_data = {k: v for k, v in all_data.items() if v is not None}
-    
-    # Debt Density
-    dd = arch_data["debt_hours"] / (arch_data["sloc"] / 1000)
-    all_dd = [d["debt_hours"] / (d["sloc"] / 1000) for d in valid_data.values()]
-    
-    all_cog = [d["avg_cog"] for d in valid_data.values()]
-    all_cyc = [d["avg_cyc"] for d in valid_data.values()]
-    
-    dd_norm = normalize_inverse(dd, all_dd)
-    cog_norm = normalize_inverse(arch_data["avg_cog"], all_cog)
-    cyc_norm = normalize_inverse(arch_data["avg_cyc"], all_cyc)
-    
-    # Hotspot penalty
-    hotspot = max(0, 1 - arch_data["max_cyc"] / 20)
-    
-    return ((dd_norm + cog_norm + cyc_norm + hotspot) / 4) * 100
+def pair_fingerprint(test_name, arch1, arch2, test_runs, n_permutations, seed):
+    """Everything one pair's permutation test depends on"""
+    return fingerprint("permutation", test_name, arch1, test_runs[arch1], arch2, test_runs[arch2], n_permutations, seed)
 
-# ============ ANA FONKSİYON ============
-def main():
+def main(jobs=1, n_bootstrap=DEFAULT_RESAMPLES, seed=DEFAULT_SEED, n_permutations=DEFAULT_PERMUTATIONS,
+         incremental=False, data_dir=DATA_DIR, output_file=OUTPUT_FILE, arch_mapping=ARCH_MAPPING, dataset=None,
+         code_source="static", n_weights=DEFAULT_SWEEP, memory_phases=None):
     """Main execution"""
     print("="*80)
     print("ANDROID ARCHITECTURE BENCHMARK - COMPREHENSIVE ANALYSIS (6 ARCHITECTURES)")
@@ -316,9 +253,11 @@ def main():
     
     # Load data
     print("Loading data...")
-    benchmark_data = load_benchmark_data()
-    memory_data = load_memory_data()
-    code_data = load_code_quality_data()
+    dataset = dataset.select(arch_mapping) if dataset is not None else load_dataset(data_dir, arch_mapping)
+    benchmark_data = load_benchmark_data(dataset)
+    memory_profiles = load_memory_profiles(dataset)
+    memory_data = memory_summary(memory_profiles)
+    code_data = load_code_quality_data(dataset, code_source, jobs=jobs)
     
     # Check data completeness
     print("\nDATA LOADED:")
@@ -326,9 +265,9 @@ def main():
     for arch_name in architectures:
         tests_found = len(benchmark_data[arch_name])
         has_memory = arch_name in memory_data
-        has_static = code_data.get(arch_name) is not None
-        static_str = "✓" if has_static else "✗"
-        print(f"  ✓ {arch_name:25} {tests_found}/15 tests | Memory {'✓' if has_memory else '✗'} | Static {static_str}")
+        has_code = code_data.get(arch_name) is not None
+        code_str = code_data[arch_name]["source"].split(":")[0] if has_code else "✗"
+        print(f"  ✓ {arch_name:25} {tests_found}/15 tests | Memory {'✓' if has_memory else '✗'} | Code {code_str}")
     
     print("\nHYBRID COMPOSITION:")
     print("  • Product Module: Classic MVVM (rapid scrolling optimization)")
@@ -342,7 +281,7 @@ def main():
             "total_tests": len(ALL_TESTS),
             "architectures": architectures,
             "architecture_count": len(architectures),
-            "data_source": f"{DATA_DIR}/*.json",
+            "data_source": f"{data_dir}/*.json",
             "hybrid_composition": {
                 "product_module": {"pattern": "Classic MVVM", "rationale": "Rapid scrolling performance"},
                 "cart_module": {"pattern": "MVP", "rationale": "Cart update correctness"},
@@ -351,18 +290,30 @@ def main():
             "statistical_methods": {
                 "friedman": "Nonparametric test for comparing 6 related groups",
                 "nemenyi": "Post-hoc pairwise comparison after significant Friedman",
+                "permutation": "Two-sample permutation test on the difference in means (exact when all splits fit, Monte-Carlo otherwise)",
                 "cliffs_delta": "Nonparametric effect size measure"
             }
         },
         "statistical_analysis": {},
+        "frame_timing": {
+            "description": "Per-frame timing from sampledMetrics (frameDurationCpuMs, frameOverrunMs)",
+            "frame_budget_ms": FRAME_BUDGET_MS,
+            "definitions": {
+                "overrun_rate": "Fraction of frames with frameOverrunMs > 0",
+                "jank_frame_pct": "Percentage of frames with frameDurationCpuMs > frame budget",
+                "sampled_percentiles": "Only P50/P90/P95/P99 available: rate is interpolated on the percentile CDF, lower/upper are the bounds implied by the percentiles"
+            },
+            "per_test": {},
+            "per_architecture": {}
+        },
         "rankings": {
             "per_test": {},
             "average_ranks": {}
         },
         "scores": {
-            "performance": {"formula": "S_perf = 140 - (Avg_Rank × 20)", "formula_note": "6 mimari için: Range 20 (rank=6) to 120 (rank=1)", "scores": {}, "ranking": []},
-            "memory": {"formula": "S_mem = ((I_norm + P_norm + G_norm) / 3) × 100", "raw_data": {}, "normalized": {}, "scores": {}, "ranking": []},
-            "code_quality": {"formula": "S_code = ((DD_norm + Cog_norm + Cyc_norm + Hotspot) / 4) × 100", "note": "HYBRID için static analysis verisi mevcut değildir", "raw_data": {}, "normalized": {}, "scores": {}, "ranking": []}
+            "performance": {"formula": SCORING.formula("performance"), "formula_note": "6 mimari için: Range 20 (rank=6) to 120 (rank=1)", "scores": {}, "ranking": []},
+            "memory": {"formula": SCORING.formula("memory"), "raw_data": {}, "normalized": {}, "scores": {}, "ranking": []},
+            "code_quality": {"formula": SCORING.formula("code_quality"), "note": "HYBRID için static analysis bloğu yoktur; skor ürün/sepet/sohbet modüllerinin taramasından, kaynak mimarilerin bloklarına kalibre edilerek oluşturulur", "raw_data": {}, "normalized": {}, "scores": {}, "ranking": []}
         },
         "hybrid_analysis": {
             "description": "HYBRID mimari, farklı modüller için optimize edilmiş pattern kombinasyonu kullanır",
@@ -409,122 +360,75 @@ def main():
     sig_nemenyi = 0
     total_nemenyi = 0
     total_large_effects = 0
+    sig_permutation = 0
+    total_permutation = 0
     
+    # Per-test analysis (optionally fanned out to a process pool)
+    test_inputs = []
     for test_name in ALL_TESTS:
-        print(f"  Analyzing {test_name}...")
-        
-        # Get runs for all architectures
         test_runs = {}
         for arch_name in architectures:
             if test_name in benchmark_data[arch_name]:
                 test_runs[arch_name] = benchmark_data[arch_name][test_name]
-        
-        if len(test_runs) < 2:
-            print(f"    Warning: Not enough data for {test_name}")
+        test_inputs.append((test_name, test_runs, architectures, n_permutations, seed))
+    
+    # Incremental mode: reuse tests (and permutation pairs) whose inputs are unchanged
+    cache = ResultCache(ANALYSIS_CACHE_FILE) if incremental else None
+    outcomes = {}
+    pending = []
+    for test_name, test_runs, *params in test_inputs:
+        if cache is None:
+            pending.append((test_name, test_runs, *params))
+            continue
+        cached = cache.get(test_fingerprint(test_name, test_runs, n_permutations, seed))
+        if cached is not None:
+            outcomes[test_name] = cached
+            for arch1, arch2 in combinations(test_runs.keys(), 2):
+                cache.touch(pair_fingerprint(test_name, arch1, arch2, test_runs, n_permutations, seed))
+            continue
+        cached_pairs = {}
+        for arch1, arch2 in combinations(test_runs.keys(), 2):
+            pair_result = cache.get(pair_fingerprint(test_name, arch1, arch2, test_runs, n_permutations, seed))
+            if pair_result is not None:
+                cached_pairs[(arch1, arch2)] = pair_result
+        pending.append((test_name, test_runs, *params, cached_pairs))
+    
+    if jobs != 1 and pending:
+        print(f"  Running {len(pending)} tests on {resolve_jobs(jobs)} worker processes")
+    
+    for args, outcome in zip(pending, parallel_map(analyze_test, pending, jobs)):
+        test_name, test_runs = args[0], args[1]
+        outcomes[test_name] = outcome
+        if cache is not None:
+            cache.put(test_fingerprint(test_name, test_runs, n_permutations, seed), outcome)
+            for pair_key, perm in (outcome["analysis"] or {}).get("permutation", {}).items():
+                arch1, arch2 = pair_key.split(" vs ")
+                cache.put(pair_fingerprint(test_name, arch1, arch2, test_runs, n_permutations, seed), perm)
+    
+    if cache is not None:
+        print(f"  Incremental: {len(ALL_TESTS) - len(pending)} tests reused, {len(pending)} recomputed ({ANALYSIS_CACHE_FILE})")
+    
+    for test_name in ALL_TESTS:
+        outcome = outcomes[test_name]
+        print(f"  Analyzing {test_name}...")
+        for warning in outcome["warnings"]:
+            print(f"    Warning: {warning}")
+        if outcome["analysis"] is None:
             continue
         
-        # Descriptive statistics
-        descriptive = {}
-        for arch_name, runs in test_runs.items():
-            descriptive[arch_name] = calculate_descriptive_stats(runs)
-        
-        # Friedman test (need balanced data)
-        all_runs_list = [test_runs[arch] for arch in architectures if arch in test_runs]
-        if len(all_runs_list) < 3:
-            friedman_result = {"chi_squared": None, "df": None, "p_value": None, "significant": False}
-            nemenyi_result = {}
-        else:
-            # Balance data (truncate to minimum length)
-            min_len = min(len(runs) for runs in all_runs_list)
-            balanced = [runs[:min_len] for runs in all_runs_list]
-            
-            # Transpose for Friedman (rows: iterations, columns: architectures)
-            matrix = np.array(balanced).T
-            
-            try:
-                stat, p_value = friedmanchisquare(*[matrix[:, i] for i in range(matrix.shape[1])])
-                friedman_result = {
-                    "chi_squared": float(stat),
-                    "df": len(all_runs_list) - 1,
-                    "p_value": float(p_value),
-                    "significant": p_value < 0.05
-                }
-                
-                if friedman_result["significant"]:
-                    friedman_sig += 1
-                else:
-                    friedman_nonsig += 1
-                
-                # Nemenyi post-hoc (only if significant)
-                nemenyi_result = {}
-                if friedman_result["significant"]:
-                    try:
-                        df = pd.DataFrame(matrix, columns=[arch for arch in architectures if arch in test_runs])
-                        nemenyi_matrix = sp.posthoc_nemenyi_friedman(df)
-                        
-                        for arch1, arch2 in combinations([arch for arch in architectures if arch in test_runs], 2):
-                            pair_key = f"{arch1} vs {arch2}"
-                            p_val = nemenyi_matrix.loc[arch1, arch2]
-                            significant = p_val < 0.05
-                            nemenyi_result[pair_key] = {"p_value": float(p_val), "significant": significant}
-                            
-                            total_nemenyi += 1
-                            if significant:
-                                sig_nemenyi += 1
-                    except Exception as e:
-                        print(f"    Warning: Nemenyi test failed for {test_name}: {e}")
-                        nemenyi_result = {}
-            except Exception as e:
-                print(f"    Warning: Friedman test failed for {test_name}: {e}")
-                friedman_result = {"chi_squared": None, "df": None, "p_value": None, "significant": False}
-                nemenyi_result = {}
-        
-        # Cliff's Delta (all pairs)
-        cliffs_delta_result = {}
-        for arch1, arch2 in combinations([arch for arch in architectures if arch in test_runs], 2):
-            runs1 = test_runs[arch1]
-            runs2 = test_runs[arch2]
-            delta = cliffs_delta(runs1, runs2)
-            effect = interpret_delta(delta)
-            pair_key = f"{arch1} vs {arch2}"
-            cliffs_delta_result[pair_key] = {"delta": float(delta), "effect": effect}
-            
-            if effect == "large":
-                total_large_effects += 1
-        
-        # Ranking
-        higher_is_better = HIGHER_IS_BETTER[test_name]
-        medians = {}
-        for arch_name in architectures:
-            if arch_name in test_runs:
-                medians[arch_name] = np.median(test_runs[arch_name])
-        
-        # Calculate ranks
-        arch_names_sorted = sorted(medians.keys(), key=lambda x: medians[x], reverse=higher_is_better)
-        values = [medians[arch] for arch in arch_names_sorted]
-        
-        if higher_is_better:
-            ranks = rankdata([-v for v in values], method='average')
-        else:
-            ranks = rankdata(values, method='average')
-        
-        ranking_result = {}
-        for i, arch_name in enumerate(arch_names_sorted):
-            ranking_result[arch_name] = {"median": float(medians[arch_name]), "rank": float(ranks[i])}
+        counts = outcome["counts"]
+        friedman_sig += counts["friedman_sig"]
+        friedman_nonsig += counts["friedman_nonsig"]
+        sig_nemenyi += counts["sig_nemenyi"]
+        total_nemenyi += counts["total_nemenyi"]
+        total_large_effects += counts["large_effects"]
+        sig_permutation += counts["sig_permutation"]
+        total_permutation += counts["total_permutation"]
         
-        # Store results
-        metric_direction = "higher_is_better" if higher_is_better else "lower_is_better"
-        results["statistical_analysis"][test_name] = {
-            "metric_direction": metric_direction,
-            "descriptive": descriptive,
-            "friedman": friedman_result,
-            "nemenyi": nemenyi_result,
-            "cliffs_delta": cliffs_delta_result,
-            "ranking": ranking_result
-        }
+        results["statistical_analysis"][test_name] = outcome["analysis"]
         
         # Store per-test rankings
-        ranked_archs = sorted(ranking_result.items(), key=lambda x: x[1]["rank"])
+        ranked_archs = sorted(outcome["analysis"]["ranking"].items(), key=lambda x: x[1]["rank"])
         results["rankings"]["per_test"][test_name] = [arch for arch, _ in ranked_archs]
     
     # Calculate average ranks
@@ -557,60 +461,48 @@ def main():
     
     # Memory scores
     print("Calculating memory scores...")
+    memory_table = SCORING.score_table("memory", memory_data)
     for arch_name, mem_data in memory_data.items():
         results["scores"]["memory"]["raw_data"][arch_name] = {
             "initial_mb": mem_data["initial"],
             "peak_mb": mem_data["peak"],
-            "growth_mb": mem_data["growth"]
-        }
-        
-        results["scores"]["memory"]["normalized"][arch_name] = {
-            "i_norm": float(normalize_inverse(mem_data["initial"], [d["initial"] for d in memory_data.values()])),
-            "p_norm": float(normalize_inverse(mem_data["peak"], [d["peak"] for d in memory_data.values()])),
-            "g_norm": float(normalize_inverse(mem_data["growth"], [d["growth"] for d in memory_data.values()]))
+            "growth_mb": mem_data["growth"],
+            "resolution_mb": mem_data["resolution_mb"]
         }
-        
-        score = calculate_memory_score(mem_data, memory_data)
-        results["scores"]["memory"]["scores"][arch_name] = float(score)
+        results["scores"]["memory"]["normalized"][arch_name] = memory_table["normalized"][arch_name]
+        results["scores"]["memory"]["scores"][arch_name] = memory_table["scores"][arch_name]
     
     results["scores"]["memory"]["ranking"] = sorted(results["scores"]["memory"]["scores"].items(), key=lambda x: x[1], reverse=True)
     results["scores"]["memory"]["ranking"] = [arch for arch, _ in results["scores"]["memory"]["ranking"]]
     
+    # Memory timeline (time-weighted PSS, AUC, leak slope)
+    print("Analyzing memory timeline...")
+    timelines, timeline_sources = load_timelines(memory_profiles, memory_phases, arch_mapping)
+    for path, counts in timeline_sources.items():
+        print(f"  {path}: {counts['added_runs']} runs added, {counts['duplicate_runs']} already in the result files")
+    results["memory_timeline"] = memory_timeline_analysis(timelines)
+    results["memory_timeline"]["memory_phases_files"] = timeline_sources
+    
     # Code quality scores
     print("Calculating code quality scores...")
+    code_table = SCORING.score_table("code_quality", code_data)
     for arch_name, code_data_arch in code_data.items():
         if code_data_arch is None:
             results["scores"]["code_quality"]["raw_data"][arch_name] = None
             results["scores"]["code_quality"]["normalized"][arch_name] = None
             results["scores"]["code_quality"]["scores"][arch_name] = "N/A"
         else:
-            # Debt Density
-            debt_density = code_data_arch["debt_hours"] / (code_data_arch["sloc"] / 1000)
-            
             results["scores"]["code_quality"]["raw_data"][arch_name] = {
                 "sloc": code_data_arch["sloc"],
                 "debt_hours": code_data_arch["debt_hours"],
-                "debt_density": float(debt_density),
+                "debt_density": float(code_data_arch["debt_hours"] / (code_data_arch["sloc"] / 1000)),
                 "avg_cog": code_data_arch["avg_cog"],
                 "avg_cyc": code_data_arch["avg_cyc"],
-                "max_cyc": code_data_arch["max_cyc"]
+                "max_cyc": code_data_arch["max_cyc"],
+                "source": code_data_arch["source"]
             }
-            
-            score = calculate_code_quality_score(code_data_arch, code_data)
-            if score is not None:
-                # Calculate normalized values for output
-                valid_data = {k: v for k, v in code_data.items() if v is not None}
-                all_dd = [d["debt_hours"] / (d["sloc"] / 1000) for d in valid_data.values()]
-                all_cog = [d["avg_cog"] for d in valid_data.values()]
-                all_cyc = [d["avg_cyc"] for d in valid_data.values()]
-                
-                results["scores"]["code_quality"]["normalized"][arch_name] = {
-                    "dd_norm": float(normalize_inverse(debt_density, all_dd)),
-                    "cog_norm": float(normalize_inverse(code_data_arch["avg_cog"], all_cog)),
-                    "cyc_norm": float(normalize_inverse(code_data_arch["avg_cyc"], all_cyc)),
-                    "hotspot": float(max(0, 1 - code_data_arch["max_cyc"] / 20))
-                }
-                results["scores"]["code_quality"]["scores"][arch_name] = float(score)
+            results["scores"]["code_quality"]["normalized"][arch_name] = code_table["normalized"][arch_name]
+            results["scores"]["code_quality"]["scores"][arch_name] = code_table["scores"][arch_name]
     
     # Code quality ranking (exclude N/A)
     code_ranking = sorted(
@@ -620,6 +512,49 @@ def main():
     )
     results["scores"]["code_quality"]["ranking"] = [arch for arch, _ in code_ranking]
     
+    # Bootstrap uncertainty
+    print(f"Bootstrapping ranks and scores ({n_bootstrap} resamples)...")
+    if n_bootstrap > 0:
+        boot_tests = [t for t in ALL_TESTS if t in results["statistical_analysis"]]
+        boot_args = (benchmark_data, architectures, boot_tests,
+                     results["scores"]["memory"]["scores"], results["scores"]["code_quality"]["scores"],
+                     n_bootstrap, seed)
+        uncertainty = cache.get(bootstrap_fingerprint(*boot_args)) if cache is not None else None
+        if uncertainty is None:
+            uncertainty = bootstrap_uncertainty(*boot_args, jobs)
+            if cache is not None:
+                cache.put(bootstrap_fingerprint(*boot_args), uncertainty)
+        else:
+            print("  Incremental: bootstrap reused")
+        results["uncertainty"] = uncertainty
+    if cache is not None:
+        cache.save()
+    
+    # Weight sensitivity of the overall score
+    print(f"Sweeping overall score weights ({n_weights} weight vectors)...")
+    if n_weights > 0:
+        results["weight_sensitivity"] = weight_sensitivity(
+            SCORING,
+            {
+                "performance": {arch: s["score"] for arch, s in perf_scores.items()},
+                "memory": results["scores"]["memory"]["scores"],
+                "code_quality": results["scores"]["code_quality"]["scores"]
+            },
+            architectures, n_weights, seed
+        )
+    
+    # Frame timing
+    print("Analyzing frame timing...")
+    results["frame_timing"].update(analyze_frame_timing(dataset, ALL_TESTS))
+    
+    # Covariate adjustment (iteration order; clocks are not locked on the device)
+    print("Adjusting for iteration order...")
+    results["covariate_adjustment"] = performance_adjustment(
+        {test_name: test_runs for test_name, test_runs, *_ in test_inputs if len(test_runs) >= 2},
+        {arch_name: dataset.results[arch_name].context for arch_name in architectures},
+        HIGHER_IS_BETTER
+    )
+    
     # Hybrid analysis
     print("Analyzing HYBRID performance...")
     if "HYBRID" in architectures:
@@ -678,15 +613,18 @@ def main():
     
     hybrid_perf_rank = None
     hybrid_mem_rank = None
+    hybrid_code_rank = None
     if "HYBRID" in perf_scores:
         hybrid_perf_rank = results["scores"]["performance"]["ranking"].index("HYBRID") + 1 if "HYBRID" in results["scores"]["performance"]["ranking"] else None
+    if "HYBRID" in results["scores"]["code_quality"]["ranking"]:
+        hybrid_code_rank = results["scores"]["code_quality"]["ranking"].index("HYBRID") + 1
     if "HYBRID" in results["scores"]["memory"]["scores"]:
         hybrid_mem_rank = results["scores"]["memory"]["ranking"].index("HYBRID") + 1 if "HYBRID" in results["scores"]["memory"]["ranking"] else None
     
     results["summary"]["dimension_leaders"] = {
         "performance": {"winner": perf_winner, "score": perf_scores[perf_winner]["score"], "hybrid_rank": hybrid_perf_rank},
         "memory": {"winner": mem_winner, "score": results["scores"]["memory"]["scores"][mem_winner], "hybrid_rank": hybrid_mem_rank},
-        "code_quality": {"winner": code_winner, "score": code_ranking[0][1] if code_ranking else None, "hybrid_note": "N/A - no data"}
+        "code_quality": {"winner": code_winner, "score": code_ranking[0][1] if code_ranking else None, "hybrid_rank": hybrid_code_rank}
     }
     
     # Statistical summary
@@ -709,6 +647,8 @@ def main():
         "friedman_nonsignificant_tests": friedman_nonsig,
         "total_pairwise_comparisons": len(ALL_TESTS) * 15,  # 15 pairs for 6 architectures
         "total_significant_pairwise": sig_nemenyi,
+        "total_permutation_comparisons": total_permutation,
+        "total_significant_permutation": sig_permutation,
         "total_large_effects": total_large_effects,
         "hybrid_specific": {
             "significant_vs_other_archs": hybrid_sig_count,
@@ -721,13 +661,13 @@ def main():
         tests_found = len(benchmark_data[arch_name])
         missing = [test for test in ALL_TESTS if test not in benchmark_data[arch_name]]
         has_memory = arch_name in memory_data
-        has_static = code_data.get(arch_name) is not None
         
         results["validation"]["data_completeness"][arch_name] = {
             "tests_found": tests_found,
             "missing": missing,
             "memory_data": has_memory,
-            "static_analysis": has_static
+            "static_analysis": dataset.results[arch_name].static_analysis is not None,
+            "code_metrics": code_data.get(arch_name) is not None
         }
     
     results["validation"]["cross_checks"] = {
@@ -756,9 +696,9 @@ def main():
     results = convert_to_native(results)
     
     # Save JSON
-    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-    print(f"\nSaving results to: {OUTPUT_FILE}")
-    with open(OUTPUT_FILE, 'w') as f:
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    print(f"\nSaving results to: {output_file}")
+    with open(output_file, 'w') as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
     
     # Print summary
@@ -768,10 +708,12 @@ def main():
     print(f"\nFriedman significant (p < 0.05): {friedman_sig}/{len(results['statistical_analysis'])} tests")
     print(f"Friedman non-significant: {friedman_nonsig}/{len(results['statistical_analysis'])} tests")
     print(f"Total significant pairwise (Nemenyi): {sig_nemenyi}/{total_nemenyi}")
+    if total_permutation > 0:
+        print(f"Total significant pairwise (permutation): {sig_permutation}/{total_permutation}")
     print(f"Large effect sizes (Cliff's δ ≥ 0.474): {total_large_effects}/{len(ALL_TESTS) * 15}")
     
     print("\n" + "-"*80)
-    print("PERFORMANCE SCORES (S_perf = 140 - Avg_Rank × 20):")
+    print(f"PERFORMANCE SCORES ({SCORING.formula('performance')}):")
     print("-"*80)
     for arch_name, data in sorted(perf_scores.items(), key=lambda x: x[1]["score"], reverse=True):
         print(f"  {len([p for p in perf_scores.values() if p['score'] > data['score']]) + 1}. {arch_name:25} {data['score']:>6.2f} (Avg Rank: {data['avg_rank']:.2f})")
@@ -785,6 +727,55 @@ def main():
         if hybrid_last:
             print(f"  ⚠️  Rank 6 in: {', '.join(hybrid_last)}")
     
+    print("\n" + "-"*80)
+    print(f"FRAME TIMING (median over tests, budget {FRAME_BUDGET_MS:.2f} ms):")
+    print("-"*80)
+    print(f"  {'Architecture':25} {'P50':>7} {'P90':>7} {'P99':>7} {'Overrun':>8} {'Jank %':>7}")
+    for arch_name, frame_data in sorted(results["frame_timing"]["per_architecture"].items(), key=lambda x: x[1]["mean_jank_frame_pct"] or 0):
+        duration = frame_data["median_frame_duration_cpu_ms"]
+        print(f"  {arch_name:25} {duration['P50']:>7.2f} {duration['P90']:>7.2f} {duration['P99']:>7.2f} "
+              f"{frame_data['mean_overrun_rate']:>8.2f} {frame_data['mean_jank_frame_pct']:>7.1f}")
+    
+    adjustment = results["covariate_adjustment"]
+    changed = [t for t, c in adjustment["per_test"].items() if c["ranking_changed"]]
+    print("\n" + "-"*80)
+    print("COVARIATE ADJUSTMENT (rank ANCOVA on iteration order):")
+    print("-"*80)
+    if adjustment["unlocked_clocks"]:
+        print(f"  ⚠️  CPU clocks not locked: {', '.join(adjustment['unlocked_clocks'])}")
+    balanced = [t for t, c in adjustment["per_test"].items() if c["balanced_covariates"]]
+    if balanced:
+        print(f"  Iteration order balanced across architectures in {len(balanced)}/{len(adjustment['per_test'])} "
+              f"tests; their means are unchanged")
+    print(f"  Ranking changed after adjustment (significant rank ANCOVA) in {len(changed)}/{len(adjustment['per_test'])} tests"
+          + (f": {', '.join(changed)}" if changed else ""))
+    unidentified = [t for t, c in adjustment["per_test"].items() if not c["identifiable"]]
+    if unidentified:
+        print(f"  Adjustment not identifiable in {len(unidentified)} tests: {', '.join(unidentified)}")
+    
+    if "uncertainty" in results:
+        print("\n" + "-"*80)
+        print(f"BOOTSTRAP 95% CI ({results['uncertainty']['n_resamples']} resamples):")
+        print("-"*80)
+        print(f"  {'Architecture':25} {'S_perf':>7} {'95% CI':>16} {'P(1st)':>7} {'Overall':>8} {'95% CI':>16} {'P(1st)':>7}")
+        for arch_name, boot in sorted(results["uncertainty"]["architectures"].items(), key=lambda x: -x[1]["p_rank1_performance"]):
+            perf = boot["performance_score"]
+            line = f"  {arch_name:25} {perf['estimate']:>7.2f} [{perf['ci_lower']:>6.2f}, {perf['ci_upper']:>6.2f}] {boot['p_rank1_performance']:>7.3f}"
+            if boot["overall_score"] is not None:
+                overall = boot["overall_score"]
+                line += f" {overall['estimate']:>8.2f} [{overall['ci_lower']:>6.2f}, {overall['ci_upper']:>6.2f}] {boot['p_rank1_overall']:>7.3f}"
+            print(line)
+    
+    if "weight_sensitivity" in results:
+        sensitivity = results["weight_sensitivity"]
+        print("\n" + "-"*80)
+        print(f"OVERALL WEIGHT SENSITIVITY ({sensitivity['n_weight_vectors']} weight vectors on the simplex):")
+        print("-"*80)
+        print(f"  Default weights winner: {sensitivity['default_winner']} "
+              f"(ranks 1st for {sensitivity['default_winner_share']:.1%} of weight vectors)")
+        for arch_name, share in sensitivity["rank1_share"].items():
+            print(f"  {arch_name:25} {share:>7.1%}")
+    
     print("\n" + "-"*80)
     print("MEMORY SCORES (S_mem):")
     print("-"*80)
@@ -793,20 +784,35 @@ def main():
         growth_note = " ← 0 MB growth (best!)" if arch_name == "HYBRID" and memory_data.get(arch_name, {}).get("growth") == 0.0 else ""
         print(f"  {rank_str} {arch_name:25} {score:>6.2f}{growth_note}")
     
+    print("\n" + "-"*80)
+    print("MEMORY TIMELINE (S_mem_timeline):")
+    print("-"*80)
+    print(f"  {'Architecture':25} {'Runs':>5} {'TWA PSS':>8} {'AUC MB·s':>9} {'Peak':>6} {'Slope/min':>10} {'Score':>7}")
+    timeline = results["memory_timeline"]
+    for arch_name in timeline["ranking"]:
+        metrics = timeline["per_architecture"][arch_name]
+        print(f"  {arch_name:25} {metrics['n_runs']:>5} {metrics['time_weighted_pss_mb']:>8.2f} {metrics['auc_mb_s']:>9.0f} "
+              f"{metrics['peak_mb']:>6.2f} {metrics['leak_slope']['mb_per_min']:>10.3f} {timeline['scores'][arch_name]:>7.2f}")
+    for arch_name, reason in timeline["not_comparable"].items():
+        print(f"  {arch_name:25} not comparable ({reason})")
+    
     print("\n" + "-"*80)
     print("CODE QUALITY SCORES (S_code):")
     print("-"*80)
     for arch_name, score in code_ranking:
         print(f"  {code_ranking.index((arch_name, score)) + 1}. {arch_name:25} {score:>6.2f}")
-    if "HYBRID" in results["scores"]["code_quality"]["scores"]:
-        print(f"  -. HYBRID:            N/A (no static analysis data)")
+    for arch_name, score in results["scores"]["code_quality"]["scores"].items():
+        if score == "N/A":
+            print(f"  -. {arch_name:25} N/A (no code metrics)")
+        elif not results["scores"]["code_quality"]["raw_data"][arch_name]["source"].startswith("staticCodeAnalysis"):
+            print(f"     {arch_name}: {results['scores']['code_quality']['raw_data'][arch_name]['source']}")
     
     print("\n" + "-"*80)
     print("DIMENSION LEADERS:")
     print("-"*80)
     print(f"  Performance:   {results['summary']['dimension_leaders']['performance']['winner']}")
     print(f"  Memory:        {results['summary']['dimension_leaders']['memory']['winner']}")
-    print(f"  Code Quality:  {results['summary']['dimension_leaders']['code_quality']['winner']} (HYBRID excluded)")
+    print(f"  Code Quality:  {results['summary']['dimension_leaders']['code_quality']['winner']}")
     
     if "HYBRID" in architectures:
         print("\n" + "-"*80)
@@ -832,9 +838,30 @@ def main():
     
     print("\n" + "="*80)
     print("✓ Analysis complete!")
-    print(f"✓ Results saved to: {OUTPUT_FILE}")
+    print(f"✓ Results saved to: {output_file}")
     print("="*80)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Comprehensive analysis for 6 architectures (including HYBRID)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes for the per-test analysis (0 = all cores, default 1)")
+    parser.add_argument("--bootstrap", type=int, default=DEFAULT_RESAMPLES,
+                        help=f"Bootstrap resamples for rank/score CIs (0 = skip, default {DEFAULT_RESAMPLES})")
+    parser.add_argument("--permutations", type=int, default=DEFAULT_PERMUTATIONS,
+                        help=f"Monte-Carlo permutations per pair when exact enumeration is too large (0 = skip, default {DEFAULT_PERMUTATIONS})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed for resampling")
+    parser.add_argument("--weight-sweep", type=int, default=DEFAULT_SWEEP,
+                        help=f"Weight vectors sampled from the simplex for the overall score sensitivity (0 = skip, default {DEFAULT_SWEEP})")
+    parser.add_argument("--code-metrics", choices=["static", "scan"], default="static",
+                        help="Code quality inputs: staticCodeAnalysis blocks (HYBRID composed from its modules) or the Kotlin source scanner for all")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Reuse cached per-test results whose inputs are unchanged ({ANALYSIS_CACHE_FILE})")
+    parser.add_argument("--memory-phases", nargs="+", metavar="FILE",
+                        help="memory_phases.csv-style files with repeated CompleteFlow runs for the memory timeline")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(args.jobs, args.bootstrap, args.seed, args.permutations, args.incremental, code_source=args.code_metrics,
+         n_weights=args.weight_sweep, memory_phases=args.memory_phases)
 
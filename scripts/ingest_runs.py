@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Run Store Ingest
+Converts rawdata/performance/*_result.json and runs_detail.json into the
+columnar .npz run store (archbench.runstore). Unchanged files are skipped
+by content hash; the analysis scripts read from the same store.
+
+Usage: python3 scripts/ingest_runs.py [--data-dir DIR] [--cache-dir DIR]
+"""
+
+import argparse
+import os
+
+from archbench.runstore import CACHE_DIR, ingest_directory, store_path
+
+DATA_DIR = "rawdata/performance"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest benchmark JSON into the columnar run store")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    tables, ingested = ingest_directory(args.data_dir, args.cache_dir)
+    if not tables:
+        print(f"No result files found in {args.data_dir}")
+        return
+
+    print(f"{'File':<32} {'Status':<9} {'Rows':>6} {'Source (KB)':>12} {'Store (KB)':>11}")
+    print("-" * 74)
+    total_source = total_store = 0
+    for filename, table in tables.items():
+        filepath = os.path.join(args.data_dir, filename)
+        source = os.path.getsize(filepath)
+        store = os.path.getsize(store_path(args.cache_dir, filepath, table.digest))
+        total_source += source
+        total_store += store
+        status = "ingested" if filename in ingested else "cached"
+        print(f"{filename:<32} {status:<9} {len(table):>6} {source / 1024:>12.1f} {store / 1024:>11.1f}")
+    print("-" * 74)
+    print(f"{'Total':<32} {'':<9} {'':>6} {total_source / 1024:>12.1f} {total_store / 1024:>11.1f}")
+    print(f"\n✓ {len(ingested)} ingested, {len(tables) - len(ingested)} unchanged → {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()